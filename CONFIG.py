@@ -4,8 +4,10 @@
 这个文件包含了系统运行所需的各种配置参数。
 """
 
+import functools
 import os
 from pathlib import Path
+from types import MappingProxyType
 
 # # 项目根目录
 # PROJECT_ROOT = Path(__file__).parent
@@ -28,6 +30,9 @@ DATABASE_CSV_FILES = [
     "10_auxiliary_factors.csv"
 ]
 
+# 数据库结构描述（用于渲染检索Agent的提示词）
+SCHEMA_FILE = PROJECT_ROOT / "schema.json"
+
 # 文献元数据配置
 METADATA_BASE_DIR = "/share/6_19batch_label/papers1000_parser"
 
@@ -35,7 +40,14 @@ METADATA_BASE_DIR = "/share/6_19batch_label/papers1000_parser"
 AGENT_CONFIG = {
     "model": "gemini-2.5-flash",
     "app_name": "bioreaction_research_app",
-    "session_service": "InMemorySessionService"
+    "session_service": "InMemorySessionService",
+    "session_max_size": 1000,  # 内存中保留的会话数上限，超出时淘汰最久未访问的会话
+    "session_ttl": 3600,  # 会话闲置超过该秒数后过期
+    "max_concurrent_sub_agents": 3,  # 并行编排时同时运行的子Agent上限
+    "batched_sub_agents": ("database_query_agent",),  # 启用请求合批的无状态子Agent
+    "batch_window_ms": 25,  # 合批等待窗口（毫秒）
+    "max_batch_size": 8,  # 单批最多合并的查询数
+    "fast_routing": True  # 特征明显的查询跳过根Agent的LLM路由，直接交给子Agent
 }
 
 # 查询配置
@@ -71,7 +83,7 @@ LOG_CONFIG = {
 
 # 缓存配置
 CACHE_CONFIG = {
-    "enable": True,
+    "enable": True,  # 同一会话、同一对话进度下完全相同的查询直接复用已有响应
     "ttl": 3600,  # 1小时
     "max_size": 1000
 }
@@ -83,8 +95,14 @@ ERROR_CONFIG = {
     "show_traceback": False
 }
 
+@functools.lru_cache(maxsize=1)
 def validate_config():
-    """验证配置的有效性"""
+    """
+    验证配置的有效性，返回错误信息元组。
+
+    结果会被缓存（每次查询都会调用，而目录状态几乎不变）；
+    需要重新检查时调用 validate_config.cache_clear()。
+    """
     errors = []
     
     # 检查数据库目录
@@ -96,7 +114,7 @@ def validate_config():
     if not os.path.exists(METADATA_BASE_DIR):
         errors.append(f"文献元数据目录不存在: {METADATA_BASE_DIR}")
     
-    return errors
+    return tuple(errors)
 
 def get_database_path(table_name: str) -> Path:
     """获取指定数据表的完整路径"""
@@ -106,11 +124,21 @@ def get_metadata_path(literature_id: str) -> Path:
     """获取指定文献的元数据文件路径"""
     return Path(METADATA_BASE_DIR) / literature_id / f"{literature_id}_parser.md"
 
+# 运行期只读：冻结为不可变映射，避免并发请求间被意外修改
+AGENT_CONFIG = MappingProxyType(AGENT_CONFIG)
+QUERY_CONFIG = MappingProxyType(QUERY_CONFIG)
+ANALYSIS_CONFIG = MappingProxyType({
+    key: MappingProxyType(value) if isinstance(value, dict) else value
+    for key, value in ANALYSIS_CONFIG.items()
+})
+CACHE_CONFIG = MappingProxyType(CACHE_CONFIG)
+
 # 导出配置
 __all__ = [
     'PROJECT_ROOT',
     'DATABASE_DIR', 
     'DATABASE_CSV_FILES',
+    'SCHEMA_FILE',
     'METADATA_BASE_DIR',
     'AGENT_CONFIG',
     'QUERY_CONFIG',
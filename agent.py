@@ -1,269 +1,251 @@
-from google.adk.agents import Agent, LlmAgent
-from google.adk.runners import Runner
-from google.adk.sessions import InMemorySessionService
-from google.adk.tools.agent_tool import AgentTool
 import os
 import asyncio
-from typing import List, Dict, Any
+import functools
+import logging
+from typing import TYPE_CHECKING, AsyncIterator, List, Dict, Any
 
-from .tools.database_query_tools import (
-    get_reaction_summary_tool,
-    find_reactions_by_enzyme_tool,
-    find_inhibition_data_tool,
-    find_reactions_by_organism_tool,
-    find_reactions_by_condition_tool,
-    find_reactions_with_pdb_id_tool,
-    find_top_reactions_by_performance_tool,
-    find_kinetic_parameters_tool,
-    find_conditions_by_enzyme_tool,
-    find_enzymes_by_participant_tool,
-    smart_search_reactions_tool,
-    get_database_statistics_tool,
-    find_similar_reactions_tool,
-    analyze_reaction_patterns_tool,
-    find_mutant_performance_tool
-)
-
-from .tools.deep_research_tools import (
-    get_summary_from_literature_tool,
-    analyze_multiple_literature_tool,
-    find_related_literature_tool,
-    literature_analysis_tool,
-    literature_comparison_tool
-)
-from .tools.advanced_tools import (
-    analyze_reaction_trends_tool,
-    compare_reactions_tool,
-    suggest_optimization_tool,
-)
+# ADK及其依赖（Vertex SDK、grpc等）导入开销大，只在首次真正使用Agent时导入
+if TYPE_CHECKING:
+    from google.adk.agents import LlmAgent
+    from google.adk.runners import Runner
+    from google.adk.sessions import InMemorySessionService
+    from .orchestrator import ParallelOrchestrator
 
 # 导入配置
-from .CONFIG import AGENT_CONFIG, validate_config
+from .CONFIG import AGENT_CONFIG, CACHE_CONFIG, validate_config
+from .utils.llm_cache import ResponseCache
+from .utils.logging_setup import setup_logging
+from .router import fast_router
 
-# 1. 首先导入加载器模块
-from .tools import database_loader
+# 导入时不配置日志处理器，由应用入口调用 setup_logging()
+logger = logging.getLogger(__name__)
 
-# 2. 立即执行数据库加载！
-database_loader.load_database()
+# 每次查询都会用到的配置项，导入时绑定一次
+_APP_NAME = AGENT_CONFIG["app_name"]
+_CACHE_ENABLED = CACHE_CONFIG["enable"]
+_FAST_ROUTING = AGENT_CONFIG["fast_routing"]
 
 # 建议通过环境变量设置您的API密钥
 # os.environ['GEMINI_API_KEY'] = "YOUR_API_KEY" 
 
-# --- 主Agent核心指令 (Prompt) ---
-main_instructions = """
-你是Biochemist-GPT，一个专注于生物化学反应领域的专家级AI研究助手。
-你的核心使命是高效地运用你所拥有的工具，为用户提供精准、数据驱动的答案。
-
-## 智能体分工说明
-- 如用户问题涉及数据库字段检索、结构化数据查询、反应/酶/物种/条件/性能/统计等，**必须优先调用 database_query_agent**。
-- **特别注意：只要用户输入中出现“反应方程式”、“A + B -> C + D”这类结构式、或任何具体的化学式/反应式描述，都应直接调用 database_query_agent，并将其映射为 reaction_equation 字段进行检索。**
-- 如用户问题涉及文献内容分析、文献对比、实验方法/结论/上下文等，优先调用 deep_research_agent。
-- 如用户问题涉及趋势分析、对比分析、优化建议等高级分析，优先调用 advanced_agent。
-
-## 智能意图识别与参数生成
-- 你必须根据用户输入内容，自动推断最合适的字段和参数。
-- 你只能调用下属子agent，不可直接调用底层数据库函数。
-- 如用户输入模糊或多意图，优先召回更多结果。
-
-## 响应标准
-- 数据准确：所有信息必须来自数据库或文献
-- 逻辑清晰：按重要性组织信息
-- 实用性强：提供可操作的见解和建议
-- 诚实透明：明确说明数据来源和局限性
-
-# 典型分工示例
-- “A + B -> C + D 这个反应出自哪个文献？”→ database_query_agent
-- “请分析PMID123456的实验方法”→ deep_research_agent
-- “对比PMID123和PMID456的创新点”→ deep_research_agent
-- “请给出某酶的性能趋势分析”→ advanced_agent
-"""
-
-# --- 创建专门的子Agent ---
-
-# 强prompt，指导大模型如何意图映射和参数推理
-database_query_agent_prompt = """
-你是一个生物化学数据库智能检索Agent。你的任务是：
-1. **语言处理：如果用户输入为中文，必须先将其中的关键查询术语（如酶名称、物种、底物、产物、抑制剂等）准确翻译成英文，因为数据库内容全部为英文。**
-2. 解析用户输入，推断其真实意图（如：按酶、物种、底物、产物、抑制剂、实验条件、PDB、性能、动力学参数、模式分析、统计等）。
-3. **如用户输入包含“反应方程式”或“->”或“→”等结构式，必须将其映射为 reaction_equation 字段进行检索。**
-4. 自动将自然语言问题映射为数据库字段和参数，字段必须严格参考下方数据库结构。
-5. 校验参数与字段一致性，缺失时自动补全为"全部"，模糊意图时优先召回更多结果。
-6. 只能调用下方提供的数据库检索工具（FunctionTool），并根据推理结果选择最合适的工具和参数。
-7. 工具调用结果要结构化、准确、可追溯。
-8. 如参数不合法或无结果，需给出详细报错或友好提示。
-9. 不能直接返回原始用户输入，必须经过意图映射和参数推理。
-
-# 数据库字段说明（请严格参考字段名进行意图映射和参数生成）
-- reaction_equation: 反应方程式（如"A + B -> C + D"）
-- reaction_type_reversible: 反应是否可逆（如"Yes"/"No"/"Not specified"）
-- notes: 反应备注
-- enzyme_name: 酶名称（如"Ornithine transcarbamoylase"）
-- enzyme_synonyms: 酶同义词（如"OTC|Ornithine carbamoyltransferase"）
-- gene_name: 基因名称
-- organism: 物种（如"Escherichia coli"）
-- ec_number: EC号（如"2.1.1.1"）
-- participant_name: 参与分子（底物/产物/抑制剂等）
-- role: 分子角色（如"substrate"/"product"/"inhibitor"）
-- literature_id: 文献编号（如PMID）
-- reaction_id: 反应编号
-- 其他字段请参考数据库结构
-
-# 数据库结构（表名、字段名、含义）
-
-## 1_reactions_core
-- literature_id, reaction_id, reaction_equation, reaction_type_reversible, notes
-
-## 2_enzymes
-- literature_id, reaction_id, enzyme_name, enzyme_synonyms, gene_name, organism, ec_number, genbank_id, pdb_id, uniprot_id, subcellular_localization, optimal_temperature, optimal_temperature_unit, optimal_ph, optimal_conditions_details
-
-## 3_experimental_conditions
-- literature_id, reaction_id, assay_type, assay_details, solvent_buffer, ph, ph_details, temperature_celsius, expression_host, expression_vector, expression_induction
+# --- root_agent分层（首次访问时构建）---
+@functools.cache
+def get_root_agent() -> "LlmAgent":
+    from .agent_factory import build_root_agent
+    return build_root_agent("hierarchical")
 
-## 4_activity_performance
-- literature_id, reaction_id, conversion_rate, conversion_rate_unit, conversion_rate_error, product_yield, product_yield_unit, product_yield_error, regioselectivity, stereoselectivity, enantiomeric_excess, enantiomeric_excess_unit
-
-## 5_reaction_participants
-- literature_id, reaction_id, role, participant_name, smiles, sequence
-
-## 6_kinetic_parameters
-- literature_id, reaction_id, source_type, mutation_description, parameter_type, substrate_name, value, unit, error_margin, details
-
-## 7_mutants_characterized
-- literature_id, reaction_id, mutation_description, activity_qualitative, conversion_rate, product_yield, product_yield_unit, selectivity_regio, selectivity_stereo, enantiomeric_excess
-
-## 8_inhibitors_main
-- literature_id, reaction_id, inhibitor_name, inhibition_type, inhibitor_smiles, synonyms, activity_qualitative, inhibition_qualitative, details, notes
-
-## 9_inhibition_params
-- literature_id, reaction_id, inhibitor_name, parameter_type, value, unit, error_margin, thermodynamics
-
-## 10_auxiliary_factors
-- literature_id, reaction_id, factor_name
-
-# 检索示例：
-- “Carbamoyl phosphate + L-ornithine -> Citrulline + Inorganic phosphate 这个反应出自哪个文献？”→ reaction_equation 字段检索
-- “查找某酶催化的所有反应”→ enzyme_name 字段检索
-- "查找某物种的某酶的所有反应"
-- "查询底物为X的所有反应及酶"
-- "获取某反应的动力学参数"
-- "统计所有抑制剂类型及其参数"
-- "分析某物种下的反应性能分布"
-
-# 响应要求：
-- 结果字段必须与数据库字段严格一致
-- 结构化、可追溯、可复用
-- 如无结果或参数错误，需详细报错
-"""
-
-# --- database_query_agent ---
-database_query_agent = LlmAgent(
-    name="database_query_agent",
-    model=AGENT_CONFIG["model"],
-    instruction=database_query_agent_prompt,
-    tools=[
-        get_reaction_summary_tool,
-        find_reactions_by_enzyme_tool,
-        find_inhibition_data_tool,
-        find_reactions_by_organism_tool,
-        find_reactions_by_condition_tool,
-        find_reactions_with_pdb_id_tool,
-        find_top_reactions_by_performance_tool,
-        find_kinetic_parameters_tool,
-        find_conditions_by_enzyme_tool,
-        find_enzymes_by_participant_tool,
-        smart_search_reactions_tool,
-        get_database_statistics_tool,
-        find_similar_reactions_tool,
-        analyze_reaction_patterns_tool,
-        find_mutant_performance_tool
-    ]
-)
-
-# --- deep_research_agent ---
-deep_research_agent = LlmAgent(
-    name="deep_research_agent",
-    model=AGENT_CONFIG["model"],
-    instruction="""
-    你是生物化学文献深度研究专家。你的任务是：
-    1. 调用文献分析相关工具，提取、分析、总结文献内容
-    2. 回答用户的具体研究问题
-    3. 工具调用前，需校验参数（如literature_id等）与文献数据库字段严格一致，缺失或错误需报错。
-    4. 只基于文献内容作答，不添加外部知识
-    """,
-    description="专门用于文献深度分析和研究的Agent，调用前需参数校验",
-    tools=[
-        get_summary_from_literature_tool,
-        analyze_multiple_literature_tool,
-        find_related_literature_tool,
-        literature_analysis_tool,
-        literature_comparison_tool
-    ]
-)
+# --- 创建Runner实例 ---
+def get_session_service() -> "InMemorySessionService":
+    from .sessions import SESSION_SERVICE
+    return SESSION_SERVICE
+
+def get_runner() -> "Runner":
+    from .sessions import get_runner as get_agent_runner
+    return get_agent_runner(get_root_agent(), app_name=_APP_NAME)
+
+# --- 并行编排器（多意图查询时并行调用子Agent）---
+@functools.cache
+def get_parallel_orchestrator() -> "ParallelOrchestrator":
+    from .agent_factory import build_sub_agents
+    from .orchestrator import ParallelOrchestrator
+    # 子Agent只能有一个父Agent，这里使用独立构建的实例
+    return ParallelOrchestrator(
+        sub_agents=list(build_sub_agents()),
+        model=AGENT_CONFIG["model"],
+        app_name=_APP_NAME,
+        max_concurrency=AGENT_CONFIG["max_concurrent_sub_agents"],
+        batched_agents=AGENT_CONFIG["batched_sub_agents"],
+        batch_window_ms=AGENT_CONFIG["batch_window_ms"],
+        max_batch_size=AGENT_CONFIG["max_batch_size"]
+    )
 
-# --- advanced_agent ---
-advanced_agent = LlmAgent(
-    name="advanced_agent",
+def _sub_agent(name: str) -> "LlmAgent":
+    return next(agent for agent in get_root_agent().sub_agents if agent.name == name)
+
+def _app_root_agent() -> "LlmAgent":
+    """adk web 通过 agent.root_agent 加载根Agent，这里作为其应用入口初始化包日志"""
+    setup_logging()
+    return get_root_agent()
+
+# 模块属性的延迟构建（adk web 通过 agent.root_agent 访问根Agent）
+_LAZY_ATTRIBUTES = {
+    "root_agent": _app_root_agent,
+    "runner": get_runner,
+    "session_service": get_session_service,
+    "parallel_orchestrator": get_parallel_orchestrator,
+    "database_query_agent": lambda: _sub_agent("database_query_agent"),
+    "deep_research_agent": lambda: _sub_agent("deep_research_agent"),
+    "advanced_agent": lambda: _sub_agent("advanced_agent"),
+}
+
+def __getattr__(name: str):
+    if name in _LAZY_ATTRIBUTES:
+        return _LAZY_ATTRIBUTES[name]()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+# --- 响应缓存 ---
+response_cache = ResponseCache(
     model=AGENT_CONFIG["model"],
-    instruction="""
-    你是高级分析专家。你的任务是：
-    1. 调用高级分析工具，进行趋势分析、对比、优化建议
-    2. 输出可操作的见解
-    """,
-    description="专门用于高级数据分析和优化建议的Agent",
-    tools=[
-        analyze_reaction_trends_tool,
-        compare_reactions_tool,
-        suggest_optimization_tool,
-    ]
+    ttl=CACHE_CONFIG["ttl"],
+    max_size=CACHE_CONFIG["max_size"]
 )
 
-# --- root_agent分层 ---
-root_agent = LlmAgent(
-    name="bioreaction_deep_research_agent",
-    model=AGENT_CONFIG["model"],
-    instruction=main_instructions,
-    sub_agents=[
-        database_query_agent,
-        deep_research_agent,
-        advanced_agent
-    ]
-)
+# --- 会话复用 ---
+# 同一用户的会话跨查询复用；过期与容量淘汰由共享的 BoundedSessionService 负责
+_sessions_lock = asyncio.Lock()
 
-# --- 创建Runner实例 ---
-session_service = InMemorySessionService()
-runner = Runner(
-    agent=root_agent,
-    app_name=AGENT_CONFIG["app_name"],
-    session_service=session_service
-)
+async def _get_session(user_id: str):
+    """获取用户的会话，不存在或已被淘汰时新建"""
+    session_service = get_session_service()
+    session_id = f"session_{user_id}"
+    async with _sessions_lock:
+        session = await session_service.get_session(app_name=_APP_NAME, user_id=user_id, session_id=session_id)
+        if session is None:
+            session = await session_service.create_session(app_name=_APP_NAME, user_id=user_id, session_id=session_id)
+        return session
 
 # --- 便捷函数 ---
-async def query_agent(user_query: str, user_id: str = "default_user") -> str:
+async def query_agent(user_query: str, user_id: str = "default_user") -> AsyncIterator[str]:
     """
-    便捷函数：向agent发送查询并获取响应
+    便捷函数：向agent发送查询，以流式方式逐段产出响应文本（首段文本生成后即可开始消费）
     """
+    from google.adk.agents.run_config import RunConfig, StreamingMode
     from google.genai import types
     
     # 验证配置
     config_errors = validate_config()
     if config_errors:
-        return f"配置错误，无法启动Agent:\n" + "\n".join(config_errors)
+        yield f"配置错误，无法启动Agent:\n" + "\n".join(config_errors)
+        return
     
-    session = await session_service.create_session(
-        app_name=AGENT_CONFIG["app_name"],
+    session = await _get_session(user_id)
+    # 以会话已有的事件数作为缓存上下文：同一问题在不同的对话进度下可能指代不同的对象
+    history = len(session.events)
+    
+    # 重复的查询直接返回缓存响应
+    if _CACHE_ENABLED:
+        cached = response_cache.get(user_query, session_id=user_id, context=history)
+        if cached is not None:
+            logger.debug("命中响应缓存: %s", user_query)
+            yield cached
+            return
+    
+    # 特征明显的查询直接交给对应子Agent，省去根Agent的路由回合；
+    # 子Agent在用户自己的会话中运行，本轮问答保留在会话历史中，后续追问（无论是否快速路由）都能引用
+    routed_agent = fast_router.match(user_query) if _FAST_ROUTING else None
+    if routed_agent:
+        logger.debug("快速路由 -> %s: %s", routed_agent, user_query)
+        response = await get_parallel_orchestrator().run_agent_in_session(
+            routed_agent, user_query, user_id=user_id, session_id=session.id
+        )
+        if response:
+            if _CACHE_ENABLED:
+                response_cache.set(user_query, response, session_id=user_id, context=history)
+            yield response
+            return
+    
+    user_content = types.Content(role='user', parts=[types.Part(text=user_query)])
+    events = get_runner().run_async(
         user_id=user_id,
-        session_id=f"session_{user_id}"
+        session_id=session.id,
+        new_message=user_content,
+        run_config=RunConfig(streaming_mode=StreamingMode.SSE)
     )
     
+    logger.debug("向Agent发送: %s", user_query)
+    # 在事件循环外判断一次，关闭DEBUG时每个事件无需任何格式化开销
+    log_events = logger.isEnabledFor(logging.DEBUG)
+    streamed = []
+    try:
+        async for event in events:
+            if log_events:
+                logger.debug("event: %r", event)
+            if event.partial:
+                # 流式增量文本，直接转发给调用方
+                if event.content and event.content.parts and event.content.parts[0].text:
+                    streamed.append(event.content.parts[0].text)
+                    yield event.content.parts[0].text
+            elif event.is_final_response():
+                response = event.content.parts[0].text if event.content and event.content.parts else None
+                if not streamed and response:
+                    # 未以流式输出（如模型不支持SSE）时一次性产出完整响应
+                    streamed.append(response)
+                    yield response
+                if _CACHE_ENABLED and streamed:
+                    response_cache.set(user_query, response or "".join(streamed), session_id=user_id, context=history)
+                break
+    finally:
+        # 拿到最终响应后立即关闭事件流，停止继续消费上游输出
+        await events.aclose()
+    if not streamed:
+        yield "未能获取有效响应"
+
+async def query_agent_blocking(user_query: str, user_id: str = "default_user") -> str:
+    """
+    便捷函数：向agent发送查询并获取完整响应（汇总 query_agent 的流式输出）
+    """
+    return "".join([chunk async for chunk in query_agent(user_query, user_id=user_id)])
+
+async def _query_root_isolated(user_query: str, user_id: str) -> str:
+    """在临时会话中运行根Agent并返回最终响应；批量查询之间互不共享会话历史"""
+    from google.genai import types
+    
+    session_service = get_session_service()
+    session = await session_service.create_session(app_name=_APP_NAME, user_id=user_id)
     user_content = types.Content(role='user', parts=[types.Part(text=user_query)])
-    events = runner.run_async(user_id=user_id, session_id=f"session_{user_id}", new_message=user_content)
+    events = get_runner().run_async(user_id=user_id, session_id=session.id, new_message=user_content)
+    response = ""
+    try:
+        async for event in events:
+            if event.is_final_response() and event.content and event.content.parts:
+                response = event.content.parts[0].text or response
+                if response:
+                    break
+    finally:
+        await events.aclose()
+        await session_service.delete_session(app_name=_APP_NAME, user_id=user_id, session_id=session.id)
+    return response
+
+async def query_agent_batch(user_queries: List[str], user_id: str = "default_user") -> List[str]:
+    """
+    便捷函数：并发处理一组相互独立的查询，返回与输入顺序一致的响应列表。
+    可快速路由的查询交给对应子Agent（database_query_agent 的并发查询会被合批为一次调用），
+    其余查询各自在临时会话中并发运行根Agent。
+    """
+    config_errors = validate_config()
+    if config_errors:
+        return [f"配置错误，无法启动Agent:\n" + "\n".join(config_errors)] * len(user_queries)
+    
+    # 批量查询均在无历史的临时会话中执行，缓存上下文固定为0
+    async def answer(user_query: str) -> str:
+        if _CACHE_ENABLED:
+            cached = response_cache.get(user_query, session_id=user_id, context=0)
+            if cached is not None:
+                return cached
+        routed_agent = fast_router.match(user_query) if _FAST_ROUTING else None
+        response = None
+        if routed_agent:
+            response = await get_parallel_orchestrator().run_agent(routed_agent, user_query, user_id=user_id)
+        if not response:
+            response = await _query_root_isolated(user_query, user_id)
+        if _CACHE_ENABLED and response:
+            response_cache.set(user_query, response, session_id=user_id, context=0)
+        return response or "未能获取有效响应"
+    
+    logger.debug("批量查询: %d 条", len(user_queries))
+    results = await asyncio.gather(*(answer(user_query) for user_query in user_queries), return_exceptions=True)
+    return [f"查询失败: {result}" if isinstance(result, Exception) else result for result in results]
+
+async def query_agent_parallel(user_query: str, user_id: str = "default_user") -> str:
+    """
+    便捷函数：通过并行编排器处理查询，多意图问题的各子任务并行执行
+    """
+    config_errors = validate_config()
+    if config_errors:
+        return f"配置错误，无法启动Agent:\n" + "\n".join(config_errors)
     
-    print(f"[DEBUG] 向Agent发送: {user_query}")
-    async for event in events:
-        print(f"[DEBUG] event: {event}")
-        if event.is_final_response():
-            return event.content.parts[0].text
-    return "未能获取有效响应"
+    logger.debug("并行编排: %s", user_query)
+    return await get_parallel_orchestrator().run(user_query, user_id=user_id)
 
 # --- 导出主要组件 ---
-__all__ = ['root_agent', 'runner', 'query_agent', 'database_query_agent', 'deep_research_agent', 'advanced_agent']
\ No newline at end of file
+__all__ = ['root_agent', 'runner', 'get_runner', 'query_agent', 'query_agent_blocking', 'query_agent_batch', 'query_agent_parallel', 'parallel_orchestrator', 'database_query_agent', 'deep_research_agent', 'advanced_agent']
\ No newline at end of file
@@ -0,0 +1,213 @@
+"""
+Agent工厂
+
+集中定义各Agent的指令与工具，按拓扑构建根Agent：
+- hierarchical: 子Agent挂在根Agent的sub_agents下，由根Agent转交（adk web默认使用）
+- flat: 子Agent包装为AgentTool，由根Agent以工具调用的方式使用
+提示词为模块级常量，多个拓扑/多次构建共享同一份字符串。
+"""
+
+import functools
+import json
+import sys
+from typing import Dict, Literal, Tuple
+
+from google.adk.agents import LlmAgent
+from google.adk.tools.agent_tool import AgentTool
+
+from .tools.database_query_tools import (
+    get_reaction_summary_tool,
+    find_reactions_by_enzyme_tool,
+    find_inhibition_data_tool,
+    find_reactions_by_organism_tool,
+    find_reactions_by_condition_tool,
+    find_reactions_with_pdb_id_tool,
+    find_top_reactions_by_performance_tool,
+    find_kinetic_parameters_tool,
+    find_conditions_by_enzyme_tool,
+    find_enzymes_by_participant_tool,
+    smart_search_reactions_tool,
+    get_database_statistics_tool,
+    find_similar_reactions_tool,
+    analyze_reaction_patterns_tool,
+    find_mutant_performance_tool
+)
+
+from .tools.deep_research_tools import (
+    get_summary_from_literature_tool,
+    analyze_multiple_literature_tool,
+    find_related_literature_tool,
+    literature_analysis_tool,
+    literature_comparison_tool
+)
+from .tools.advanced_tools import (
+    analyze_reaction_trends_tool,
+    compare_reactions_tool,
+    suggest_optimization_tool,
+)
+
+from .CONFIG import AGENT_CONFIG, SCHEMA_FILE
+
+# --- 主Agent核心指令 (Prompt) ---
+main_instructions = """
+你是生物化学反应研究助手Biochemist-GPT，只能将问题转交给下列子Agent，不直接调用数据库函数。
+路由规则（按顺序匹配）：
+- database_query_agent：数据库检索/统计（反应、酶、物种、底物产物、条件、性能、动力学、抑制剂）；含反应式（A + B -> C + D）必选此项，字段由其自行映射
+- deep_research_agent：文献内容（方法、结论、上下文、多文献对比）
+- advanced_agent：趋势分析、性能对比、优化建议
+意图模糊时优先召回更多结果。回答只基于数据库或文献，注明来源与局限。
+示例：
+"A + B -> C + D 出自哪个文献？" -> database_query_agent
+"分析PMID123456的实验方法" -> deep_research_agent
+"对比PMID123和PMID456的创新点" -> deep_research_agent
+"某酶的性能趋势" -> advanced_agent
+"""
+
+# --- 各子Agent的工具集（模块级共享，多次构建的Agent引用同一批FunctionTool实例）---
+ALL_DB_TOOLS = (
+    get_reaction_summary_tool,
+    find_reactions_by_enzyme_tool,
+    find_inhibition_data_tool,
+    find_reactions_by_organism_tool,
+    find_reactions_by_condition_tool,
+    find_reactions_with_pdb_id_tool,
+    find_top_reactions_by_performance_tool,
+    find_kinetic_parameters_tool,
+    find_conditions_by_enzyme_tool,
+    find_enzymes_by_participant_tool,
+    smart_search_reactions_tool,
+    get_database_statistics_tool,
+    find_similar_reactions_tool,
+    analyze_reaction_patterns_tool,
+    find_mutant_performance_tool
+)
+
+LITERATURE_TOOLS = (
+    get_summary_from_literature_tool,
+    analyze_multiple_literature_tool,
+    find_related_literature_tool,
+    literature_analysis_tool,
+    literature_comparison_tool
+)
+
+ADVANCED_TOOLS = (
+    analyze_reaction_trends_tool,
+    compare_reactions_tool,
+    suggest_optimization_tool,
+)
+
+# --- 创建专门的子Agent ---
+
+@functools.lru_cache(maxsize=None)
+def render_schema_block() -> str:
+    """
+    将 schema.json 渲染为紧凑的数据库结构说明：每表一行 "表名(字段,...)"，
+    公共关联键只声明一次，以减少每次子Agent调用携带的输入token。
+    """
+    with open(SCHEMA_FILE, encoding="utf-8") as f:
+        schema = json.load(f)
+    key_columns = ",".join(schema["key_columns"])
+    lines = [f"# 数据库结构（所有表均含关联键 {key_columns}，下列为各表其余字段）"]
+    lines += [f"{table}({','.join(columns)})" for table, columns in schema["tables"].items()]
+    lines.append("# 字段提示")
+    lines += [f"{field}: {hint}" for field, hint in schema["field_hints"].items()]
+    return sys.intern("\n".join(lines))
+
+
+# 强prompt，指导大模型如何意图映射和参数推理
+database_query_agent_prompt = """
+你是生物化学数据库智能检索Agent：
+1. 数据库内容全部为英文：用户输入为中文时，先将酶、物种、底物、产物、抑制剂等查询术语准确译为英文。
+2. 推断用户意图（按酶、物种、底物、产物、抑制剂、实验条件、PDB、性能、动力学参数、模式分析、统计等），映射为下方数据库字段和参数。
+3. 输入含"反应方程式"或"->"、"→"等结构式时，必须映射为 reaction_equation 字段检索。
+4. 参数缺失时补全为"全部"；意图模糊时优先召回更多结果。
+5. 只能调用提供的数据库检索工具，不能直接返回原始用户输入。
+6. 结果字段与数据库字段严格一致，结构化、可追溯；参数不合法或无结果时给出详细报错。
+
+""" + render_schema_block() + "\n"
+
+deep_research_agent_prompt = """
+    你是生物化学文献深度研究专家。你的任务是：
+    1. 调用文献分析相关工具，提取、分析、总结文献内容
+    2. 回答用户的具体研究问题
+    3. 工具调用前，需校验参数（如literature_id等）与文献数据库字段严格一致，缺失或错误需报错。
+    4. 只基于文献内容作答，不添加外部知识
+    """
+
+advanced_agent_prompt = """
+    你是高级分析专家。你的任务是：
+    1. 调用高级分析工具，进行趋势分析、对比、优化建议
+    2. 输出可操作的见解
+    """
+
+
+
+def build_sub_agents() -> Tuple[LlmAgent, LlmAgent, LlmAgent]:
+    """
+    构建三个子Agent的新实例（ADK中一个Agent只能有一个父Agent，因此每个根Agent需各自的实例）
+
+    :return: (database_query_agent, deep_research_agent, advanced_agent)
+    """
+    # --- database_query_agent ---
+    database_query_agent = LlmAgent(
+        name="database_query_agent",
+        model=AGENT_CONFIG["model"],
+        instruction=database_query_agent_prompt,
+        description="专门用于生物化学数据库结构化检索的Agent",
+        tools=list(ALL_DB_TOOLS)
+    )
+
+    # --- deep_research_agent ---
+    deep_research_agent = LlmAgent(
+        name="deep_research_agent",
+        model=AGENT_CONFIG["model"],
+        instruction=deep_research_agent_prompt,
+        description="专门用于文献深度分析和研究的Agent，调用前需参数校验",
+        tools=list(LITERATURE_TOOLS)
+    )
+
+    # --- advanced_agent ---
+    advanced_agent = LlmAgent(
+        name="advanced_agent",
+        model=AGENT_CONFIG["model"],
+        instruction=advanced_agent_prompt,
+        description="专门用于高级数据分析和优化建议的Agent",
+        tools=list(ADVANCED_TOOLS)
+    )
+    return database_query_agent, deep_research_agent, advanced_agent
+
+
+# agent名称 -> AgentTool；同名子Agent的定义相同，多次构建扁平拓扑时复用同一个包装
+_AGENT_TOOL_CACHE: Dict[str, AgentTool] = {}
+
+
+def tool_of(agent: LlmAgent) -> AgentTool:
+    """获取子Agent的AgentTool包装（按名称缓存）"""
+    tool = _AGENT_TOOL_CACHE.get(agent.name)
+    if tool is None:
+        tool = _AGENT_TOOL_CACHE.setdefault(agent.name, AgentTool(agent=agent))
+    return tool
+
+
+def build_root_agent(topology: Literal["hierarchical", "flat"] = "hierarchical") -> LlmAgent:
+    """
+    构建根Agent
+
+    :param topology: "hierarchical" 以sub_agents转交子Agent；"flat" 以AgentTool调用子Agent
+    """
+    sub_agents = build_sub_agents()
+    if topology == "hierarchical":
+        return LlmAgent(
+            name="bioreaction_deep_research_agent",
+            model=AGENT_CONFIG["model"],
+            instruction=main_instructions,
+            sub_agents=list(sub_agents)
+        )
+    if topology == "flat":
+        return LlmAgent(
+            name="bioreaction_deep_research_agent",
+            model=AGENT_CONFIG["model"],
+            instruction=main_instructions,
+            tools=[tool_of(agent) for agent in sub_agents]
+        )
+    raise ValueError(f"未知的Agent拓扑: {topology}")
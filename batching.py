@@ -0,0 +1,123 @@
+"""
+请求合批
+
+把短时间窗口内到达的多个独立查询合并为一次Agent调用，摊薄每次LLM往返的固定开销。
+只适用于无状态、上下文较短的Agent（如 database_query_agent）；合并响应中缺失的
+部分会退回为逐条调用，保证每个查询都能得到回答。
+合并的查询可能来自不同用户，查询与回答的分隔标记带有每批随机生成的nonce，
+查询文本与回答内容无法预先伪造；标记重复、缺失或乱序时整批作废，逐条重新执行。
+"""
+
+import asyncio
+import re
+import secrets
+import weakref
+from typing import Awaitable, Callable, List, Optional, Tuple
+
+batch_prompt_template = """以下是{count}个相互独立的查询，请逐一处理（可按需多次调用工具），
+并严格按照如下格式依次输出每个查询的完整回答，每个标记只输出一次，不要输出其他内容：
+[[回答-{nonce}-1]]
+（查询1的回答）
+[[回答-{nonce}-2]]
+（查询2的回答）
+...
+
+{queries}"""
+
+
+def new_batch_nonce() -> str:
+    """生成一批查询专用的分隔标记nonce"""
+    return secrets.token_hex(8)
+
+
+def build_batch_prompt(queries: List[str], nonce: str) -> str:
+    """将多个查询合并为一条带编号的提示"""
+    numbered = "\n\n".join(f"[[查询-{nonce}-{i}]]\n{query}" for i, query in enumerate(queries, 1))
+    return batch_prompt_template.format(count=len(queries), nonce=nonce, queries=numbered)
+
+
+def split_batch_response(text: str, count: int, nonce: str) -> List[Optional[str]]:
+    """
+    按 [[回答-nonce-i]] 标记拆分合并响应；为空的回答返回 None。
+    标记必须恰好按 1..count 的顺序各出现一次，否则无法确定各回答的边界，全部返回 None
+    """
+    parts = re.split(rf"\[\[回答-{re.escape(nonce)}-(\d+)\]\]", text or "")
+    # split结果形如 [前缀, 编号1, 内容1, 编号2, 内容2, ...]
+    if parts[1::2] != [str(i) for i in range(1, count + 1)]:
+        return [None] * count
+    return [content.strip() or None for content in parts[2::2]]
+
+
+class BatchingRunner:
+    """
+    合批执行器：submit() 的查询进入队列，在 window_ms 毫秒内或凑满 max_batch 条时合并分派。
+
+    :param run_fn: 执行单条提示的协程函数，返回最终响应文本
+    :param window_ms: 合批等待窗口（毫秒）
+    :param max_batch: 单批最多合并的查询数
+    """
+
+    def __init__(self, run_fn: Callable[[str], Awaitable[str]], window_ms: float = 25, max_batch: int = 8):
+        self.run_fn = run_fn
+        self.window = window_ms / 1000
+        self.max_batch = max_batch
+        # asyncio.Queue 与后台收集任务绑定事件循环，按循环分别创建
+        self._loop_state = weakref.WeakKeyDictionary()  # loop -> (queue, collector_task)
+        # 事件循环只保留任务的弱引用，执行中的分派任务需在此持有，完成后移除
+        self._dispatch_tasks = set()
+
+    def _queue(self) -> asyncio.Queue:
+        loop = asyncio.get_running_loop()
+        state = self._loop_state.get(loop)
+        if state is None or state[1].done():
+            queue = state[0] if state is not None else asyncio.Queue()
+            state = (queue, loop.create_task(self._collect(queue)))
+            self._loop_state[loop] = state
+        return state[0]
+
+    async def submit(self, text: str) -> str:
+        """提交一条查询，等待其（可能被合批处理的）响应"""
+        future = asyncio.get_running_loop().create_future()
+        await self._queue().put((text, future))
+        return await future
+
+    async def _collect(self, queue: asyncio.Queue) -> None:
+        """后台任务：按窗口/容量收集一批查询并分派"""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await queue.get()]
+            deadline = loop.time() + self.window
+            while len(batch) < self.max_batch:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+            task = loop.create_task(self._dispatch(batch))
+            self._dispatch_tasks.add(task)
+            task.add_done_callback(self._dispatch_tasks.discard)
+
+    async def _dispatch(self, batch: List[Tuple[str, asyncio.Future]]) -> None:
+        texts = [text for text, _ in batch]
+        try:
+            if len(batch) == 1:
+                answers = [await self.run_fn(texts[0])]
+            else:
+                nonce = new_batch_nonce()
+                answers = split_batch_response(await self.run_fn(build_batch_prompt(texts, nonce)), len(texts), nonce)
+                missing = [i for i, answer in enumerate(answers) if answer is None]
+                retried = await asyncio.gather(*(self.run_fn(texts[i]) for i in missing), return_exceptions=True)
+                for i, answer in zip(missing, retried):
+                    answers[i] = answer
+        except Exception as e:
+            answers = [e] * len(batch)
+
+        for (_, future), answer in zip(batch, answers):
+            if future.done():
+                continue
+            if isinstance(answer, BaseException):
+                future.set_exception(answer)
+            else:
+                future.set_result(answer)
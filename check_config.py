@@ -3,29 +3,60 @@
 生物反应科研Agent配置检查脚本
 """
 
+import asyncio
+import contextvars
+import importlib.util
+import logging
 import os
 import sys
 from pathlib import Path
 
+logger = logging.getLogger("bioreaction_adk_agent.cli")
+
+# 添加项目根目录到Python路径（在主线程中完成，检查线程不修改sys.path）
+sys.path.insert(0, str(Path(__file__).parent))
+
+# 并行执行检查时，每个检查的输出先写入各自的缓冲区，结束后按检查顺序统一输出
+_output_buffer = contextvars.ContextVar("_output_buffer", default=None)
+
+def _report(message, level=logging.INFO):
+    """输出一条进度信息"""
+    buffer = _output_buffer.get()
+    if buffer is not None:
+        buffer.append((message, level))
+    elif sys.stdout.isatty():
+        print(message)
+    else:
+        logger.log(level, "%s", message)
+
+def _replay(entries):
+    """按顺序输出缓冲的检查结果；交互终端下合并为一次写入"""
+    if sys.stdout.isatty():
+        sys.stdout.write("".join(f"{message}\n" for message, _ in entries))
+        sys.stdout.flush()
+    else:
+        for message, level in entries:
+            logger.log(level, "%s", message)
+
 def check_environment():
     """检查环境变量"""
-    print("=== 环境变量检查 ===")
+    _report("=== 环境变量检查 ===")
     
     api_key = os.getenv("GEMINI_API_KEY")
     if api_key:
-        print(f"✅ GEMINI_API_KEY: 已设置")
+        _report(f"✅ GEMINI_API_KEY: 已设置")
     else:
-        print("❌ GEMINI_API_KEY: 未设置")
+        _report("❌ GEMINI_API_KEY: 未设置", logging.ERROR)
         return False
     
     python_version = sys.version_info
-    print(f"✅ Python版本: {python_version.major}.{python_version.minor}.{python_version.micro}")
+    _report(f"✅ Python版本: {python_version.major}.{python_version.minor}.{python_version.micro}")
     
     return True
 
 def check_project_structure():
     """检查项目结构"""
-    print("\n=== 项目结构检查 ===")
+    _report("\n=== 项目结构检查 ===")
     
     project_root = Path(__file__).parent
     required_files = [
@@ -46,21 +77,31 @@ def check_project_structure():
     for file_path in required_files:
         full_path = project_root / file_path
         if full_path.exists():
-            print(f"✅ {file_path}")
+            _report(f"✅ {file_path}")
         else:
-            print(f"❌ {file_path} - 文件不存在")
+            _report(f"❌ {file_path} - 文件不存在", logging.ERROR)
             missing_files.append(file_path)
     
     if missing_files:
-        print(f"\n❌ 缺少 {len(missing_files)} 个必需文件")
+        _report(f"\n❌ 缺少 {len(missing_files)} 个必需文件", logging.ERROR)
         return False
     
-    print("✅ 项目结构完整")
+    _report("✅ 项目结构完整")
     return True
 
+def _is_installed(package):
+    """只查找模块规格而不执行导入；带点的名称先检查顶层包"""
+    top_level = package.split(".")[0]
+    if importlib.util.find_spec(top_level) is None:
+        return False
+    try:
+        return importlib.util.find_spec(package) is not None
+    except ModuleNotFoundError:
+        return False
+
 def check_dependencies():
     """检查依赖包"""
-    print("\n=== 依赖包检查 ===")
+    _report("\n=== 依赖包检查 ===")
     
     required_packages = [
         "google.adk",
@@ -71,29 +112,25 @@ def check_dependencies():
     
     missing_packages = []
     for package in required_packages:
-        try:
-            __import__(package)
-            print(f"✅ {package}")
-        except ImportError:
-            print(f"❌ {package} - 未安装")
+        if _is_installed(package):
+            _report(f"✅ {package}")
+        else:
+            _report(f"❌ {package} - 未安装", logging.ERROR)
             missing_packages.append(package)
     
     if missing_packages:
-        print(f"\n❌ 缺少 {len(missing_packages)} 个依赖包")
-        print("请运行: pip install -r requirements.txt")
+        _report(f"\n❌ 缺少 {len(missing_packages)} 个依赖包", logging.ERROR)
+        _report("请运行: pip install -r requirements.txt")
         return False
     
-    print("✅ 所有依赖包已安装")
+    _report("✅ 所有依赖包已安装")
     return True
 
 def check_config_file():
     """检查配置文件"""
-    print("\n=== 配置文件检查 ===")
+    _report("\n=== 配置文件检查 ===")
     
     try:
-        project_root = Path(__file__).parent
-        sys.path.insert(0, str(project_root))
-        
         from bioreaction_adk_agent.CONFIG import (
             DATABASE_DIR, 
             METADATA_BASE_DIR,
@@ -103,138 +140,166 @@ def check_config_file():
             validate_config
         )
         
-        print("✅ 配置文件导入成功")
-        print(f"✅ 数据库目录: {DATABASE_DIR}")
-        print(f"✅ 元数据目录: {METADATA_BASE_DIR}")
-        print(f"✅ Agent模型: {AGENT_CONFIG['model']}")
+        _report("✅ 配置文件导入成功")
+        _report(f"✅ 数据库目录: {DATABASE_DIR}")
+        _report(f"✅ 元数据目录: {METADATA_BASE_DIR}")
+        _report(f"✅ Agent模型: {AGENT_CONFIG['model']}")
         
+        # 配置检查需要反映当前的文件系统状态，清除缓存后重新验证
+        validate_config.cache_clear()
         config_errors = validate_config()
         if config_errors:
-            print("❌ 配置验证失败:")
+            _report("❌ 配置验证失败:", logging.ERROR)
             for error in config_errors:
-                print(f"  - {error}")
+                _report(f"  - {error}")
             return False
         else:
-            print("✅ 配置验证通过")
+            _report("✅ 配置验证通过")
         
         return True
         
     except Exception as e:
-        print(f"❌ 配置文件检查失败: {e}")
+        _report(f"❌ 配置文件检查失败: {e}", logging.ERROR)
         return False
 
 def check_database():
     """检查数据库文件"""
-    print("\n=== 数据库检查 ===")
+    _report("\n=== 数据库检查 ===")
     
     try:
         from bioreaction_adk_agent.CONFIG import DATABASE_DIR, DATABASE_CSV_FILES
         
         if not DATABASE_DIR.exists():
-            print(f"❌ 数据库目录不存在: {DATABASE_DIR}")
+            _report(f"❌ 数据库目录不存在: {DATABASE_DIR}", logging.ERROR)
             return False
         
-        print(f"✅ 数据库目录存在: {DATABASE_DIR}")
+        _report(f"✅ 数据库目录存在: {DATABASE_DIR}")
         
         missing_files = []
         for csv_file in DATABASE_CSV_FILES:
             file_path = DATABASE_DIR / csv_file
             if file_path.exists():
-                print(f"✅ {csv_file}")
+                _report(f"✅ {csv_file}")
             else:
-                print(f"❌ {csv_file} - 文件不存在")
+                _report(f"❌ {csv_file} - 文件不存在", logging.ERROR)
                 missing_files.append(csv_file)
         
         if missing_files:
-            print(f"\n❌ 缺少 {len(missing_files)} 个数据库文件")
+            _report(f"\n❌ 缺少 {len(missing_files)} 个数据库文件", logging.ERROR)
             return False
         
-        print("✅ 所有数据库文件存在")
+        _report("✅ 所有数据库文件存在")
         return True
         
     except Exception as e:
-        print(f"❌ 数据库检查失败: {e}")
+        _report(f"❌ 数据库检查失败: {e}", logging.ERROR)
         return False
 
 def check_agent_creation():
     """检查Agent创建"""
-    print("\n=== Agent创建检查 ===")
+    _report("\n=== Agent创建检查 ===")
     
     try:
-        from bioreaction_adk_agent.agent import root_agent
+        from bioreaction_adk_agent.agent import get_runner
         
-        print(f"✅ 主Agent: {root_agent.name}")
+        # Agent与Runner在首次使用时才构建，这里显式触发一次
+        root_agent = get_runner().agent
+        _report(f"✅ 主Agent: {root_agent.name}")
         tool_count = len(root_agent.tools)
-        print(f"✅ 工具数量: {tool_count}")
+        _report(f"✅ 工具数量: {tool_count}")
         
         return True
         
     except Exception as e:
-        print(f"❌ Agent创建检查失败: {e}")
+        _report(f"❌ Agent创建检查失败: {e}", logging.ERROR)
         return False
 
 def check_database_loading():
     """检查数据库加载"""
-    print("\n=== 数据库加载检查 ===")
+    _report("\n=== 数据库加载检查 ===")
     
     try:
         from bioreaction_adk_agent.tools.database_loader import DB
         
         if not DB:
-            print("❌ 数据库未加载")
+            _report("❌ 数据库未加载", logging.ERROR)
             return False
         
-        print(f"✅ 数据库已加载，包含 {len(DB)} 个表")
+        _report(f"✅ 数据库已加载，包含 {len(DB)} 个表")
         
         for table_name, df in DB.items():
-            print(f"  - {table_name}: {len(df)} 行")
+            _report(f"  - {table_name}: {len(df)} 行")
         
         return True
         
     except Exception as e:
-        print(f"❌ 数据库加载检查失败: {e}")
+        _report(f"❌ 数据库加载检查失败: {e}", logging.ERROR)
         return False
 
+async def _run_check(check_name, check_func):
+    """在线程中执行单个检查，返回 (是否通过, 缓冲的输出)"""
+    buffer = []
+    _output_buffer.set(buffer)
+    try:
+        # to_thread 会复制当前上下文，检查函数中的 _report 写入本检查的缓冲区
+        passed = await asyncio.to_thread(check_func)
+        if passed:
+            _report(f"✅ {check_name} 检查通过")
+        else:
+            _report(f"❌ {check_name} 检查失败", logging.ERROR)
+    except Exception as e:
+        passed = False
+        _report(f"❌ {check_name} 检查异常: {e}", logging.ERROR)
+    return bool(passed), buffer
+
+async def _run_checks(stages):
+    """各阶段内的检查并行执行，阶段之间顺序执行"""
+    results = []
+    for stage in stages:
+        results += await asyncio.gather(*(_run_check(name, func) for name, func in stage))
+    return results
+
 def main():
     """主函数"""
-    print("🔍 生物反应科研Agent配置检查")
-    print("=" * 50)
-    
-    checks = [
-        ("环境变量", check_environment),
-        ("项目结构", check_project_structure),
-        ("依赖包", check_dependencies),
-        ("配置文件", check_config_file),
-        ("数据库文件", check_database),
-        ("Agent创建", check_agent_creation),
-        ("数据库加载", check_database_loading),
+    from bioreaction_adk_agent.utils.logging_setup import setup_console_logging
+    setup_console_logging()
+    _report("🔍 生物反应科研Agent配置检查")
+    _report("=" * 50)
+    
+    # 第一阶段中只有配置文件检查导入本包，其余为不导入本包的文件系统/依赖检查；
+    # 其他导入本包的检查放在第二阶段，此时包已完成导入，避免多个线程同时初次导入同一个包
+    stages = [
+        [
+            ("环境变量", check_environment),
+            ("项目结构", check_project_structure),
+            ("依赖包", check_dependencies),
+            ("配置文件", check_config_file),
+        ],
+        [
+            ("数据库文件", check_database),
+            ("Agent创建", check_agent_creation),
+            ("数据库加载", check_database_loading),
+        ],
     ]
     
-    passed = 0
-    total = len(checks)
+    results = asyncio.run(_run_checks(stages))
+    _replay([entry for _, buffer in results for entry in buffer])
     
-    for check_name, check_func in checks:
-        try:
-            if check_func():
-                passed += 1
-                print(f"✅ {check_name} 检查通过")
-            else:
-                print(f"❌ {check_name} 检查失败")
-        except Exception as e:
-            print(f"❌ {check_name} 检查异常: {e}")
+    passed = sum(1 for check_passed, _ in results if check_passed)
+    total = len(results)
     
-    print("\n" + "=" * 50)
-    print(f"📊 检查结果: {passed}/{total} 通过")
+    _report("\n" + "=" * 50)
+    _report(f"📊 检查结果: {passed}/{total} 通过")
     
     if passed == total:
-        print("🎉 所有检查通过！系统配置正确。")
-        print("\n现在可以:")
-        print("1. 运行测试: python -m bioreaction_adk_agent.test_system")
-        print("2. 启动UI: adk web")
-        print("3. 使用API: python main.py")
+        _report("🎉 所有检查通过！系统配置正确。")
+        _report("\n现在可以:")
+        _report("1. 运行测试: python -m bioreaction_adk_agent.test_system")
+        _report("2. 启动UI: adk web")
+        _report("3. 使用API: python main.py")
         return True
     else:
-        print("⚠️  部分检查失败，请修复问题后重试。")
+        _report("⚠️  部分检查失败，请修复问题后重试。", logging.WARNING)
         return False
 
 if __name__ == "__main__":
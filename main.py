@@ -5,70 +5,85 @@
 这个文件用于启动ADK Web开发UI界面。
 """
 
+import logging
 import os
 import sys
 from pathlib import Path
 
+logger = logging.getLogger("bioreaction_adk_agent.cli")
+
+def _report(message, level=logging.INFO):
+    """输出一条进度信息"""
+    if sys.stdout.isatty():
+        print(message)
+    else:
+        logger.log(level, "%s", message)
+
 # 添加项目根目录到Python路径
 project_root = Path(__file__).parent
 sys.path.insert(0, str(project_root))
 
 def main():
     """主函数"""
-    print("🚀 启动生物反应科研Agent...")
+    from bioreaction_adk_agent.utils.logging_setup import setup_console_logging
+    setup_console_logging()
+    _report("🚀 启动生物反应科研Agent...")
     
     # 检查环境变量
     if not os.getenv("GEMINI_API_KEY"):
-        print("⚠️  警告: 未设置GEMINI_API_KEY环境变量")
-        print("请设置环境变量: export GEMINI_API_KEY='your_api_key'")
-        print("Agent功能可能受限...\n")
+        _report("⚠️  警告: 未设置GEMINI_API_KEY环境变量", logging.WARNING)
+        _report("请设置环境变量: export GEMINI_API_KEY='your_api_key'")
+        _report("Agent功能可能受限...\n")
     
     # 验证配置
     try:
         from bioreaction_adk_agent.CONFIG import validate_config
         config_errors = validate_config()
         if config_errors:
-            print("❌ 配置错误:")
+            _report("❌ 配置错误:", logging.ERROR)
             for error in config_errors:
-                print(f"  - {error}")
-            print("\n请修复配置错误后重试。")
+                _report(f"  - {error}")
+            _report("\n请修复配置错误后重试。")
             sys.exit(1)
         else:
-            print("✅ 配置验证通过")
+            _report("✅ 配置验证通过")
+        # 应用入口：按 LOG_CONFIG 初始化包级日志（导入包本身不配置日志）
+        from bioreaction_adk_agent.utils.logging_setup import setup_logging
+        setup_logging()
     except Exception as e:
-        print(f"❌ 配置验证失败: {e}")
+        _report(f"❌ 配置验证失败: {e}", logging.ERROR)
         sys.exit(1)
     
     # 检查数据库加载
     try:
         from bioreaction_adk_agent.tools.database_loader import DB
         if not DB:
-            print("❌ 数据库未加载")
+            _report("❌ 数据库未加载", logging.ERROR)
             sys.exit(1)
-        print(f"✅ 数据库已加载，包含 {len(DB)} 个表")
+        _report(f"✅ 数据库已加载，包含 {len(DB)} 个表")
     except Exception as e:
-        print(f"❌ 数据库加载失败: {e}")
+        _report(f"❌ 数据库加载失败: {e}", logging.ERROR)
         sys.exit(1)
     
     # 检查Agent
     try:
         from bioreaction_adk_agent.agent import root_agent
-        print(f"✅ Agent已准备就绪: {root_agent.name}")
+        _report(f"✅ Agent已准备就绪: {root_agent.name}")
     except Exception as e:
-        print(f"❌ Agent初始化失败: {e}")
+        _report(f"❌ Agent初始化失败: {e}", logging.ERROR)
         sys.exit(1)
     
-    print("\n🎯 系统启动成功！")
-    print("现在可以使用 'adk web' 命令启动开发UI界面。")
-    print("\n使用说明:")
-    print("1. 在终端中运行: adk web")
-    print("2. 浏览器会自动打开开发界面")
-    print("3. 开始与生物反应科研Agent交互")
-    print("\n示例查询:")
-    print("- '查找ADK酶的反应'")
-    print("- '分析E. coli中酶反应的性能趋势'")
-    print("- '比较不同物种的酶活性'")
-    print("- '获取数据库统计信息'")
+    _report("\n🎯 系统启动成功！")
+    _report("现在可以使用 'adk web' 命令启动开发UI界面。")
+    _report("\n使用说明:")
+    _report("1. 在终端中运行: adk web")
+    _report("2. 浏览器会自动打开开发界面")
+    _report("3. 开始与生物反应科研Agent交互")
+    _report("\n示例查询:")
+    _report("- '查找ADK酶的反应'")
+    _report("- '分析E. coli中酶反应的性能趋势'")
+    _report("- '比较不同物种的酶活性'")
+    _report("- '获取数据库统计信息'")
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
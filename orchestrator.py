@@ -0,0 +1,168 @@
+"""
+并行编排器
+
+由规划Agent一次性拆解多意图查询，并行调用选中的子Agent，最后汇总各子Agent的响应。
+多意图查询的耗时从各子Agent耗时之和降为其中的最大值。
+"""
+
+import asyncio
+import functools
+import json
+import re
+import weakref
+from typing import Dict, List, Optional, Sequence
+
+from google.adk.agents import LlmAgent
+from google.genai import types
+
+from .batching import BatchingRunner
+from .sessions import SESSION_SERVICE, get_runner
+
+_JSON_BLOCK_PATTERN = re.compile(r"\{.*\}", re.DOTALL)
+
+planner_instructions = """
+你是任务规划器。根据用户问题，决定需要调用哪些子Agent以及分别向它们提出什么子问题。
+可用的子Agent：
+{agent_catalog}
+
+规则：
+- 只输出JSON，不要输出其他内容，格式为：{{"tasks": [{{"agent": "子Agent名称", "query": "子问题"}}]}}
+- 相互独立的子问题分别列为一个任务，它们会被并行执行
+- 单一意图的问题只列一个任务，子问题保持用户原意
+"""
+
+aggregator_instructions = """
+你是结果汇总专家。你会收到用户的原始问题以及多个子Agent的回答。
+请整合这些回答，给出一个完整、准确、不重复的最终答复；不要添加回答中不存在的数据，并保留数据来源信息。
+"""
+
+
+class ParallelOrchestrator:
+    """
+    规划 -> 并行分派 -> 汇总 的编排器。
+
+    :param sub_agents: 可被分派的子Agent（不应挂在其他父Agent下）
+    :param model: 规划与汇总所用的模型
+    :param app_name: ADK应用名
+    :param max_concurrency: 同时运行的子Agent上限，避免触发模型调用频率限制
+    :param batched_agents: 启用请求合批的子Agent名称（仅适用于无状态的子Agent）
+    :param batch_window_ms: 合批等待窗口（毫秒）
+    :param max_batch_size: 单批最多合并的查询数
+    """
+
+    def __init__(self, sub_agents: List[LlmAgent], model: str, app_name: str, max_concurrency: int,
+                 batched_agents: Sequence[str] = (), batch_window_ms: float = 25, max_batch_size: int = 8):
+        self.app_name = app_name
+        self.max_concurrency = max_concurrency
+        self.sub_agents = {agent.name: agent for agent in sub_agents}
+        self.default_agent = sub_agents[0].name
+
+        agent_catalog = "\n".join(f"- {agent.name}: {agent.description}" for agent in sub_agents)
+        self.planner = LlmAgent(
+            name="task_planner",
+            model=model,
+            instruction=planner_instructions.format(agent_catalog=agent_catalog),
+            description="将用户问题拆解为可并行执行的子Agent任务"
+        )
+        self.aggregator = LlmAgent(
+            name="response_aggregator",
+            model=model,
+            instruction=aggregator_instructions,
+            description="汇总多个子Agent的回答"
+        )
+
+        self.session_service = SESSION_SERVICE
+        self._runners = {
+            agent.name: get_runner(agent, app_name=app_name)
+            for agent in [*sub_agents, self.planner, self.aggregator]
+        }
+        # asyncio.Semaphore 绑定事件循环，按循环分别创建
+        self._semaphores = weakref.WeakKeyDictionary()
+        # 合批后的查询来自不同用户，统一在内部用户下以临时会话执行
+        self._batchers = {
+            name: BatchingRunner(
+                functools.partial(self._run_single, name, user_id="batch"),
+                window_ms=batch_window_ms,
+                max_batch=max_batch_size
+            )
+            for name in batched_agents if name in self.sub_agents
+        }
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        if loop not in self._semaphores:
+            self._semaphores[loop] = asyncio.Semaphore(self.max_concurrency)
+        return self._semaphores[loop]
+
+    async def run_agent(self, agent_name: str, text: str, user_id: str) -> str:
+        """运行单个Agent并返回其最终响应文本；启用合批的Agent会与并发到达的查询合并执行"""
+        if agent_name in self._batchers:
+            return await self._batchers[agent_name].submit(text)
+        return await self._run_single(agent_name, text, user_id=user_id)
+
+    async def run_agent_in_session(self, agent_name: str, text: str, user_id: str, session_id: str) -> str:
+        """在用户已有的会话中运行单个Agent（不合批），本轮问答写入该会话，后续追问可引用上文"""
+        return await self._run_single(agent_name, text, user_id=user_id, session_id=session_id)
+
+    async def _run_single(self, agent_name: str, text: str, user_id: str, session_id: Optional[str] = None) -> str:
+        """运行单个Agent，返回其最终响应文本；未指定会话时在独立的临时会话中运行，结束后删除该会话"""
+        runner = self._runners[agent_name]
+        temporary = session_id is None
+        if temporary:
+            session_id = (await self.session_service.create_session(app_name=self.app_name, user_id=user_id)).id
+        user_content = types.Content(role='user', parts=[types.Part(text=text)])
+        final_response = ""
+        events = runner.run_async(user_id=user_id, session_id=session_id, new_message=user_content)
+        try:
+            async with self._semaphore():
+                async for event in events:
+                    if event.is_final_response() and event.content and event.content.parts:
+                        final_response = event.content.parts[0].text or final_response
+                        if final_response:
+                            break
+        finally:
+            # 拿到最终响应后立即关闭事件流，停止继续消费上游输出
+            await events.aclose()
+            if temporary:
+                await self.session_service.delete_session(app_name=self.app_name, user_id=user_id, session_id=session_id)
+        return final_response
+
+    async def plan(self, user_query: str, user_id: str) -> List[Dict[str, str]]:
+        """调用规划Agent生成任务列表；解析失败时退回到默认子Agent"""
+        plan_text = await self.run_agent(self.planner.name, user_query, user_id)
+        tasks = []
+        match = _JSON_BLOCK_PATTERN.search(plan_text or "")
+        if match:
+            try:
+                tasks = json.loads(match.group(0)).get("tasks", [])
+            except (json.JSONDecodeError, AttributeError):
+                tasks = []
+        tasks = [
+            {"agent": task["agent"], "query": task.get("query") or user_query}
+            for task in tasks
+            if isinstance(task, dict) and task.get("agent") in self.sub_agents
+        ]
+        return tasks or [{"agent": self.default_agent, "query": user_query}]
+
+    async def run(self, user_query: str, user_id: str = "default_user") -> str:
+        """规划、并行执行子任务并汇总结果"""
+        tasks = await self.plan(user_query, user_id)
+        results = await asyncio.gather(
+            *(self.run_agent(task["agent"], task["query"], user_id) for task in tasks),
+            return_exceptions=True
+        )
+
+        agent_responses = []
+        for task, result in zip(tasks, results):
+            if isinstance(result, Exception):
+                result = f"子Agent调用失败: {result}"
+            agent_responses.append((task, result))
+
+        if len(agent_responses) == 1:
+            return agent_responses[0][1] or "未能获取有效响应"
+
+        aggregation_prompt = f"用户问题: {user_query}\n\n" + "".join(
+            f"---{task['agent']} (子问题: {task['query']})---\n{response}\n\n"
+            for task, response in agent_responses
+        )
+        return await self.run_agent(self.aggregator.name, aggregation_prompt, user_id) or "未能获取有效响应"
@@ -0,0 +1,60 @@
+"""
+快速意图路由
+
+对特征明显的查询（反应方程式、PMID文献分析等）用预编译的正则规则直接确定子Agent，
+跳过根Agent的LLM路由回合。未命中任何规则的查询仍交给根Agent处理。
+只在子Agent的选择没有歧义时才命中：例如含PMID但询问转化率、条件等结构化数据的问题
+应交给database_query_agent，不属于文献分析规则。
+"""
+
+import re
+from typing import NamedTuple, Optional, Pattern
+
+
+class RouteRule(NamedTuple):
+    agent: str
+    pattern: Pattern
+    exclude: Optional[Pattern] = None
+
+
+# 含有多意图/高级分析信号的查询不走快速路由，交给根Agent判断
+_MULTI_INTENT_PATTERN = re.compile(r"趋势|优化|建议|以及|并且|同时|然后")
+
+# 指定PMID且明确要求分析文献内容（方法、结论、创新点等）的查询
+_LITERATURE_ANALYSIS_PATTERN = re.compile(
+    r"(?=.*PMID\s*\d+)(?=.*(?:分析|总结|概述|概括|摘要|方法|结论|创新|讨论|背景|贡献|解读|观点|研究思路))",
+    re.IGNORECASE | re.DOTALL
+)
+# 询问结构化数据字段的查询属于数据库检索，即使同时要求"分析"也不走文献规则
+_STRUCTURED_DATA_PATTERN = re.compile(
+    r"转化率|产率|得率|收率|选择性|温度|pH|条件|动力学|Km|kcat|Vmax|抑制|突变|底物|产物|参与物|物种|EC号|PDB|性能|酶活|统计|数量|多少",
+    re.IGNORECASE
+)
+
+# 规则按顺序匹配，先命中者生效
+ROUTE_RULES = (
+    # 反应方程式（"A + B -> C + D"）-> 数据库检索 reaction_equation 字段
+    RouteRule("database_query_agent", re.compile(r"->|→|=>|⟶|反应方程式"), _MULTI_INTENT_PATTERN),
+    # 指定PMID的文献内容分析 -> 文献深度研究
+    RouteRule(
+        "deep_research_agent",
+        _LITERATURE_ANALYSIS_PATTERN,
+        re.compile(f"{_MULTI_INTENT_PATTERN.pattern}|{_STRUCTURED_DATA_PATTERN.pattern}", re.IGNORECASE)
+    ),
+)
+
+
+class FastRouter:
+    """按顺序尝试预编译规则，返回命中的子Agent名称"""
+
+    def __init__(self, rules=ROUTE_RULES):
+        self.rules = tuple(rules)
+
+    def match(self, user_query: str) -> Optional[str]:
+        for rule in self.rules:
+            if rule.pattern.search(user_query) and not (rule.exclude and rule.exclude.search(user_query)):
+                return rule.agent
+        return None
+
+
+fast_router = FastRouter()
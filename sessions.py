@@ -0,0 +1,97 @@
+"""
+共享会话服务
+
+进程内所有Runner共用同一个有界的会话服务（按TTL过期、按LRU淘汰）；同一Agent的Runner只创建一次。
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Tuple
+
+from google.adk.agents import BaseAgent
+from google.adk.runners import Runner
+from google.adk.sessions import InMemorySessionService
+
+from .CONFIG import AGENT_CONFIG
+
+
+class BoundedSessionService(InMemorySessionService):
+    """
+    有界的内存会话服务：会话闲置超过 ttl 秒后过期，总数超过 max_size 时淘汰最久未访问的会话，
+    长时间运行的 adk web 进程内存不再随用户数无限增长。
+    """
+
+    def __init__(self, max_size: int, ttl: float):
+        super().__init__()
+        self.max_size = max_size
+        self.ttl = ttl
+        self._access = OrderedDict()  # (app_name, user_id, session_id) -> 最近访问时间
+        self._access_lock = threading.Lock()
+
+    def _touch(self, key: Tuple[str, str, str]) -> None:
+        with self._access_lock:
+            self._access[key] = time.monotonic()
+            self._access.move_to_end(key)
+
+    async def _evict(self) -> None:
+        """移除过期及超出容量的会话"""
+        expired = []
+        deadline = time.monotonic() - self.ttl
+        with self._access_lock:
+            while self._access:
+                key, last_access = next(iter(self._access.items()))
+                if last_access >= deadline and len(self._access) <= self.max_size:
+                    break
+                self._access.popitem(last=False)
+                expired.append(key)
+        for app_name, user_id, session_id in expired:
+            await super().delete_session(app_name=app_name, user_id=user_id, session_id=session_id)
+
+    # 只覆盖会话服务的公开接口，不依赖ADK内部的 _*_impl 实现
+    async def create_session(self, *, app_name, user_id, state=None, session_id=None):
+        session = await super().create_session(
+            app_name=app_name, user_id=user_id, state=state, session_id=session_id
+        )
+        self._touch((app_name, user_id, session.id))
+        await self._evict()
+        return session
+
+    async def get_session(self, *, app_name, user_id, session_id, config=None):
+        await self._evict()
+        session = await super().get_session(
+            app_name=app_name, user_id=user_id, session_id=session_id, config=config
+        )
+        if session is not None:
+            self._touch((app_name, user_id, session.id))
+        return session
+
+    async def delete_session(self, *, app_name, user_id, session_id):
+        await super().delete_session(app_name=app_name, user_id=user_id, session_id=session_id)
+        with self._access_lock:
+            self._access.pop((app_name, user_id, session_id), None)
+
+    async def append_event(self, session, event):
+        event = await super().append_event(session=session, event=event)
+        self._touch((session.app_name, session.user_id, session.id))
+        return event
+
+
+SESSION_SERVICE = BoundedSessionService(max_size=AGENT_CONFIG["session_max_size"], ttl=AGENT_CONFIG["session_ttl"])
+
+# (app_name, id(agent)) -> (agent, runner)；同时持有agent引用，保证id不被复用
+RUNNER_CACHE: Dict[Tuple[str, int], Tuple[BaseAgent, Runner]] = {}
+_runner_lock = threading.Lock()
+
+
+def get_runner(agent: BaseAgent, app_name: str = AGENT_CONFIG["app_name"]) -> Runner:
+    """获取（必要时创建）绑定共享会话服务的Runner"""
+    key = (app_name, id(agent))
+    entry = RUNNER_CACHE.get(key)
+    if entry is None:
+        with _runner_lock:
+            entry = RUNNER_CACHE.get(key)
+            if entry is None:
+                entry = (agent, Runner(agent=agent, app_name=app_name, session_service=SESSION_SERVICE))
+                RUNNER_CACHE[key] = entry
+    return entry[1]
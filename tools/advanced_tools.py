@@ -1,8 +1,7 @@
-from google.adk.tools import FunctionTool
 import pandas as pd
 import numpy as np
 from typing import List, Dict, Optional, Tuple
-from .database_loader import DB
+from .database_loader import DB, VIEWS, cached_tool, get_table, ORGANISM_PERFORMANCE, contains_mask, organism_performance, reaction_profiles, rows_for_reaction
 from ..CONFIG import ANALYSIS_CONFIG, QUERY_CONFIG
 import json
 
@@ -10,30 +9,66 @@ def _safe_numeric_conversion(series: pd.Series) -> pd.Series:
     """安全地将字符串转换为数值类型"""
     return pd.to_numeric(series, errors='coerce')
 
+def _pearson(x: np.ndarray, y: np.ndarray) -> Tuple[float, int]:
+    """成对剔除NaN后的皮尔逊相关系数，返回 (相关系数, 有效样本数)；与 DataFrame.corr 结果一致"""
+    valid = ~(np.isnan(x) | np.isnan(y))
+    n = int(np.count_nonzero(valid))
+    if n < 2:
+        return np.nan, n
+    # 每列只做一次筛选复制；无缺失值时直接使用原数组
+    if n < len(valid):
+        x, y = x[valid], y[valid]
+    dx = x - x.mean()
+    dy = y - y.mean()
+    divisor = np.sqrt(np.dot(dx, dx) * np.dot(dy, dy))
+    if divisor == 0:
+        return np.nan, n
+    return float(np.clip(np.dot(dx, dy) / divisor, -1.0, 1.0)), n
+
+def _trend_stats(temperature: np.ndarray, ph: np.ndarray, values: np.ndarray) -> Tuple[float, int, float, int, float, float, int, int]:
+    """
+    一次性计算趋势分析所需的全部统计量（直接在float64数组上计算，不构造中间DataFrame）
+
+    :return: (温度相关系数, 温度有效点数, pH相关系数, pH有效点数, 均值, 标准差, 高表现样本数, 指标有效点数)
+    """
+    corr_temp, n_temp = _pearson(temperature, values)
+    corr_ph, n_ph = _pearson(ph, values)
+    # 指标列通常已剔除缺失值，此时直接使用原数组，不再复制
+    missing = np.isnan(values)
+    valid = values[~missing] if missing.any() else values
+    n = len(valid)
+    mean = valid.mean() if n else np.nan
+    # 离差只计算一次，同时用于样本标准差（ddof=1）
+    deviations = valid - mean
+    std = np.sqrt(np.dot(deviations, deviations) / (n - 1)) if n > 1 else np.nan
+    n_high = int(np.count_nonzero(valid > mean + std))
+    return corr_temp, n_temp, corr_ph, n_ph, mean, std, n_high, n
+
 def _format_trend_analysis(trend_data: Dict, title: str) -> str:
     """格式化趋势分析结果"""
-    result = f"## {title}\n\n"
+    parts = [f"## {title}\n\n"]
     
     if trend_data.get('trend_type') == 'increasing':
-        result += "📈 **上升趋势**\n"
+        parts.append("📈 **上升趋势**\n")
     elif trend_data.get('trend_type') == 'decreasing':
-        result += "📉 **下降趋势**\n"
+        parts.append("📉 **下降趋势**\n")
     elif trend_data.get('trend_type') == 'stable':
-        result += "➡️ **稳定趋势**\n"
+        parts.append("➡️ **稳定趋势**\n")
     else:
-        result += "📊 **复杂趋势**\n"
+        parts.append("📊 **复杂趋势**\n")
     
     if trend_data.get('correlation'):
-        result += f"**相关性系数**: {trend_data['correlation']:.3f}\n"
+        parts.append(f"**相关性系数**: {trend_data['correlation']:.3f}\n")
     
     if trend_data.get('key_factors'):
-        result += f"**关键影响因素**: {', '.join(trend_data['key_factors'])}\n"
+        parts.append(f"**关键影响因素**: {', '.join(trend_data['key_factors'])}\n")
     
     if trend_data.get('recommendations'):
-        result += f"**优化建议**: {trend_data['recommendations']}\n"
+        parts.append(f"**优化建议**: {trend_data['recommendations']}\n")
     
-    return result
+    return "".join(parts)
 
+@cached_tool
 def analyze_reaction_trends(
     enzyme_name: str,
     organism: str,
@@ -51,43 +86,60 @@ def analyze_reaction_trends(
     if not DB: return "数据库未加载。"
     
     # 获取相关数据
-    activity_df = DB.get('4_activity_performance', pd.DataFrame())
-    enzymes_df = DB.get('2_enzymes', pd.DataFrame())
-    conditions_df = DB.get('3_experimental_conditions', pd.DataFrame())
+    activity_df = get_table('4_activity_performance')
+    enzymes_df = get_table('2_enzymes')
+    conditions_df = get_table('3_experimental_conditions')
     
     if activity_df.empty or enzymes_df.empty:
         return "核心数据表未加载。"
     
-    # 合并数据
-    merged_df = pd.merge(activity_df, enzymes_df, on=['literature_id', 'reaction_id'])
-    merged_df = pd.merge(merged_df, conditions_df, on=['literature_id', 'reaction_id'], how='left')
+    # 合并数据（加载时已预先关联）
+    merged_df = VIEWS['performance']
     
     # 应用筛选条件
     if enzyme_name:
-        merged_df = merged_df[
-            merged_df['enzyme_name'].str.contains(enzyme_name, case=False, na=False) |
-            merged_df['enzyme_synonyms'].str.contains(enzyme_name, case=False, na=False)
-        ]
+        enzyme_mask = (
+            contains_mask('performance', 'enzyme_name', enzyme_name) |
+            contains_mask('performance', 'enzyme_synonyms', enzyme_name)
+        )
+    else:
+        enzyme_mask = True
     
     if organism:
-        merged_df = merged_df[merged_df['organism'].str.contains(organism, case=False, na=False)]
+        organism_mask = contains_mask('performance', 'organism', organism)
+    else:
+        organism_mask = True
+    
+    # 两个条件合并为一次筛选（检索掩码与预关联视图的行对齐）
+    if enzyme_name or organism:
+        merged_df = merged_df[enzyme_mask & organism_mask]
     
     if len(merged_df) < min_data_points:
         return f"数据点不足（{len(merged_df)} < {min_data_points}），无法进行可靠的趋势分析。"
     
     # 数值转换
     if metric in ['conversion_rate', 'product_yield']:
-        merged_df[metric] = _safe_numeric_conversion(merged_df[metric])
+        # assign 返回新对象，不修改共享的预关联视图
+        merged_df = merged_df.assign(**{metric: _safe_numeric_conversion(merged_df[metric])})
         merged_df = merged_df.dropna(subset=[metric])
     
     # 趋势分析
     trends = {}
     
+    # 温度、pH与性能分布的统计量一次算出
+    numeric_metric = metric in ['conversion_rate', 'product_yield']
+    if numeric_metric:
+        nan_column = np.full(len(merged_df), np.nan)
+        corr_temp, n_temp, corr_ph, n_ph, mean_val, std_val, n_high, n_values = _trend_stats(
+            merged_df['temperature_celsius'].to_numpy(np.float64, copy=False) if 'temperature_celsius' in merged_df.columns else nan_column,
+            merged_df['ph'].to_numpy(np.float64, copy=False) if 'ph' in merged_df.columns else nan_column,
+            merged_df[metric].to_numpy(np.float64, copy=False)
+        )
+    
     # 1. 温度对性能的影响
-    if 'temperature_celsius' in merged_df.columns and metric in ['conversion_rate', 'product_yield']:
-        temp_perf = merged_df[['temperature_celsius', metric]].dropna()
-        if len(temp_perf) >= 3:
-            correlation = temp_perf.corr().iloc[0, 1]
+    if 'temperature_celsius' in merged_df.columns and numeric_metric:
+        if n_temp >= 3:
+            correlation = corr_temp
             # 使用配置中的相关性阈值
             threshold = ANALYSIS_CONFIG["correlation_threshold"]
             trends['temperature_impact'] = {
@@ -98,10 +150,9 @@ def analyze_reaction_trends(
             }
     
     # 2. pH对性能的影响
-    if 'ph' in merged_df.columns and metric in ['conversion_rate', 'product_yield']:
-        ph_perf = merged_df[['ph', metric]].dropna()
-        if len(ph_perf) >= 3:
-            correlation = ph_perf.corr().iloc[0, 1]
+    if 'ph' in merged_df.columns and numeric_metric:
+        if n_ph >= 3:
+            correlation = corr_ph
             threshold = ANALYSIS_CONFIG["correlation_threshold"]
             trends['ph_impact'] = {
                 'trend_type': 'stable' if abs(correlation) < threshold else ('increasing' if correlation > 0 else 'decreasing'),
@@ -112,8 +163,11 @@ def analyze_reaction_trends(
     
     # 3. 物种间性能对比
     if not organism and 'organism' in merged_df.columns:
-        org_perf = merged_df.groupby('organism')[metric].agg(['mean', 'count']).reset_index()
-        org_perf = org_perf[org_perf['count'] >= 2].sort_values('mean', ascending=False)
+        # 未按酶筛选时直接使用加载时预先聚合的结果
+        if not enzyme_name and metric in ORGANISM_PERFORMANCE:
+            org_perf = ORGANISM_PERFORMANCE[metric]
+        else:
+            org_perf = organism_performance(merged_df, metric)
         if len(org_perf) >= 2:
             top_org = org_perf.iloc[0]['organism']
             trends['organism_comparison'] = {
@@ -123,40 +177,38 @@ def analyze_reaction_trends(
             }
     
     # 4. 整体性能分布
-    if metric in ['conversion_rate', 'product_yield']:
-        values = merged_df[metric].dropna()
-        if len(values) > 0:
-            mean_val = values.mean()
-            std_val = values.std()
+    if numeric_metric:
+        if n_values > 0:
             trends['performance_distribution'] = {
                 'trend_type': 'stable',
                 'key_factors': [f'平均{metric}: {mean_val:.2f}', f'标准差: {std_val:.2f}'],
-                'recommendations': f"当前{metric}平均值为{mean_val:.2f}，有{len(values[values > mean_val + std_val])}个高表现样本"
+                'recommendations': f"当前{metric}平均值为{mean_val:.2f}，有{n_high}个高表现样本"
             }
     
     # 格式化输出
-    result = f"# 生物化学反应趋势分析报告\n\n"
-    result += f"**分析范围**: {len(merged_df)} 个反应\n"
-    result += f"**主要指标**: {metric}\n"
+    parts = [f"# 生物化学反应趋势分析报告\n\n"]
+    parts.append(f"**分析范围**: {len(merged_df)} 个反应\n")
+    parts.append(f"**主要指标**: {metric}\n")
     if enzyme_name:
-        result += f"**目标酶**: {enzyme_name}\n"
+        parts.append(f"**目标酶**: {enzyme_name}\n")
     if organism:
-        result += f"**目标物种**: {organism}\n"
-    result += "\n"
+        parts.append(f"**目标物种**: {organism}\n")
+    parts.append("\n")
     
     for trend_name, trend_data in trends.items():
         if trend_name == 'temperature_impact':
-            result += _format_trend_analysis(trend_data, "温度影响分析")
+            parts.append(_format_trend_analysis(trend_data, "温度影响分析"))
         elif trend_name == 'ph_impact':
-            result += _format_trend_analysis(trend_data, "pH影响分析")
+            parts.append(_format_trend_analysis(trend_data, "pH影响分析"))
         elif trend_name == 'organism_comparison':
-            result += _format_trend_analysis(trend_data, "物种性能对比")
+            parts.append(_format_trend_analysis(trend_data, "物种性能对比"))
         elif trend_name == 'performance_distribution':
-            result += _format_trend_analysis(trend_data, "性能分布分析")
-        result += "\n"
+            parts.append(_format_trend_analysis(trend_data, "性能分布分析"))
+        parts.append("\n")
     
-    return result
+    return "".join(parts)
 
+@cached_tool
 def compare_reactions(
     reaction_ids: List[str],
     comparison_metrics: List[str]
@@ -181,63 +233,38 @@ def compare_reactions(
         else:
             return f"反应ID格式错误: {reaction_id}，应为 'literature_id:reaction_id'"
     
-    # 获取数据
-    core_df = DB.get('1_reactions_core', pd.DataFrame())
-    enzymes_df = DB.get('2_enzymes', pd.DataFrame())
-    activity_df = DB.get('4_activity_performance', pd.DataFrame())
-    conditions_df = DB.get('3_experimental_conditions', pd.DataFrame())
-    
-    # 筛选目标反应
+    # 筛选目标反应：从预关联的反应概要中一次性取出全部目标反应
     comparison_data = []
-    for lit_id, react_id in parsed_reactions:
+    for (lit_id, react_id), profile in zip(parsed_reactions, reaction_profiles(parsed_reactions)):
         reaction_data = {
             'literature_id': lit_id,
             'reaction_id': react_id
         }
-        
-        # 核心信息
-        core_info = core_df[(core_df['literature_id'] == lit_id) & (core_df['reaction_id'] == react_id)]
-        if not core_info.empty:
-            reaction_data.update(core_info.iloc[0].to_dict())
-        
-        # 酶信息
-        enzyme_info = enzymes_df[(enzymes_df['literature_id'] == lit_id) & (enzymes_df['reaction_id'] == react_id)]
-        if not enzyme_info.empty:
-            reaction_data.update(enzyme_info.iloc[0].to_dict())
-        
-        # 性能信息
-        activity_info = activity_df[(activity_df['literature_id'] == lit_id) & (activity_df['reaction_id'] == react_id)]
-        if not activity_info.empty:
-            reaction_data.update(activity_info.iloc[0].to_dict())
-        
-        # 条件信息
-        condition_info = conditions_df[(conditions_df['literature_id'] == lit_id) & (conditions_df['reaction_id'] == react_id)]
-        if not condition_info.empty:
-            reaction_data.update(condition_info.iloc[0].to_dict())
-        
+        if profile is not None:
+            reaction_data.update(profile)
         comparison_data.append(reaction_data)
     
     if not comparison_data:
         return "未找到指定的反应数据。"
     
     # 生成对比报告
-    result = "# 反应对比分析报告\n\n"
+    parts = ["# 反应对比分析报告\n\n"]
     
     # 基本信息对比
-    result += "## 基本信息对比\n\n"
-    result += "| 反应ID | 酶名称 | 物种 | 反应方程式 |\n"
-    result += "|--------|--------|------|------------|\n"
+    parts.append("## 基本信息对比\n\n")
+    parts.append("| 反应ID | 酶名称 | 物种 | 反应方程式 |\n")
+    parts.append("|--------|--------|------|------------|\n")
     for data in comparison_data:
-        result += f"| {data.get('literature_id', '')}:{data.get('reaction_id', '')} | "
-        result += f"{data.get('enzyme_name', 'N/A')} | "
-        result += f"{data.get('organism', 'N/A')} | "
-        result += f"{data.get('reaction_equation', 'N/A')} |\n"
-    result += "\n"
+        parts.append(f"| {data.get('literature_id', '')}:{data.get('reaction_id', '')} | ")
+        parts.append(f"{data.get('enzyme_name', 'N/A')} | ")
+        parts.append(f"{data.get('organism', 'N/A')} | ")
+        parts.append(f"{data.get('reaction_equation', 'N/A')} |\n")
+    parts.append("\n")
     
     # 性能指标对比
-    result += "## 性能指标对比\n\n"
-    result += "| 反应ID | 转化率 | 产率 | 温度(°C) | pH |\n"
-    result += "|--------|--------|------|----------|----|\n"
+    parts.append("## 性能指标对比\n\n")
+    parts.append("| 反应ID | 转化率 | 产率 | 温度(°C) | pH |\n")
+    parts.append("|--------|--------|------|----------|----|\n")
     for data in comparison_data:
         # 转化率
         cr = data.get('conversion_rate', 'N/A')
@@ -249,58 +276,49 @@ def compare_reactions(
         py_unit = data.get('product_yield_unit', '')
         py_error = data.get('product_yield_error', '')
         py_str = f"{py} {py_unit} {(f'(误差: {py_error})' if py_error else '')}" if py != 'N/A' else 'N/A'
-        result += f"| {data.get('literature_id', '')}:{data.get('reaction_id', '')} | "
-        result += f"{cr_str} | "
-        result += f"{py_str} | "
-        result += f"{data.get('temperature_celsius', 'N/A')} | "
-        result += f"{data.get('ph', 'N/A')} |\n"
-        result += "\n"
+        parts.append(f"| {data.get('literature_id', '')}:{data.get('reaction_id', '')} | ")
+        parts.append(f"{cr_str} | ")
+        parts.append(f"{py_str} | ")
+        parts.append(f"{data.get('temperature_celsius', 'N/A')} | ")
+        parts.append(f"{data.get('ph', 'N/A')} |\n")
+        parts.append("\n")
     
     # 关键差异分析
-    result += "## 关键差异分析\n\n"
+    parts.append("## 关键差异分析\n\n")
+    
+    # 数值列一次性向量化转换，缺失或非数值记为NaN后跳过
+    comparison_df = pd.DataFrame(comparison_data)
+    
+    def numeric_column(column):
+        if column not in comparison_df.columns:
+            return pd.Series(dtype=float)
+        return pd.to_numeric(comparison_df[column], errors='coerce')
     
     # 转化率对比
-    print(comparison_data)
-    conversion_rates = [
-        float(data.get('conversion_rate')) for data in comparison_data
-        if data.get('conversion_rate') not in [None, '', 'N/A']
-        and str(data.get('conversion_rate')).replace('.', '', 1).isdigit()
-    ]
+    conversion_rates = numeric_column('conversion_rate')
+    conversion_rates = conversion_rates[conversion_rates >= 0]
     if len(conversion_rates) >= 2:
-        max_rate = max(conversion_rates)
-        min_rate = min(conversion_rates)
-        # 用类型一致的 float 比较
-        best_reaction = next(
-            (
-                data for data in comparison_data
-                if (
-                    data.get('conversion_rate') not in [None, '', 'N/A'] and
-                    abs(float(data.get('conversion_rate')) - max_rate) < 1e-8
-                )
-            ),
-            None
-        )
-        if best_reaction:
-            result += f"**转化率差异**: 最高 {max_rate}，最低 {min_rate}\n"
-            result += f"**最佳反应**: {best_reaction.get('literature_id')}:{best_reaction.get('reaction_id')}\n"
-            result += f"**关键因素**: 酶({best_reaction.get('enzyme_name')})，物种({best_reaction.get('organism')})\n\n"
-        else:
-            result += f"**转化率差异**: 最高 {max_rate}，最低 {min_rate}\n"
-            result += f"**未能定位到最佳反应的详细信息**\n\n"
+        max_rate = float(conversion_rates.max())
+        min_rate = float(conversion_rates.min())
+        best_reaction = comparison_data[conversion_rates.idxmax()]
+        parts.append(f"**转化率差异**: 最高 {max_rate}，最低 {min_rate}\n")
+        parts.append(f"**最佳反应**: {best_reaction.get('literature_id')}:{best_reaction.get('reaction_id')}\n")
+        parts.append(f"**关键因素**: 酶({best_reaction.get('enzyme_name')})，物种({best_reaction.get('organism')})\n\n")
             
     # 条件差异
-    temperatures = [data.get('temperature_celsius') for data in comparison_data if data.get('temperature_celsius')]
+    temperatures = numeric_column('temperature_celsius').dropna()
     if len(temperatures) >= 2:
-        temp_range = max(temperatures) - min(temperatures)
-        result += f"**温度范围**: {min(temperatures)} - {max(temperatures)}°C (差异: {temp_range}°C)\n"
+        min_temp, max_temp = float(temperatures.min()), float(temperatures.max())
+        parts.append(f"**温度范围**: {min_temp} - {max_temp}°C (差异: {max_temp - min_temp}°C)\n")
     
-    phs = [data.get('ph') for data in comparison_data if data.get('ph')]
+    phs = numeric_column('ph').dropna()
     if len(phs) >= 2:
-        ph_range = max(phs) - min(phs)
-        result += f"**pH范围**: {min(phs)} - {max(phs)} (差异: {ph_range})\n\n"
+        min_ph, max_ph = float(phs.min()), float(phs.max())
+        parts.append(f"**pH范围**: {min_ph} - {max_ph} (差异: {max_ph - min_ph})\n\n")
     
-    return result
+    return "".join(parts)
 
+@cached_tool
 def suggest_optimization(
     literature_id: str,
     reaction_id: str,
@@ -317,118 +335,142 @@ def suggest_optimization(
     """
     if not DB: return "数据库未加载。"
     
-    # 获取目标反应信息
-    core_df = DB.get('1_reactions_core', pd.DataFrame())
-    enzymes_df = DB.get('2_enzymes', pd.DataFrame())
-    activity_df = DB.get('4_activity_performance', pd.DataFrame())
-    conditions_df = DB.get('3_experimental_conditions', pd.DataFrame())
+    # 获取目标反应信息（按关联键哈希查找，不逐表扫描）
+    enzymes_df = get_table('2_enzymes')
+    activity_df = get_table('4_activity_performance')
+    conditions_df = get_table('3_experimental_conditions')
     
-    target_reaction = core_df[(core_df['literature_id'] == literature_id) & (core_df['reaction_id'] == reaction_id)]
+    target_reaction = rows_for_reaction('1_reactions_core', literature_id, reaction_id)
     if target_reaction.empty:
         return f"未找到反应 {literature_id}:{reaction_id}"
     
-    target_enzyme = enzymes_df[(enzymes_df['literature_id'] == literature_id) & (enzymes_df['reaction_id'] == reaction_id)]
-    target_activity = activity_df[(activity_df['literature_id'] == literature_id) & (activity_df['reaction_id'] == reaction_id)]
-    target_condition = conditions_df[(conditions_df['literature_id'] == literature_id) & (conditions_df['reaction_id'] == reaction_id)]
+    target_enzyme = rows_for_reaction('2_enzymes', literature_id, reaction_id)
+    target_activity = rows_for_reaction('4_activity_performance', literature_id, reaction_id)
+    target_condition = rows_for_reaction('3_experimental_conditions', literature_id, reaction_id)
     
     # 获取当前性能
-    current_performance = target_activity[target_metric].iloc[0] if not target_activity.empty else None
+    current_performance = target_activity[target_metric].to_numpy()[0] if not target_activity.empty else None
     
-    result = f"# 反应优化建议报告\n\n"
-    result += f"**目标反应**: {literature_id}:{reaction_id}\n"
-    result += f"**优化目标**: {target_metric}\n"
-    result += f"**当前性能**: {current_performance}\n\n"
+    parts = [f"# 反应优化建议报告\n\n"]
+    parts.append(f"**目标反应**: {literature_id}:{reaction_id}\n")
+    parts.append(f"**优化目标**: {target_metric}\n")
+    parts.append(f"**当前性能**: {current_performance}\n\n")
     
     # 基于优化类型提供建议
     if optimization_type == 'condition':
-        result += _suggest_condition_optimization(target_condition, target_metric, activity_df, conditions_df)
+        parts.append(_suggest_condition_optimization(target_condition, target_metric, activity_df, conditions_df))
     elif optimization_type == 'enzyme':
-        result += _suggest_enzyme_optimization(target_enzyme, target_metric, enzymes_df, activity_df)
+        parts.append(_suggest_enzyme_optimization(target_enzyme, target_metric, enzymes_df, activity_df))
     elif optimization_type == 'organism':
-        result += _suggest_organism_optimization(target_enzyme, target_metric, enzymes_df, activity_df)
+        parts.append(_suggest_organism_optimization(target_enzyme, target_metric, enzymes_df, activity_df))
     else:
-        result += "不支持的优化类型。"
+        parts.append("不支持的优化类型。")
     
-    return result
+    return "".join(parts)
+
+def _value_at_best(merged: pd.DataFrame, target_metric: str, column: str):
+    """
+    取目标指标最大的行在column列上的值（忽略缺失值）；指标全部缺失时返回None。
+    直接在numpy数组上定位，非数值的指标列先转换为数值。
+    """
+    metrics = merged[target_metric]
+    if not pd.api.types.is_numeric_dtype(metrics):
+        metrics = _safe_numeric_conversion(metrics)
+    metrics = metrics.to_numpy(np.float64, copy=False)
+    if np.isnan(metrics).all():
+        return None
+    return merged[column].to_numpy()[np.nanargmax(metrics)]
 
 def _suggest_condition_optimization(target_condition, target_metric, activity_df, conditions_df):
     """提供条件优化建议"""
-    result = "## 实验条件优化建议\n\n"
+    parts = ["## 实验条件优化建议\n\n"]
     
     # 温度优化
     if 'temperature_celsius' in target_condition.columns:
-        current_temp = target_condition['temperature_celsius'].iloc[0]
+        current_temp = target_condition['temperature_celsius'].to_numpy()[0]
         # 使用配置中的温度范围
         temp_ranges = ANALYSIS_CONFIG["temperature_ranges"]
         room_temp_range = temp_ranges["room"]
-        similar_conditions = conditions_df[
-            (conditions_df['temperature_celsius'].between(room_temp_range[0], room_temp_range[1])) &
-            (conditions_df['temperature_celsius'] != current_temp)
+        conditions_activity = VIEWS['conditions_activity']
+        merged = conditions_activity[
+            (conditions_activity['temperature_celsius'].between(room_temp_range[0], room_temp_range[1])) &
+            (conditions_activity['temperature_celsius'] != current_temp)
         ]
         
-        if not similar_conditions.empty:
-            merged = pd.merge(similar_conditions, activity_df, on=['literature_id', 'reaction_id'])
+        if not merged.empty:
             if target_metric in merged.columns:
-                best_temp = merged.loc[merged[target_metric].idxmax(), 'temperature_celsius']
-                result += f"**温度建议**: 当前 {current_temp}°C，建议尝试 {best_temp}°C\n"
+                best_temp = _value_at_best(merged, target_metric, 'temperature_celsius')
+                if best_temp is not None:
+                    parts.append(f"**温度建议**: 当前 {current_temp}°C，建议尝试 {best_temp}°C\n")
     
     # pH优化
     if 'ph' in target_condition.columns:
-        current_ph = target_condition['ph'].iloc[0]
+        current_ph = target_condition['ph'].to_numpy()[0]
         # 使用配置中的pH范围
         ph_ranges = ANALYSIS_CONFIG["ph_ranges"]
         neutral_range = ph_ranges["neutral_weak_basic"]
-        similar_ph = conditions_df[
-            (conditions_df['ph'].between(neutral_range[0], neutral_range[1])) &
-            (conditions_df['ph'] != current_ph)
+        conditions_activity = VIEWS['conditions_activity']
+        merged = conditions_activity[
+            (conditions_activity['ph'].between(neutral_range[0], neutral_range[1])) &
+            (conditions_activity['ph'] != current_ph)
         ]
         
-        if not similar_ph.empty:
-            merged = pd.merge(similar_ph, activity_df, on=['literature_id', 'reaction_id'])
+        if not merged.empty:
             if target_metric in merged.columns:
-                best_ph = merged.loc[merged[target_metric].idxmax(), 'ph']
-                result += f"**pH建议**: 当前 {current_ph}，建议尝试 {best_ph}\n"
+                best_ph = _value_at_best(merged, target_metric, 'ph')
+                if best_ph is not None:
+                    parts.append(f"**pH建议**: 当前 {current_ph}，建议尝试 {best_ph}\n")
     
-    return result
+    return "".join(parts)
 
 def _suggest_enzyme_optimization(target_enzyme, target_metric, enzymes_df, activity_df):
     """提供酶优化建议"""
-    result = "## 酶优化建议\n\n"
+    parts = ["## 酶优化建议\n\n"]
     
     if not target_enzyme.empty:
-        current_enzyme = target_enzyme['enzyme_name'].iloc[0]
-        similar_enzymes = enzymes_df[
-            enzymes_df['enzyme_name'].str.contains(current_enzyme.split('_')[0], case=False, na=False)
-        ]
+        current_enzyme = target_enzyme['enzyme_name'].to_numpy()[0]
+        enzymes_activity = VIEWS['enzymes_activity']
+        merged = enzymes_activity[contains_mask('enzymes_activity', 'enzyme_name', current_enzyme.split('_')[0])]
         
-        if not similar_enzymes.empty:
-            merged = pd.merge(similar_enzymes, activity_df, on=['literature_id', 'reaction_id'])
+        if not merged.empty:
             if target_metric in merged.columns:
-                best_enzyme = merged.loc[merged[target_metric].idxmax(), 'enzyme_name']
-                result += f"**酶建议**: 当前 {current_enzyme}，建议尝试 {best_enzyme}\n"
+                best_enzyme = _value_at_best(merged, target_metric, 'enzyme_name')
+                if best_enzyme is not None:
+                    parts.append(f"**酶建议**: 当前 {current_enzyme}，建议尝试 {best_enzyme}\n")
     
-    return result
+    return "".join(parts)
 
 def _suggest_organism_optimization(target_enzyme, target_metric, enzymes_df, activity_df):
     """提供物种优化建议"""
-    result = "## 物种优化建议\n\n"
+    parts = ["## 物种优化建议\n\n"]
     
     if not target_enzyme.empty:
-        current_organism = target_enzyme['organism'].iloc[0]
-        similar_organisms = enzymes_df[
-            enzymes_df['organism'].str.contains(current_organism.split()[0], case=False, na=False)
-        ]
+        current_organism = target_enzyme['organism'].to_numpy()[0]
+        enzymes_activity = VIEWS['enzymes_activity']
+        merged = enzymes_activity[contains_mask('enzymes_activity', 'organism', current_organism.split()[0])]
         
-        if not similar_organisms.empty:
-            merged = pd.merge(similar_organisms, activity_df, on=['literature_id', 'reaction_id'])
+        if not merged.empty:
             if target_metric in merged.columns:
-                best_organism = merged.loc[merged[target_metric].idxmax(), 'organism']
-                result += f"**物种建议**: 当前 {current_organism}，建议尝试 {best_organism}\n"
+                best_organism = _value_at_best(merged, target_metric, 'organism')
+                if best_organism is not None:
+                    parts.append(f"**物种建议**: 当前 {current_organism}，建议尝试 {best_organism}\n")
     
-    return result
+    return "".join(parts)
 
 
 # --- 创建FunctionTool实例 ---
-analyze_reaction_trends_tool = FunctionTool(func=analyze_reaction_trends)
-compare_reactions_tool = FunctionTool(func=compare_reactions)
-suggest_optimization_tool = FunctionTool(func=suggest_optimization)
+# 首次访问 *_tool 属性时才包装（并导入ADK），只调用原始函数时无需导入ADK
+_TOOL_FUNCTIONS = {
+    'analyze_reaction_trends_tool': analyze_reaction_trends,
+    'compare_reactions_tool': compare_reactions,
+    'suggest_optimization_tool': suggest_optimization,
+}
+_TOOLS = {}
+
+def __getattr__(name: str):
+    if name in _TOOL_FUNCTIONS:
+        if name not in _TOOLS:
+            from google.adk.tools import FunctionTool
+            _TOOLS[name] = FunctionTool(func=_TOOL_FUNCTIONS[name])
+        return _TOOLS[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
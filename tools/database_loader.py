@@ -1,19 +1,620 @@
 # tools/database_loader.py
 
+import contextlib
+import functools
+import os
+import re
+import tempfile
+import threading
+from collections import defaultdict
+
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+from pandas.api.types import union_categoricals
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 
 # 导入配置，这个保持不变
 from ..CONFIG import DATABASE_DIR, DATABASE_CSV_FILES, validate_config
 
-# 全局变量，用于存储加载后的数据库DataFrames
-DB = {} 
+# 数据库加载状态：加载过程持有可重入锁，其他线程的首次访问会等待加载完成
+_load_lock = threading.RLock()
+_loading = False
+_load_done = False
+
+class _LazyDB(dict):
+    """首次读取时才加载数据库的字典；加载过程自身对DB的读写不会再次触发加载"""
+
+    def _ensure_loaded(self):
+        if not _load_done:
+            with _load_lock:
+                if not _load_done and not _loading:
+                    load_database()
+
+    def __len__(self):
+        self._ensure_loaded()
+        return super().__len__()
+
+    def __getitem__(self, key):
+        self._ensure_loaded()
+        return super().__getitem__(key)
+
+    def __contains__(self, key):
+        self._ensure_loaded()
+        return super().__contains__(key)
+
+    def __iter__(self):
+        self._ensure_loaded()
+        return super().__iter__()
+
+    def get(self, key, default=None):
+        self._ensure_loaded()
+        return super().get(key, default)
+
+    def keys(self):
+        self._ensure_loaded()
+        return super().keys()
+
+    def values(self):
+        self._ensure_loaded()
+        return super().values()
+
+    def items(self):
+        self._ensure_loaded()
+        return super().items()
+
+# 全局变量，用于存储加载后的数据库DataFrames（首次访问时自动加载）
+DB = _LazyDB()
+
+# 表不存在时返回的共享空表（只读），避免每次查询都新建一个空DataFrame
+EMPTY_DF = pd.DataFrame()
+
+def get_table(table_name: str) -> pd.DataFrame:
+    """按名称取已加载的数据表，不存在时返回共享的空表"""
+    return DB.get(table_name, EMPTY_DF)
+
+# 结果只取决于DB内容的缓存函数（如 functools.lru_cache 包装的工具），数据库加载后统一清空
+_DERIVED_CACHES = []
+
+def register_cache(func):
+    """登记带 cache_clear() 的缓存函数，load_database 完成后清空其缓存；返回原函数，可作装饰器"""
+    _DERIVED_CACHES.append(func)
+    return func
+
+def cached_tool(func):
+    """
+    按参数缓存工具的文本输出（数据库为静态数据，相同参数的输出相同），随数据库加载清空。
+    列表参数转为元组作为缓存键；仍含不可哈希参数时不缓存，直接调用
+    """
+    @functools.lru_cache(maxsize=256)
+    def cached(args, kwargs):
+        return func(*args, **dict(kwargs))
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        freeze = lambda value: tuple(value) if isinstance(value, list) else value
+        key = (tuple(map(freeze, args)), tuple(sorted((name, freeze(value)) for name, value in kwargs.items())))
+        try:
+            hash(key)
+        except TypeError:
+            return func(*args, **kwargs)
+        return cached(*key)
+
+    wrapper.cache_clear = cached.cache_clear
+    wrapper.cache_info = cached.cache_info
+    return register_cache(wrapper)
+
+class _LazyViews(dict):
+    """
+    首次访问某个派生视图时才调用其构建函数（见 _view_builder），未用到的视图不占用加载时间和内存；
+    遍历只包含已建好的视图
+    """
+
+    def _ensure_built(self, name):
+        builder = _VIEW_BUILDERS.get(name)
+        if builder is None or builder in _built_views:
+            return
+        DB._ensure_loaded()
+        with _load_lock:
+            if builder not in _built_views:
+                builder()
+                _built_views.add(builder)
+
+    def __getitem__(self, name):
+        self._ensure_built(name)
+        return super().__getitem__(name)
+
+    def __contains__(self, name):
+        self._ensure_built(name)
+        return super().__contains__(name)
+
+    def get(self, name, default=None):
+        self._ensure_built(name)
+        return super().get(name, default)
+
+# 由基础表预先关联得到的派生视图（只读，首次使用时构建，供各工具直接复用）
+VIEWS = _LazyViews()
+# 左关联得到的视图 -> 各行来自左表的行号（左表上算出的筛选掩码按此展开到视图行）
+VIEW_SOURCE_ROWS = {}
+
+# 各数据表之间的关联键
+KEY_COLUMNS = ['literature_id', 'reaction_id']
+
+# 趋势分析中可数值化的指标；指标名 -> 全库各物种的性能聚合（见 organism_performance）
+TREND_METRICS = ('conversion_rate', 'product_yield')
+ORGANISM_PERFORMANCE = {}
+
+# 反应概要视图依次由下列各表关联得到（各表字段互不重叠）
+PROFILE_TABLES = ('1_reactions_core', '2_enzymes', '4_activity_performance', '3_experimental_conditions')
+# 视图名 -> (关联键MultiIndex, 各行在每张来源表中是否有记录, 每张来源表的字段列表)
+KEY_INDEX = {}
+
+# 需要大小写不敏感子串检索的视图/基础表列；(视图或表名, 列名) -> (小写文本的Arrow字符串数组（缺失值为null）, 词元 -> 行号数组)，首次检索时建立
+SEARCH_COLUMNS = {
+    'performance': ('enzyme_name', 'enzyme_synonyms', 'organism'),
+    'enzymes_activity': ('enzyme_name', 'organism'),
+    '2_enzymes': ('enzyme_name', 'organism', 'pdb_id'),
+    '5_reaction_participants': ('participant_name',),
+    'reactions_wide': ('enzyme_name',),
+    'mutants_enzymes': ('enzyme_name', 'mutation_description'),
+    'inhibitors_enzymes': ('inhibitor_name',),
+}
+SEARCH_INDEX = {}
+
+# 词元为连续的字母数字字符；只由词元字符组成的查询，其任一出现位置必然落在某个词元内部
+_TOKEN_PATTERN = re.compile(r'[^\W_]+')
+
+# 取值重复度高的文本列以category存储：减少内存，且 .str 匹配只需在去重后的类别上执行一次
+CATEGORY_COLUMNS = {
+    "1_reactions_core": ["reaction_type_reversible"],
+    "2_enzymes": ["organism", "ec_number", "optimal_temperature_unit", "optimal_conditions_details"],
+    "3_experimental_conditions": ["assay_type", "expression_host"],
+    "4_activity_performance": ["conversion_rate_unit", "product_yield_unit", "enantiomeric_excess_unit"],
+    "5_reaction_participants": ["participant_name", "role"],
+    "6_kinetic_parameters": ["source_type", "parameter_type", "unit"],
+    "7_mutants_characterized": ["product_yield_unit", "selectivity_regio", "selectivity_stereo"],
+    "8_inhibitors_main": ["inhibition_type", "activity_qualitative", "inhibition_qualitative"],
+    "9_inhibition_params": ["parameter_type", "unit"],
+}
+
+def _normalize_missing(df: pd.DataFrame) -> pd.DataFrame:
+    """pyarrow以None表示文本列的缺失值，统一为NaN以与默认引擎保持一致（逐列原地替换，不构造临时DataFrame）"""
+    for column in df.select_dtypes(include="object").columns:
+        values = df[column].to_numpy()
+        missing = pd.isna(values)
+        if missing.any():
+            values[missing] = np.nan
+    return df
+
+def _with_categories(df: pd.DataFrame, columns) -> pd.DataFrame:
+    """将指定列转换为category，已是category的列（如parquet缓存中保存的）保持不变"""
+    pending = {column: "category" for column in columns
+               if column in df.columns and not isinstance(df[column].dtype, pd.CategoricalDtype)}
+    return df.astype(pending) if pending else df
+
+# parquet缓存的元数据中记录其来源CSV的大小与修改时间，两者都一致时缓存才有效
+_CACHE_SOURCE_KEY = b"bioreaction_source_csv"
+
+def _source_signature(file_path: Path) -> bytes:
+    """CSV的大小与纳秒级修改时间（cp -p、rsync 等保留mtime的复制通常仍会改变大小）"""
+    stat = file_path.stat()
+    return f"{stat.st_size}:{stat.st_mtime_ns}".encode()
+
+def _write_cache(df: pd.DataFrame, cache_path: Path, signature: bytes):
+    """先写入同目录下的临时文件再原子替换，并发启动的进程不会读到或交错写入不完整的缓存"""
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    table = table.replace_schema_metadata({**(table.schema.metadata or {}), _CACHE_SOURCE_KEY: signature})
+    fd, temp_path = tempfile.mkstemp(dir=cache_path.parent, prefix=f".{cache_path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            pq.write_table(table, f, compression="zstd")
+        os.replace(temp_path, cache_path)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.unlink(temp_path)
+        raise
+
+def _read_table(file_path: Path) -> pd.DataFrame:
+    """
+    解析单个CSV（pyarrow引擎解析期间释放GIL，可多线程并行）。
+    首次解析后在CSV旁写入同名parquet缓存，之后只要缓存记录的CSV大小与修改时间都与当前一致就直接读取缓存；
+    CATEGORY_COLUMNS 在读取缓存后同样生效，修改后无需删除旧缓存。
+    """
+    key = file_path.name.split('.')[0]
+    dtype = {column: "category" for column in CATEGORY_COLUMNS.get(key, [])}
+    cache_path = file_path.with_suffix('.parquet')
+    signature = _source_signature(file_path)
+    if cache_path.exists():
+        try:
+            # 只读取文件尾的schema判断缓存是否对应当前CSV
+            metadata = pq.read_schema(cache_path).metadata or {}
+            if metadata.get(_CACHE_SOURCE_KEY) == signature:
+                # 逐列转换且不合并成块（split_blocks），转换过程中释放Arrow缓冲区（self_destruct），避免多一次整表复制
+                table = pq.read_table(cache_path)
+                df = table.to_pandas(split_blocks=True, self_destruct=True)
+                del table
+                return _with_categories(_normalize_missing(df), dtype)
+        except Exception as e:
+            print(f"  - 读取缓存 '{cache_path.name}' 失败，改为解析CSV: {e}")
+
+    df = _normalize_missing(pd.read_csv(file_path, engine="pyarrow", dtype=dtype or None))
+    try:
+        _write_cache(df, cache_path, signature)
+    except Exception as e:
+        # 数据目录只读等情况下不使用缓存
+        print(f"  - 写入缓存 '{cache_path.name}' 失败: {e}")
+    return df
+
+def _share_key_categories():
+    """
+    关联键在所有表中统一为同一个category类型：等值过滤只需比较整数编码，
+    表之间按编码关联，且不会因类别集合不同而退回object类型
+    """
+    for column in KEY_COLUMNS:
+        frames = [df for df in DB.values() if column in df.columns]
+        if not frames:
+            continue
+        categories = union_categoricals(
+            [pd.Categorical(df[column]) for df in frames], sort_categories=True
+        ).categories
+        key_dtype = pd.CategoricalDtype(categories)
+        for df in frames:
+            df[column] = df[column].astype(key_dtype)
+
+def organism_performance(df: pd.DataFrame, metric: str) -> pd.DataFrame:
+    """各物种的指标均值与数据点数，只保留至少2个数据点的物种，按均值降序排列"""
+    org_perf = df.groupby('organism', observed=True)[metric].agg(['mean', 'count']).reset_index()
+    return org_perf[org_perf['count'] >= 2].sort_values('mean', ascending=False)
+
+def _inner_join(tables: list) -> pd.DataFrame:
+    """
+    多个表按关联键依次内连接，结果与逐个 pd.merge(..., on=KEY_COLUMNS) 相同。
+    先只用关联键和行号完成关联，最后按行号从各表一次取出其余列，不生成中间的宽表；
+    非关联列同名（需要加后缀）时退回逐个合并
+    """
+    other_columns = [[column for column in df.columns if column not in KEY_COLUMNS] for df in tables]
+    first = tables[0]
+    if (list(first.columns[:len(KEY_COLUMNS)]) != KEY_COLUMNS
+            or len(set().union(*other_columns)) != sum(map(len, other_columns))):
+        return functools.reduce(lambda left, right: pd.merge(left, right, on=KEY_COLUMNS), tables)
+    rows = first[KEY_COLUMNS].assign(__row_0=np.arange(len(first)))
+    for i, df in enumerate(tables[1:], 1):
+        rows = pd.merge(rows, df[KEY_COLUMNS].assign(**{f'__row_{i}': np.arange(len(df))}), on=KEY_COLUMNS)
+    parts = [rows[KEY_COLUMNS].reset_index(drop=True)]
+    for i, (df, columns) in enumerate(zip(tables, other_columns)):
+        parts.append(df[columns].take(rows[f'__row_{i}'].to_numpy()).reset_index(drop=True))
+    return pd.concat(parts, axis=1)
+
+# 派生视图名 -> 构建函数；同一构建函数一次生成的多个视图都登记在其名下
+_VIEW_BUILDERS = {}
+_built_views = set()
+
+def _view_builder(*names):
+    """登记生成 names 中各视图的构建函数（首次访问其中任一视图时调用一次）"""
+    def decorator(func):
+        for name in names:
+            _VIEW_BUILDERS[name] = func
+        return func
+    return decorator
+
+@_view_builder('reactions', 'reactions_participants', 'reactions_wide')
+def _build_reaction_views():
+    core_df = get_table('1_reactions_core')
+    enzymes_df = get_table('2_enzymes')
+    participants_df = get_table('5_reaction_participants')
+    conditions_df = get_table('3_experimental_conditions')
+    if not core_df.empty and not enzymes_df.empty:
+        # 反应 + 酶（智能搜索、模式分析）；按参与分子检索时再左关联参与分子表
+        reactions = pd.merge(core_df, enzymes_df, on=KEY_COLUMNS)
+        VIEWS['reactions'] = reactions
+        if not participants_df.empty:
+            VIEWS['reactions_participants'] = pd.merge(reactions, participants_df, on=KEY_COLUMNS, how='left')
+        if not conditions_df.empty:
+            # 酶 + 反应 + 实验条件（相似反应查找），行顺序以酶表为准
+            VIEWS['reactions_wide'] = _inner_join([enzymes_df, core_df, conditions_df])
+
+@_view_builder('performance')
+def _build_performance_view():
+    activity_df = get_table('4_activity_performance')
+    enzymes_df = get_table('2_enzymes')
+    conditions_df = get_table('3_experimental_conditions')
+    if not activity_df.empty and not enzymes_df.empty:
+        # 性能 + 酶 + 实验条件（趋势分析）
+        performance = pd.merge(activity_df, enzymes_df, on=KEY_COLUMNS)
+        if not conditions_df.empty:
+            performance = pd.merge(performance, conditions_df, on=KEY_COLUMNS, how='left')
+        VIEWS['performance'] = performance
+        # 不按酶筛选时的物种性能对比与查询条件无关，随视图一起算好
+        for metric in TREND_METRICS:
+            numeric = performance[[metric, 'organism']].assign(**{metric: pd.to_numeric(performance[metric], errors='coerce')})
+            ORGANISM_PERFORMANCE[metric] = organism_performance(numeric.dropna(subset=[metric]), metric)
+
+@_view_builder('enzymes_activity')
+def _build_enzymes_activity_view():
+    activity_df = get_table('4_activity_performance')
+    enzymes_df = get_table('2_enzymes')
+    if not activity_df.empty and not enzymes_df.empty:
+        # 酶 + 性能（酶/物种优化建议）
+        VIEWS['enzymes_activity'] = pd.merge(enzymes_df, activity_df, on=KEY_COLUMNS)
+
+@_view_builder('conditions_activity')
+def _build_conditions_activity_view():
+    activity_df = get_table('4_activity_performance')
+    conditions_df = get_table('3_experimental_conditions')
+    if not activity_df.empty and not conditions_df.empty:
+        # 实验条件 + 性能（条件优化建议）
+        VIEWS['conditions_activity'] = pd.merge(conditions_df, activity_df, on=KEY_COLUMNS)
+
+@_view_builder('mutants_enzymes')
+def _build_mutants_view():
+    mutants_df = get_table('7_mutants_characterized')
+    enzymes_df = get_table('2_enzymes')
+    if not mutants_df.empty and not enzymes_df.empty:
+        # 突变体左关联酶信息（突变体性能），行顺序与原表一致
+        VIEWS['mutants_enzymes'] = pd.merge(mutants_df, enzymes_df, on=KEY_COLUMNS, how='left')
+
+@_view_builder('inhibitors_enzymes', 'inhibitors_params')
+def _build_inhibitor_views():
+    inhibitors_df = get_table('8_inhibitors_main')
+    enzymes_df = get_table('2_enzymes')
+    inhibition_params_df = get_table('9_inhibition_params')
+    if not inhibitors_df.empty and not enzymes_df.empty:
+        # 抑制剂左关联酶信息（抑制剂查询），行顺序与原表一致
+        inhibitors = pd.merge(inhibitors_df, enzymes_df, on=KEY_COLUMNS, how='left', suffixes=('', '_enzyme'))
+        VIEWS['inhibitors_enzymes'] = inhibitors
+        if not inhibition_params_df.empty:
+            # 再左关联抑制参数；左关联保持左表行序，按抑制剂行筛选后的结果与先筛选再关联相同
+            params = pd.merge(inhibitors.assign(__row=np.arange(len(inhibitors))), inhibition_params_df,
+                              on=KEY_COLUMNS + ['inhibitor_name'], how='left')
+            VIEW_SOURCE_ROWS['inhibitors_params'] = params.pop('__row').to_numpy()
+            VIEWS['inhibitors_params'] = params
+
+@_view_builder('reaction_profile')
+def _build_profile_view():
+    # 反应概要：各表按关联键取首行后全外关联，对比分析一次取出一个反应的全部字段
+    profile, flags, table_columns = None, [], []
+    for table_name in PROFILE_TABLES:
+        df = get_table(table_name)
+        if df.empty:
+            continue
+        flag = f'__in_{table_name}'
+        part = df.drop_duplicates(KEY_COLUMNS).assign(**{flag: True})
+        profile = part if profile is None else pd.merge(profile, part, on=KEY_COLUMNS, how='outer', sort=False)
+        flags.append(flag)
+        table_columns.append([column for column in df.columns if column not in KEY_COLUMNS])
+    if profile is not None:
+        present = profile[flags].notna().to_numpy()
+        profile = profile.drop(columns=flags)
+        KEY_INDEX['reaction_profile'] = (pd.MultiIndex.from_frame(profile[KEY_COLUMNS]), present, table_columns)
+        VIEWS['reaction_profile'] = profile
+
+@register_cache
+@functools.lru_cache(maxsize=None)
+def _key_positions(table_name: str) -> dict:
+    """表或派生视图的关联键 -> 行号数组（首次使用时建立）"""
+    df = VIEWS[table_name] if table_name in VIEWS else get_table(table_name)
+    if df.empty:
+        return {}
+    return df.groupby(KEY_COLUMNS, observed=True, sort=False).indices
+
+def _key_codes(df: pd.DataFrame) -> np.ndarray:
+    """两个关联键的category编码合成一个整数；任一关联键缺失的行为-1"""
+    lit_codes = df['literature_id'].cat.codes.to_numpy().astype(np.int64)
+    rid_codes = df['reaction_id'].cat.codes.to_numpy()
+    codes = lit_codes * len(df['reaction_id'].cat.categories) + rid_codes
+    codes[(lit_codes < 0) | (rid_codes < 0)] = -1
+    return codes
+
+@register_cache
+@functools.lru_cache(maxsize=None)
+def _sorted_key_codes(table_name: str) -> tuple:
+    """表的合成关联键编码（升序，不含缺失键）及其对应的行号；同一键的多行按行号升序排列"""
+    codes = _key_codes(get_table(table_name))
+    order = np.argsort(codes, kind='stable')
+    order = order[codes[order] >= 0]
+    return codes[order], order
+
+def key_rows(table_name: str, df: pd.DataFrame) -> np.ndarray:
+    """
+    df 各行的关联键在表中第一次出现的行号，表中没有该键时为-1。
+    各表关联键共享同一category类型，按合成编码在排序后的键上二分查找，代替逐行哈希查找
+    """
+    table = get_table(table_name)
+    if table.empty or not len(df):
+        return np.full(len(df), -1, dtype=np.int64)
+    if not all(df[column].dtype == table[column].dtype for column in KEY_COLUMNS):
+        positions = _key_positions(table_name)
+        keys = zip(df['literature_id'], df['reaction_id'])
+        return np.fromiter((positions[key][0] if key in positions else -1 for key in keys), dtype=np.int64, count=len(df))
+    sorted_codes, order = _sorted_key_codes(table_name)
+    if not len(sorted_codes):
+        return np.full(len(df), -1, dtype=np.int64)
+    codes = _key_codes(df)
+    found = np.searchsorted(sorted_codes, codes).clip(max=len(sorted_codes) - 1)
+    hit = (sorted_codes[found] == codes) & (codes >= 0)
+    return np.where(hit, order[found], -1)
+
+def reaction_positions(table_name: str, literature_id: str, reaction_id: str) -> np.ndarray:
+    """指定反应在表或派生视图中的行号（升序），不存在时为空数组"""
+    positions = _key_positions(table_name).get((literature_id, reaction_id))
+    return positions if positions is not None else np.empty(0, dtype=np.intp)
+
+def rows_for_reaction(table_name: str, literature_id: str, reaction_id: str) -> pd.DataFrame:
+    """
+    取某表或派生视图中指定反应的全部行，等价于按两个关联键做布尔筛选（保留原有行顺序与索引），
+    但只需一次哈希查找
+    """
+    df = VIEWS[table_name] if table_name in VIEWS else get_table(table_name)
+    if df.empty:
+        return df
+    return df.iloc[reaction_positions(table_name, literature_id, reaction_id)]
+
+@register_cache
+@functools.lru_cache(maxsize=None)
+def _literature_positions(table_name: str) -> dict:
+    """表中各文献 -> 行号数组（升序，首次使用时建立）"""
+    return get_table(table_name).groupby('literature_id', observed=True, sort=False).indices
+
+def rows_for_literature(table_name: str, literature_id: str) -> pd.DataFrame:
+    """取表中某篇文献的全部行，等价于 df[df['literature_id'] == literature_id]（保留原有行顺序与索引）"""
+    df = get_table(table_name)
+    if df.empty:
+        return df
+    positions = _literature_positions(table_name).get(literature_id)
+    return df.iloc[positions if positions is not None else []]
+
+@register_cache
+@functools.lru_cache(maxsize=None)
+def numeric_column(table_name: str, column: str) -> pd.Series:
+    """表中某列的数值形式（无法解析的值为NaN），首次使用时转换一次；返回值为共享缓存，调用方不应修改"""
+    return pd.to_numeric(get_table(table_name)[column], errors='coerce')
+
+def merge_head(left: pd.DataFrame, joins: list, limit: int, columns: tuple = None) -> tuple:
+    """
+    将left依次按关联键与各表合并，返回 (合并结果的前limit行, 合并结果的总行数)
+
+    :param joins: [(表名, how), ...]，how 为 'inner' 或 'left'
+    :param columns: 需要从各关联表取出的字段；为None时保留关联表的全部字段
+    各表的每个关联键都只有一行时，合并不会改变left的行数与行顺序（内连接只会去掉无法匹配的行），
+    因此先按键剔除内连接无法匹配的行、截取前limit行，再按键直接取出关联表中的对应记录拼接；
+    否则完整合并后再截取。
+    """
+    unique_keys = all(len(_key_positions(table_name)) == len(get_table(table_name)) for table_name, _ in joins)
+    if unique_keys:
+        for table_name, how in joins:
+            if how == 'inner':
+                left = left[key_rows(table_name, left) >= 0]
+        total = len(left)
+        merged = left.head(limit)
+    else:
+        merged, total = left, None
+    if unique_keys:
+        merged = merged.reset_index(drop=True)
+    for table_name, how in joins:
+        right = get_table(table_name)
+        if columns is not None:
+            right = right[KEY_COLUMNS + [column for column in right.columns if column in columns and column not in KEY_COLUMNS]]
+        fields = right.columns.difference(KEY_COLUMNS, sort=False)
+        if unique_keys and not merged.columns.intersection(fields).size:
+            # 每个键在关联表中至多一行：按键逐行取出对应记录并按列拼接，代替哈希合并；
+            # 左连接中无匹配的行取到缺失值（位置-1在RangeIndex中不存在）
+            rows = key_rows(table_name, merged)
+            gathered = right[fields].reset_index(drop=True).reindex(rows).reset_index(drop=True)
+            merged = pd.concat([merged, gathered], axis=1)
+        else:
+            merged = pd.merge(merged, right, on=KEY_COLUMNS, how=how)
+    if total is None:
+        total = len(merged)
+        merged = merged.head(limit)
+    return merged, total
+
+def reaction_profiles(keys: list) -> list:
+    """
+    按 (literature_id, reaction_id) 批量取反应概要（核心、酶、性能、条件字段合并为一条记录）
+
+    :return: 与keys对齐的记录字典列表；未找到的键为None，缺少某张表的记录时不含该表的字段
+    """
+    if 'reaction_profile' not in VIEWS or not keys:
+        return [None] * len(keys)
+    key_index, present, table_columns = KEY_INDEX['reaction_profile']
+    found = key_index.get_indexer(pd.MultiIndex.from_tuples(keys, names=KEY_COLUMNS))
+    records = iter(VIEWS['reaction_profile'].iloc[found[found >= 0]].to_dict('records'))
+    profiles = []
+    for position in found:
+        if position < 0:
+            profiles.append(None)
+            continue
+        record = next(records)
+        for has_row, columns in zip(present[position], table_columns):
+            if not has_row:
+                for column in columns:
+                    del record[column]
+        profiles.append(record)
+    return profiles
+
+def _search_index(view_name: str, column: str) -> tuple:
+    """检索列的小写文本与词元倒排索引，首次检索该列时计算，避免每次查询逐行执行正则匹配"""
+    entry = SEARCH_INDEX.get((view_name, column))
+    if entry is None:
+        view = VIEWS.get(view_name, DB.get(view_name))
+        if view is None:
+            raise KeyError((view_name, column))
+        lowered = view[column].astype(object).str.lower()
+        # Arrow字符串按实际长度紧凑存储，子串匹配由Arrow的C++内核完成（numpy定长Unicode数组按最长值占用内存）
+        texts = pa.array(lowered.to_numpy(), type=pa.string(), from_pandas=True)
+        token_rows = defaultdict(list)
+        for row, text in enumerate(lowered.fillna('').tolist()):
+            for token in set(_TOKEN_PATTERN.findall(text)):
+                token_rows[token].append(row)
+        tokens = {token: np.asarray(rows, dtype=np.int64) for token, rows in token_rows.items()}
+        entry = SEARCH_INDEX.setdefault((view_name, column), (texts, tokens))
+    return entry
+
+def contains_mask(view_name: str, column: str, text: str) -> np.ndarray:
+    """
+    视图列的大小写不敏感子串匹配（按字面匹配，等价于 str.contains(text, case=False, regex=False, na=False)）
+
+    :return: 与视图行对齐的只读布尔数组
+    """
+    return _match_mask(view_name, column, str(text).lower())
+
+# 不含正则元字符的查询，按正则匹配与按字面匹配的结果相同
+_REGEX_META = re.compile(r'[.^$*+?{}\[\]\\|()]')
+
+def column_contains(df: pd.DataFrame, table_name: str, column: str, text: str) -> pd.Series:
+    """
+    等价于 df[column].str.contains(text, case=False, na=False)。
+    df为已建检索索引的基础表或派生视图本身、且查询是不含正则元字符的ASCII文本时，直接使用预先小写化的检索索引；
+    其余不含正则元字符的查询按字面匹配，省去正则编译与匹配开销
+    """
+    literal = isinstance(text, str) and not _REGEX_META.search(text)
+    if (literal and text.isascii()
+            and column in SEARCH_COLUMNS.get(table_name, ()) and df is VIEWS.get(table_name, DB.get(table_name))):
+        return pd.Series(contains_mask(table_name, column, text), index=df.index)
+    return df[column].str.contains(text, case=False, na=False, regex=not literal)
+
+@register_cache
+@functools.lru_cache(maxsize=1024)
+def _match_mask(view_name: str, column: str, needle: str) -> np.ndarray:
+    """按小写查询串缓存匹配结果；优化建议等工具对同一酶/物种前缀的重复查询只需一次哈希查找"""
+    texts, tokens = _search_index(view_name, column)
+    if _TOKEN_PATTERN.fullmatch(needle):
+        # 单词元查询：只需扫描词表，合并包含该子串的词元所在行
+        mask = np.zeros(len(texts), dtype=bool)
+        for token, rows in tokens.items():
+            if needle in token:
+                mask[rows] = True
+    else:
+        mask = pc.fill_null(pc.match_substring(texts, needle), False).to_numpy(zero_copy_only=False)
+    # 缓存的数组被多个调用方共享，禁止原地修改
+    mask.flags.writeable = False
+    return mask
 
 def load_database():
     """
     加载数据库目录中的所有CSV文件到全局的DB字典中。
-    这个函数现在需要被外部显式调用。
+    首次访问DB时会自动调用；加载成功后再次调用不会重复加载。
+    加载失败（配置错误、目录不存在或任一数据表解析失败）时DB保持为空，之后访问DB或再次调用时重新加载。
     """
+    global _loading, _load_done
+    with _load_lock:
+        _loading = True
+        try:
+            _load_done = _load()
+        except BaseException:
+            # 加载中途出错时同样不保留部分结果
+            DB.clear()
+            raise
+        finally:
+            _loading = False
+            for cached in _DERIVED_CACHES:
+                cached.cache_clear()
+
+def _load() -> bool:
+    """执行加载，返回是否加载成功"""
     # 首先检查DATABASE_DIR变量是否存在
     if 'DATABASE_DIR' not in globals() or DATABASE_DIR is {}:
          raise ValueError("DIAGNOSTIC_TEST: DATABASE_DIR was not imported correctly from CONFIG.py.")
@@ -24,34 +625,48 @@ def load_database():
     # 如果已经加载过了，就不要重复加载
     if DB:
         print("数据库已经加载，无需重复操作。")
-        return
+        return True
 
     print("--- [INFO] 正在执行数据库加载程序... ---")
     
     config_errors = validate_config()
     if config_errors:
         print(f"配置错误: {config_errors}")
-        return
+        return False
     
     if not DATABASE_DIR.exists():
         print(f"致命错误：数据库目录未找到于 '{DATABASE_DIR.resolve()}'")
-        return
+        return False
 
+    file_paths = []
     for csv_file in DATABASE_CSV_FILES:
         file_path = DATABASE_DIR / csv_file
         if not file_path.exists():
             print(f"警告：数据文件 '{file_path}' 不存在，跳过。")
             continue
+        file_paths.append(file_path)
+
+    # 各数据表并行解析
+    with ThreadPoolExecutor(max_workers=max(len(file_paths), 1)) as executor:
+        futures = {file_path: executor.submit(_read_table, file_path) for file_path in file_paths}
+    failed = []
+    for file_path, future in futures.items():
         try:
-            key = csv_file.split('.')[0]
-            DB[key] = pd.read_csv(file_path)
+            key = file_path.name.split('.')[0]
+            DB[key] = future.result()
             # print(f"  - 已加载数据表 '{key}'") # 在生产环境中可以注释掉，减少打印
         except Exception as e:
-            print(f"  - 加载数据表 '{csv_file}' 失败: {e}")
+            print(f"  - 加载数据表 '{file_path.name}' 失败: {e}")
+            failed.append(file_path.name)
     
+    if failed:
+        # 只加载了部分数据表时不保留结果，下次访问DB时整体重新加载
+        DB.clear()
+        print(f"--- [ERROR] {len(failed)} 个数据表加载失败，数据库未加载，下次访问时重试。 ---")
+        return False
     if not DB:
         print("--- [ERROR] 数据库加载完毕，但内容为空！请检查路径和文件。 ---")
-    else:
-        print(f"--- [INFO] 数据库加载成功，共 {len(DB)} 个数据表。 ---")
-
-load_database()
\ No newline at end of file
+        return False
+    _share_key_categories()
+    print(f"--- [INFO] 数据库加载成功，共 {len(DB)} 个数据表。 ---")
+    return True
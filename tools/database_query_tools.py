@@ -1,13 +1,30 @@
+import bisect
+import functools
+import io
+import itertools
+
 from google.adk.tools import FunctionTool
 import pandas as pd
 import numpy as np
 from typing import List, Dict, Optional, Any
-from .database_loader import DB
+from .database_loader import DB, VIEWS, VIEW_SOURCE_ROWS, cached_tool, column_contains, get_table, merge_head, numeric_column, reaction_positions, register_cache, rows_for_literature, rows_for_reaction
 
 from ..CONFIG import QUERY_CONFIG, ANALYSIS_CONFIG
 import re
+import string
 import logging
-logging.basicConfig(filename="test.log", filemode="w", format="%(asctime)s %(name)s:%(levelname)s:%(message)s", datefmt="%d-%M-%Y %H:%M:%S", level=logging.DEBUG)
+# 导入本模块不修改任何日志设置；处理器由应用入口（main.py、adk web 加载 root_agent 时）调用 utils.logging_setup.setup_logging() 配置
+logger = logging.getLogger(__name__)
+
+# 每次查询都会用到的配置项，导入时绑定一次
+_MAX_RESULTS = QUERY_CONFIG["max_results"]
+_MIN_DATA_POINTS = QUERY_CONFIG["min_data_points"]
+_DEFAULT_TOP_N = QUERY_CONFIG["default_top_n"]
+
+# 归一化用的字节转换表：大写转小写，删除字母数字以外的ASCII字符（非ASCII字符在编码时丢弃）
+_ASCII_LOWER = bytes.maketrans(string.ascii_uppercase.encode(), string.ascii_lowercase.encode())
+_NON_ALNUM = bytes(c for c in range(128) if not chr(c).isalnum())
+_NON_ALNUM_KEEP_BAR = _NON_ALNUM.replace(b'|', b'')
 
 def normalize_enzyme_name(name: str) -> str:
     """
@@ -15,9 +32,66 @@ def normalize_enzyme_name(name: str) -> str:
     """
     if not isinstance(name, str):
         return ''
-    # 去除空格和常见特殊字符，仅保留字母数字
-    return re.sub(r"[^a-zA-Z0-9]", "", name).lower()
+    # 去除空格和常见特殊字符，仅保留字母数字（单次C层查表，等价于 re.sub(r"[^a-zA-Z0-9]", "", name).lower()）
+    return name.encode('ascii', 'ignore').translate(_ASCII_LOWER, _NON_ALNUM).decode('ascii')
+
+# 各查询工具输出时需要从关联表读取的字段，合并时只取这些字段
+_CONDITION_FIELDS = (
+    'temperature_celsius', 'ph', 'ph_details', 'assay_type', 'assay_details',
+    'solvent_buffer', 'expression_host', 'expression_vector', 'expression_induction'
+)
+_BY_ENZYME_FIELDS = ('reaction_equation', 'reaction_type_reversible')
+_BY_ORGANISM_FIELDS = ('reaction_equation',) + _CONDITION_FIELDS
+_BY_CONDITION_FIELDS = ('reaction_equation', 'enzyme_name', 'ec_number')
+_PDB_FIELDS = ('reaction_equation',)
+_TOP_PERFORMANCE_FIELDS = ('reaction_equation', 'enzyme_name', 'organism', 'ec_number')
+_PARTICIPANT_FIELDS = ('enzyme_name', 'organism', 'ec_number', 'reaction_equation') + _CONDITION_FIELDS
 
+# 各查询工具每条结果的输出模板（见 _render_rows），文本与列名交替；_CONDITION_TEMPLATE 以文本开头，接在以列名结尾的模板之后
+_CONDITION_TEMPLATE = (
+    "\n- **温度**: ", 'temperature_celsius', "°C\n- **pH**: ", 'ph', "\n- **pH补充说明**: ", 'ph_details',
+    "\n- **实验类型**: ", 'assay_type', "\n- **实验细节**: ", 'assay_details',
+    "\n- **缓冲液/溶剂**: ", 'solvent_buffer', "\n- **表达宿主**: ", 'expression_host',
+    "\n- **表达载体**: ", 'expression_vector', "\n- **诱导条件**: ", 'expression_induction', "\n\n"
+)
+_BY_ENZYME_TEMPLATE = (
+    "## ", 'literature_id', ":", 'reaction_id', "\n- **酶**: ", 'enzyme_name', "\n- **物种**: ", 'organism',
+    "\n- **酶EC号**: ", 'ec_number', "\n- **反应**: ", 'reaction_equation',
+    "\n- **反应是否可逆**: ", 'reaction_type_reversible', "\n\n"
+)
+_BY_CONDITION_TEMPLATE = (
+    "## ", 'literature_id', ":", 'reaction_id', "\n- **酶**: ", 'enzyme_name',
+    "\n- **反应**: ", 'reaction_equation', "\n- **EC号**: ", 'ec_number'
+) + _CONDITION_TEMPLATE
+_PDB_TEMPLATE = (
+    "## ", 'literature_id', ":", 'reaction_id', "\n- **PDB ID**: ", 'pdb_id', "\n- **酶**: ", 'enzyme_name',
+    "\n- **物种**: ", 'organism', "\n- **反应**: ", 'reaction_equation', "\n- **EC号**: ", 'ec_number', "\n\n"
+)
+_PARTICIPANT_TEMPLATE = (
+    "## ", 'literature_id', ":", 'reaction_id', "\n- **参与者**: ", 'participant_name', " (", 'role', ")\n- **酶**: ", 'enzyme_name',
+    "\n- **物种**: ", 'organism', "\n- **反应**: ", 'reaction_equation', "\n- **EC号**: ", 'ec_number'
+) + _CONDITION_TEMPLATE
+_BY_ORGANISM_TEMPLATE = (
+    "## ", 'literature_id', ":", 'reaction_id', "\n- **物种**: ", 'organism', "\n- **酶**: ", 'enzyme_name',
+    "\n- **EC号**: ", 'ec_number', "\n- **反应**: ", 'reaction_equation'
+) + _CONDITION_TEMPLATE
+_CONDITIONS_BY_ENZYME_TEMPLATE = (
+    "## 文献编号: ", 'literature_id', " 反应编号: ", 'reaction_id', "\n- **酶名称**: ", 'enzyme_name',
+    "\n- **来源物种**: ", 'organism', "\n- **实验温度**: ", 'temperature_celsius', "°C\n- **pH值**: ", 'ph'
+) + _CONDITION_TEMPLATE[4:]
+_SIMILAR_TEMPLATE = (
+    "## ", 'literature_id', ":", 'reaction_id', "\n- **酶**: ", 'enzyme_name', "\n- **EC号**: ", 'ec_number',
+    "\n- **物种**: ", 'organism', "\n- **反应**: ", 'reaction_equation', "\n- **反应是否可逆**: ", 'reaction_type_reversible',
+    "\n" + _CONDITION_TEMPLATE[0]
+) + _CONDITION_TEMPLATE[1:]
+_MUTANT_TEMPLATE = (
+    "## ", 'literature_id', ":", 'reaction_id', " | 酶: ", 'enzyme_name', " | 突变: ", 'mutation_description',
+    "\n- **定性活性**: ", 'activity_qualitative', "\n- **转化率**: ", 'conversion_rate',
+    " %\n- **产率**: ", 'product_yield', " ", 'product_yield_unit', "\n- **区域选择性**: ", 'selectivity_regio',
+    "\n- **立体选择性**: ", 'selectivity_stereo', "\n- **对映体过量**: ", 'enantiomeric_excess', " %\n\n"
+)
+
+@cached_tool
 def get_reaction_summary(
     literature_id: str,
     reaction_id: str
@@ -30,39 +104,34 @@ def get_reaction_summary(
     """
     if not DB: return "数据库未加载。"
     
-    # 获取各表数据
-    core_df = DB.get('1_reactions_core', pd.DataFrame())
-    enzymes_df = DB.get('2_enzymes', pd.DataFrame())
-    activity_df = DB.get('4_activity_performance', pd.DataFrame())
-    conditions_df = DB.get('3_experimental_conditions', pd.DataFrame())
-    participants_df = DB.get('5_reaction_participants', pd.DataFrame())
-    
-    # 筛选目标反应
-    reaction_core = core_df[(core_df['literature_id'] == literature_id) & (core_df['reaction_id'] == reaction_id)]
-    reaction_enzyme = enzymes_df[(enzymes_df['literature_id'] == literature_id) & (enzymes_df['reaction_id'] == reaction_id)]
-    reaction_activity = activity_df[(activity_df['literature_id'] == literature_id) & (activity_df['reaction_id'] == reaction_id)]
-    reaction_conditions = conditions_df[(conditions_df['literature_id'] == literature_id) & (conditions_df['reaction_id'] == reaction_id)]
-    reaction_participants = participants_df[(participants_df['literature_id'] == literature_id) & (participants_df['reaction_id'] == reaction_id)]
+    # 按关联键直接取目标反应的各表记录（预建的键->行号索引，无需逐表布尔扫描）
+    reaction_core = rows_for_reaction('1_reactions_core', literature_id, reaction_id)
+    reaction_enzyme = rows_for_reaction('2_enzymes', literature_id, reaction_id)
+    reaction_activity = rows_for_reaction('4_activity_performance', literature_id, reaction_id)
+    reaction_conditions = rows_for_reaction('3_experimental_conditions', literature_id, reaction_id)
+    reaction_participants = rows_for_reaction('5_reaction_participants', literature_id, reaction_id)
     
     if reaction_core.empty:
         return f"未找到反应 {literature_id}:{reaction_id}"
     
     # 构建摘要
-    summary = f"# 反应摘要: {literature_id}:{reaction_id}\n\n"
+    buf = io.StringIO()
+    w = buf.write
+    w(f"# 反应摘要: {literature_id}:{reaction_id}\n\n")
     
     # 基本信息
     core_info = reaction_core.iloc[0]
-    summary += f"**反应方程式**: {core_info.get('reaction_equation', 'N/A')}\n"
-    summary += f"**反应类型**: {core_info.get('reaction_type_reversible', 'N/A')}\n"
-    summary += f"**文献标题**: {core_info.get('title', 'N/A')}\n\n"
+    w(f"**反应方程式**: {core_info.get('reaction_equation', 'N/A')}\n")
+    w(f"**反应类型**: {core_info.get('reaction_type_reversible', 'N/A')}\n")
+    w(f"**文献标题**: {core_info.get('title', 'N/A')}\n\n")
     
     # 酶信息
     if not reaction_enzyme.empty:
         enzyme_info = reaction_enzyme.iloc[0]
-        summary += f"**酶名称**: {enzyme_info.get('enzyme_name', 'N/A')}\n"
-        summary += f"**基因名称**: {enzyme_info.get('gene_name', 'N/A')}\n"
-        summary += f"**物种来源**: {enzyme_info.get('organism', 'N/A')}\n"
-        summary += f"**酶分类**: {enzyme_info.get('ec_number', 'N/A')}\n\n"
+        w(f"**酶名称**: {enzyme_info.get('enzyme_name', 'N/A')}\n")
+        w(f"**基因名称**: {enzyme_info.get('gene_name', 'N/A')}\n")
+        w(f"**物种来源**: {enzyme_info.get('organism', 'N/A')}\n")
+        w(f"**酶分类**: {enzyme_info.get('ec_number', 'N/A')}\n\n")
     
     # 性能信息
     if not reaction_activity.empty:
@@ -71,66 +140,213 @@ def get_reaction_summary(
         cr = activity_info.get('conversion_rate', 'N/A')
         cr_unit = activity_info.get('conversion_rate_unit', '')
         cr_error = activity_info.get('conversion_rate_error', '')
-        summary += f"**转化率**: {cr} {cr_unit} {(f'(误差: {cr_error})' if cr_error else '')}\n"
+        w(f"**转化率**: {cr} {cr_unit} {(f'(误差: {cr_error})' if cr_error else '')}\n")
         # 产率
         py = activity_info.get('product_yield', 'N/A')
         py_unit = activity_info.get('product_yield_unit', '')
         py_error = activity_info.get('product_yield_error', '')
-        summary += f"**产率**: {py} {py_unit} {(f'(误差: {py_error})' if py_error else '')}\n"
+        w(f"**产率**: {py} {py_unit} {(f'(误差: {py_error})' if py_error else '')}\n")
         # 选择性
-        summary += f"**对映选择性**: {activity_info.get('regioselectivity', 'N/A')}\n"
-        summary += f"**立体选择性**: {activity_info.get('stereoselectivity', 'N/A')}\n"
+        w(f"**对映选择性**: {activity_info.get('regioselectivity', 'N/A')}\n")
+        w(f"**立体选择性**: {activity_info.get('stereoselectivity', 'N/A')}\n")
     
         # 对映体过量
         ee = activity_info.get('enantiomeric_excess', None)
         ee_unit = activity_info.get('enantiomeric_excess_unit', '')
         ee_error = '' # 如有enantiomeric_excess_error字段可补充
         if ee is not None and ee != '' and ee != 'N/A':
-            summary += f"**对映体过量**: {ee} {ee_unit} {(f'(误差: {ee_error})' if ee_error else '')}\n\n"
+            w(f"**对映体过量**: {ee} {ee_unit} {(f'(误差: {ee_error})' if ee_error else '')}\n\n")
 
     # 实验条件
     if not reaction_conditions.empty:
         condition_info = reaction_conditions.iloc[0]
-        summary += f"**温度**: {condition_info.get('temperature_celsius', 'N/A')}°C\n"
-        summary += f"**pH**: {condition_info.get('ph', 'N/A')}\n"
-        # summary += f"**反应时间**: {condition_info.get('reaction_time_hours', 'N/A')}小时\n\n"
-        summary += f"**pH补充说明**: {condition_info.get('ph_details', 'N/A')}\n"
-        summary += f"**实验类型**: {condition_info.get('assay_type', 'N/A')}\n"
-        summary += f"**实验细节**: {condition_info.get('assay_details', 'N/A')}\n"
-        summary += f"**缓冲液/溶剂**: {condition_info.get('solvent_buffer', 'N/A')}\n"
-        summary += f"**表达宿主**: {condition_info.get('expression_host', 'N/A')}\n"
-        summary += f"**表达载体**: {condition_info.get('expression_vector', 'N/A')}\n"
-        summary += f"**诱导条件**: {condition_info.get('expression_induction', 'N/A')}\n"
+        w(f"**温度**: {condition_info.get('temperature_celsius', 'N/A')}°C\n")
+        w(f"**pH**: {condition_info.get('ph', 'N/A')}\n")
+        # w(f"**反应时间**: {condition_info.get('reaction_time_hours', 'N/A')}小时\n\n")
+        w(f"**pH补充说明**: {condition_info.get('ph_details', 'N/A')}\n")
+        w(f"**实验类型**: {condition_info.get('assay_type', 'N/A')}\n")
+        w(f"**实验细节**: {condition_info.get('assay_details', 'N/A')}\n")
+        w(f"**缓冲液/溶剂**: {condition_info.get('solvent_buffer', 'N/A')}\n")
+        w(f"**表达宿主**: {condition_info.get('expression_host', 'N/A')}\n")
+        w(f"**表达载体**: {condition_info.get('expression_vector', 'N/A')}\n")
+        w(f"**诱导条件**: {condition_info.get('expression_induction', 'N/A')}\n")
 
     # 反应参与分子
     if not reaction_participants.empty:
-        summary += "**反应参与分子**:\n"
-        for _, participant in reaction_participants.iterrows():
-            summary += f"- {participant.get('participant_name', 'N/A')} ({participant.get('role', 'N/A')})\n"
+        w("**反应参与分子**:\n")
+        for participant_name, role in _row_values(reaction_participants, ('participant_name', 'role')):
+            w(f"- {participant_name} ({role})\n")
     
-    summary += '\n'
-    return summary
+    w('\n')
+    return buf.getvalue()
+
+def _source_name(df: pd.DataFrame) -> Optional[str]:
+    """df 为已加载的基础表或派生视图本身时返回其名称（可使用按名称缓存的辅助结构），否则返回None"""
+    for tables in (VIEWS, DB):
+        for name, table in tables.items():
+            if table is df:
+                return name
+    return None
+
+@register_cache
+@functools.lru_cache(maxsize=None)
+def _packed_values(source: str, column: str, normalize) -> tuple:
+    """
+    基础表/视图某列的不同取值归一化后以\0分隔拼接为一个字符串（首次使用时构建）
+
+    :return: (各行的取值编码, 拼接串, 各取值在拼接串中的起始位置)
+    """
+    df = VIEWS[source] if source in VIEWS else get_table(source)
+    codes, uniques = pd.factorize(df[column])
+    texts = [normalize(value) for value in uniques]
+    starts = list(itertools.accumulate((len(text) + 1 for text in texts), initial=0))[:-1]
+    return codes, "\0".join(texts), starts
+
+def _packed_hits(blob: str, starts: list, norm_query: str) -> np.ndarray:
+    """
+    在拼接串上以 str.find 逐个查找出现位置，按起始位置定位所属取值；
+    命中某个取值后直接从下一个取值开始继续查找，每个命中的取值只处理一次。
+    查询中不能含分隔符\0（由调用方退回逐个取值判断），否则可能跨取值匹配
+    """
+    hits = np.zeros(len(starts), dtype=bool)
+    if not norm_query:
+        # 空查询匹配全部取值
+        hits[:] = True
+        return hits
+    position = blob.find(norm_query)
+    while position >= 0:
+        index = bisect.bisect_right(starts, position) - 1
+        hits[index] = True
+        if index + 1 == len(starts):
+            break
+        position = blob.find(norm_query, starts[index + 1])
+    return hits
+
+def _distinct_contains(df, column, norm_query, normalize, missing) -> np.ndarray:
+    """
+    对列的每个不同取值只归一化、比对一次，再按取值编码展开为与行对齐的布尔数组。
+    df 为已加载的基础表或视图时，归一化后的取值拼接串按 (表名, 列名) 缓存，之后只需在拼接串上查找。
+
+    :param normalize: 取值 -> 归一化字符串
+    :param missing: 空值行的匹配结果
+    """
+    source = _source_name(df)
+    if source is not None and '\0' not in norm_query:
+        codes, blob, starts = _packed_values(source, column, normalize)
+        hits = _packed_hits(blob, starts, norm_query)
+    else:
+        codes, uniques = pd.factorize(df[column])
+        # 直接在Python字符串上做子串判断
+        hits = np.fromiter((norm_query in normalize(value) for value in uniques), dtype=bool, count=len(uniques))
+    # 空值的编码为-1，恰好取到末尾追加的 missing
+    return np.append(hits, missing)[codes]
+
+def _upper_text(value) -> str:
+    """取值的字符串形式转大写（与 astype(str) 后按 case=False 字面匹配的处理一致）"""
+    return str(value).upper()
+
+def _normalize_synonyms(synonyms) -> str:
+    """逐个同义词归一化并保留|分隔，使查询串无法跨越两个同义词匹配"""
+    return str(synonyms).encode('ascii', 'ignore').translate(_ASCII_LOWER, _NON_ALNUM_KEEP_BAR).decode('ascii')
 
 def _enzyme_name_or_synonym_match(df, enzyme_name):
     """
     支持enzyme_name和enzyme_synonyms（|分隔）模糊匹配，归一化后再比对。
     """
     norm_query = normalize_enzyme_name(enzyme_name)
-    if 'enzyme_synonyms' not in df.columns:
-        return df['enzyme_name'].apply(lambda x: norm_query in normalize_enzyme_name(x))
-    def match_synonyms(synonyms, enzyme_name_col):
-        # 检查主酶名
-        if norm_query in normalize_enzyme_name(enzyme_name_col):
-            return True
-        # 检查同义词
-        if pd.isnull(synonyms):
-            return False
-        for syn in str(synonyms).split('|'):
-            if norm_query in normalize_enzyme_name(syn):
-                return True
-        return False
-    return df.apply(lambda row: match_synonyms(row.get('enzyme_synonyms', None), row.get('enzyme_name', '')), axis=1)
+    mask = _distinct_contains(df, 'enzyme_name', norm_query, normalize_enzyme_name, norm_query == '')
+    if 'enzyme_synonyms' in df.columns:
+        mask = np.logical_or(mask, _distinct_contains(df, 'enzyme_synonyms', norm_query, _normalize_synonyms, False))
+    return pd.Series(mask, index=df.index)
+
+def _lower_equals(column: pd.Series, lowered: str) -> np.ndarray:
+    """
+    列转小写后是否等于lowered（空值为False），与 column.str.lower() == lowered 一致；
+    category列只在类别上转换、比较一次，再按编码展开
+    """
+    if not isinstance(column.dtype, pd.CategoricalDtype):
+        return (column.str.lower() == lowered).to_numpy()
+    hits = np.fromiter((str(category).lower() == lowered for category in column.cat.categories), dtype=bool, count=len(column.cat.categories))
+    return np.append(hits, False)[column.cat.codes.to_numpy()]
+
+def _text_startswith(column: pd.Series, prefix: str) -> np.ndarray:
+    """
+    列的字符串形式是否以prefix开头，与 column.astype(str).str.startswith(prefix) 一致（空值按'nan'判断）；
+    category列只在类别上判断一次，再按编码展开
+    """
+    if not isinstance(column.dtype, pd.CategoricalDtype):
+        return column.astype(str).str.startswith(prefix).to_numpy()
+    categories = column.cat.categories
+    hits = np.fromiter((str(category).startswith(prefix) for category in categories), dtype=bool, count=len(categories))
+    return np.append(hits, 'nan'.startswith(prefix))[column.cat.codes.to_numpy()]
+
+def _key_isin(df: pd.DataFrame, keys_df: pd.DataFrame) -> np.ndarray:
+    """
+    df 各行的关联键 (literature_id, reaction_id) 是否出现在 keys_df 中（半连接，不生成关联结果）。
+    各表的关联键共享同一category类型，两列编码合成一个整数后用 np.isin 比较；类型不一致时按键集合逐行判断
+    """
+    if all(isinstance(df[column].dtype, pd.CategoricalDtype) and df[column].dtype == keys_df[column].dtype
+           for column in ('literature_id', 'reaction_id')):
+        width = len(df['reaction_id'].cat.categories) + 1
+        def encode(frame):
+            # 编码+1使缺失值（-1）也有唯一的组合值
+            lit_codes = frame['literature_id'].cat.codes.to_numpy().astype(np.int64) + 1
+            return lit_codes * width + frame['reaction_id'].cat.codes.to_numpy() + 1
+        return np.isin(encode(df), encode(keys_df))
+    id_pairs = set(zip(keys_df['literature_id'], keys_df['reaction_id']))
+    keys = zip(df['literature_id'], df['reaction_id'])
+    return np.fromiter((key in id_pairs for key in keys), dtype=bool, count=len(df))
+
+def _combine_masks(masks, combine) -> np.ndarray:
+    """在一个新分配的布尔数组上依次原地合并各条件，不堆叠成 K×N 的临时数组（首个条件可能是只读缓存，因此先复制）"""
+    masks = iter(masks)
+    result = np.array(next(masks), dtype=bool)
+    for mask in masks:
+        combine(result, np.asarray(mask, dtype=bool), out=result)
+    return result
+
+def _and_masks(masks) -> np.ndarray:
+    """多个同一表上的布尔条件按AND合并（直接在numpy数组上合并，不构造临时DataFrame）"""
+    return _combine_masks(masks, np.logical_and)
 
+def _or_masks(masks) -> np.ndarray:
+    """多个同一表上的布尔条件按OR合并"""
+    return _combine_masks(masks, np.logical_or)
+
+def _render_rows(df: pd.DataFrame, template: tuple, max_len: Optional[int] = None) -> str:
+    """
+    按模板一次性渲染所有行：template 为 (文本, 列名, 文本, 列名, ..., 文本) 交替序列。
+    每列整列转为字符串后与文本按列拼接，结果与逐行 f"{row.get(列名, 'N/A')}" 一致（缺少的列输出N/A）。
+    给出 max_len 时，累计长度超过 max_len 的那一行之后的行不再拼接（调用方会截断输出）。
+    """
+    if df.empty:
+        return ""
+    lines = np.full(len(df), template[0], dtype=object)
+    for column, text in zip(template[1::2], template[2::2]):
+        values = df[column].astype(str).to_numpy(dtype=object) if column in df.columns else 'N/A'
+        lines = lines + values + text
+    lines = lines.tolist()
+    if max_len is not None:
+        length = 0
+        for count, line in enumerate(lines, 1):
+            length += len(line)
+            if length > max_len:
+                del lines[count:]
+                break
+    return "".join(lines)
+
+def _row_values(df: pd.DataFrame, columns: tuple, defaults: Optional[dict] = None):
+    """
+    逐行产出 columns 各列取值组成的元组：整列一次取出后按行zip，代替逐行构造dict。
+    缺少的列取 defaults 中的默认值（未指定时为N/A），与 row.get(列名, 默认值) 一致
+    """
+    defaults = defaults or {}
+    return zip(*[
+        df[column].tolist() if column in df.columns else itertools.repeat(defaults.get(column, 'N/A'), len(df))
+        for column in columns
+    ])
+
+@cached_tool
 def find_reactions_by_enzyme(**kwargs) -> str:
 
     """
@@ -141,11 +357,11 @@ def find_reactions_by_enzyme(**kwargs) -> str:
     """
     enzyme_name = kwargs.get('enzyme_name', None)
     organism = kwargs.get('organism', None)
-    max_results = kwargs.get('max_results', QUERY_CONFIG["max_results"])
+    max_results = kwargs.get('max_results', _MAX_RESULTS)
     
     if not DB: return "数据库未加载。"
-    enzymes_df = DB.get('2_enzymes', pd.DataFrame())
-    core_df = DB.get('1_reactions_core', pd.DataFrame())
+    enzymes_df = get_table('2_enzymes')
+    core_df = get_table('1_reactions_core')
     if enzymes_df.empty or core_df.empty:
         return "核心数据表未加载。"
     # 构建查询条件
@@ -154,31 +370,27 @@ def find_reactions_by_enzyme(**kwargs) -> str:
     if enzyme_name:
         query_conditions.append(_enzyme_name_or_synonym_match(enzymes_df, enzyme_name))
     if organism:
-        query_conditions.append(enzymes_df['organism'].str.contains(organism, case=False, na=False))
+        query_conditions.append(column_contains(enzymes_df, '2_enzymes', 'organism', organism))
     # 应用查询条件
     if query_conditions:
-        filtered_enzymes = enzymes_df[pd.concat(query_conditions, axis=1).all(axis=1)]
+        filtered_enzymes = enzymes_df[_and_masks(query_conditions)]
     else:
         filtered_enzymes = enzymes_df
     if filtered_enzymes.empty:
         return f"未找到匹配酶 '{enzyme_name}' 和物种 '{organism}' 的反应。"
     # 合并反应信息
-    merged_df = pd.merge(filtered_enzymes, core_df, on=['literature_id', 'reaction_id'])
-
-    result_df = merged_df.head(max_results)
+    # 只合并需要输出的前max_results行，总数由筛选结果得到
+    result_df, total = merge_head(filtered_enzymes, [('1_reactions_core', 'inner')], max_results, _BY_ENZYME_FIELDS)
     # 格式化输出
-    result = f"# 酶相关反应查询结果\n\n"
-    result += f"**查询条件**: 酶={enzyme_name if enzyme_name else '全部'}, 物种={organism if organism else '全部'}\n"
-    result += f"**输出反应数**: {len(result_df)} (共找到{len(merged_df)}个反应)\n\n"
-    for _, row in result_df.iterrows():
-        result += f"## {row['literature_id']}:{row['reaction_id']}\n"
-        result += f"- **酶**: {row['enzyme_name']}\n"
-        result += f"- **物种**: {row['organism']}\n"
-        result += f"- **酶EC号**: {row['ec_number']}\n"
-        result += f"- **反应**: {row['reaction_equation']}\n"
-        result += f"- **反应是否可逆**: {row['reaction_type_reversible']}\n\n"
-    return result
+    buf = io.StringIO()
+    w = buf.write
+    w(f"# 酶相关反应查询结果\n\n")
+    w(f"**查询条件**: 酶={enzyme_name if enzyme_name else '全部'}, 物种={organism if organism else '全部'}\n")
+    w(f"**输出反应数**: {len(result_df)} (共找到{total}个反应)\n\n")
+    w(_render_rows(result_df, _BY_ENZYME_TEMPLATE))
+    return buf.getvalue()
 
+@cached_tool
 def find_inhibition_data(**kwargs) -> str:
     """
     根据抑制剂名或酶名字查找抑制剂相关的数据。参数均可选。
@@ -189,66 +401,75 @@ def find_inhibition_data(**kwargs) -> str:
     """
     inhibitor_name = kwargs.get('inhibitor_name', None)
     enzyme_name = kwargs.get('enzyme_name', None)
-    max_results = kwargs.get('max_results', QUERY_CONFIG["max_results"])
+    max_results = kwargs.get('max_results', _MAX_RESULTS)
     if not DB: return "数据库未加载。"
     
-    inhibitors_df = DB.get('8_inhibitors_main', pd.DataFrame())
-    inhibition_params_df = DB.get('9_inhibition_params', pd.DataFrame())
-    enzymes_df = DB.get('2_enzymes', pd.DataFrame())
+    inhibitors_df = get_table('8_inhibitors_main')
+    inhibition_params_df = get_table('9_inhibition_params')
+    enzymes_df = get_table('2_enzymes')
     
     if inhibitors_df.empty or inhibition_params_df.empty:
         return "抑制剂数据表未加载。"
     
-    # 先合并酶信息
-    merged_inhibitors = pd.merge(inhibitors_df, enzymes_df, on=['literature_id', 'reaction_id'], how='left', suffixes=('', '_enzyme'))
+    if not inhibitor_name and not enzyme_name:
+        return "请提供抑制剂名称或酶名称。"
+    
+    # 抑制剂与酶信息的关联在加载时已完成（酶表未加载时没有该视图，退回为不含酶字段的抑制剂表）
+    merged_inhibitors = VIEWS.get('inhibitors_enzymes', inhibitors_df)
     # 构建查询条件
     query_conditions = []
     if inhibitor_name:
-        query_conditions.append(merged_inhibitors['inhibitor_name'].str.contains(inhibitor_name, case=False, na=False))
+        query_conditions.append(column_contains(merged_inhibitors, 'inhibitors_enzymes', 'inhibitor_name', inhibitor_name))
     if enzyme_name:
         # 支持酶名和同义词模糊匹配
-        enzyme_match = _enzyme_name_or_synonym_match(merged_inhibitors, enzyme_name) if 'enzyme_synonyms' in merged_inhibitors.columns else merged_inhibitors['enzyme_name'].str.contains(enzyme_name, case=False, na=False)
+        enzyme_match = _enzyme_name_or_synonym_match(merged_inhibitors, enzyme_name) if 'enzyme_synonyms' in merged_inhibitors.columns else column_contains(merged_inhibitors, 'inhibitors_enzymes', 'enzyme_name', enzyme_name)
         query_conditions.append(enzyme_match)
     
-    if not query_conditions:
-        return "请提供抑制剂名称或酶名称。"
-    
     # 应用查询条件
-    filtered_inhibitors = merged_inhibitors[pd.concat(query_conditions, axis=1).all(axis=1)]
-    
-    if filtered_inhibitors.empty:
+    mask = _and_masks(query_conditions)
+    if not mask.any():
         return f"未找到匹配的抑制剂数据。"
     
-    # 合并抑制参数
-    merged_df = pd.merge(filtered_inhibitors, inhibition_params_df, on=['literature_id', 'reaction_id','inhibitor_name'], how='left')
-    
-    result_df = merged_df.head(max_results)
+    if 'inhibitors_params' in VIEWS:
+        # 抑制参数已在加载时左关联：抑制剂行上的掩码展开到关联结果的各行，只取出要输出的行
+        params_mask = mask[VIEW_SOURCE_ROWS['inhibitors_params']]
+        total = int(params_mask.sum())
+        result_df = VIEWS['inhibitors_params'].iloc[np.flatnonzero(params_mask)[:max_results]]
+    else:
+        # 合并抑制参数
+        merged_df = pd.merge(merged_inhibitors[mask], inhibition_params_df, on=['literature_id', 'reaction_id','inhibitor_name'], how='left')
+        total = len(merged_df)
+        result_df = merged_df.head(max_results)
     # print(result_df.columns)
     # 格式化输出
-    result = f"# 抑制剂数据查询结果\n\n"
-    result += f"**查询条件**: 抑制剂={inhibitor_name if inhibitor_name else '全部'}, 酶={enzyme_name if enzyme_name else '全部'}\n"
-    result += f"**输出记录数**: {len(result_df)} (共找到{len(merged_df)}条记录)\n\n"
-    
-    for _, row in result_df.iterrows():
-        result += f"## {row['literature_id']}:{row['reaction_id']}\n"
-        result += f"- **抑制剂**: {row.get('inhibitor_name', 'N/A')}\n"
-        result += f"- **酶**: {row.get('enzyme_name', 'N/A')}\n"
-        result += f"- **抑制类型**: {row.get('inhibition_type', 'N/A')}\n"
-        result += f"- **定性效应**: {row.get('activity_qualitative', 'N/A')} and {row.get('inhibition_qualitative', 'N/A')} \n"
+    buf = io.StringIO()
+    w = buf.write
+    w(f"# 抑制剂数据查询结果\n\n")
+    w(f"**查询条件**: 抑制剂={inhibitor_name if inhibitor_name else '全部'}, 酶={enzyme_name if enzyme_name else '全部'}\n")
+    w(f"**输出记录数**: {len(result_df)} (共找到{total}条记录)\n\n")
+    
+    rows = _row_values(result_df, (
+        'literature_id', 'reaction_id', 'inhibitor_name', 'enzyme_name', 'inhibition_type', 'activity_qualitative',
+        'inhibition_qualitative', 'parameter_type', 'value', 'unit', 'error_margin', 'thermodynamics', 'details', 'notes'
+    ), {'parameter_type': None, 'value': None, 'unit': '', 'error_margin': ''})
+    for (lit, rid, inhibitor, enzyme, inhibition_type, activity, inhibition,
+         param_type, value, unit, error, thermodynamics, details, notes) in rows:
+        w(f"## {lit}:{rid}\n")
+        w(f"- **抑制剂**: {inhibitor}\n")
+        w(f"- **酶**: {enzyme}\n")
+        w(f"- **抑制类型**: {inhibition_type}\n")
+        w(f"- **定性效应**: {activity} and {inhibition} \n")
         # 输出所有参数类型及数值
-        if pd.notnull(row.get('parameter_type')) and pd.notnull(row.get('value')):
-            param_type = str(row.get('parameter_type', '')).strip()
-            value = row.get('value', 'N/A')
-            unit = row.get('unit', '')
-            error = row.get('error_margin', '')
-            param_str = f"- **{param_type}**: {value} {unit}"
+        if pd.notnull(param_type) and pd.notnull(value):
+            param_str = f"- **{str(param_type).strip()}**: {value} {unit}"
             if error and str(error).strip():
                 param_str += f" (误差: {error})"
-            result += param_str + "\n"
-        result += f"- **热力学信息**: {row.get('thermodynamics', 'N/A')}\n"
-        result += f"- **说明补充**: {row.get('details', 'N/A')} and {row.get('notes', 'N/A')} \n\n"
-    return result
+            w(param_str + "\n")
+        w(f"- **热力学信息**: {thermodynamics}\n")
+        w(f"- **说明补充**: {details} and {notes} \n\n")
+    return buf.getvalue()
 
+@cached_tool
 def find_reactions_by_organism(**kwargs) -> str:
     """
     根据物种和酶EC号查找反应。参数均可选。
@@ -259,12 +480,11 @@ def find_reactions_by_organism(**kwargs) -> str:
     """
     organism = kwargs.get('organism', None)
     ec_number = kwargs.get('ec_number', None)
-    max_results = kwargs.get('max_results', QUERY_CONFIG["max_results"])
+    max_results = kwargs.get('max_results', _MAX_RESULTS)
     if not DB: return "数据库未加载。"
     
-    enzymes_df = DB.get('2_enzymes', pd.DataFrame())
-    core_df = DB.get('1_reactions_core', pd.DataFrame())
-    conditions_df = DB.get('3_experimental_conditions', pd.DataFrame())
+    enzymes_df = get_table('2_enzymes')
+    core_df = get_table('1_reactions_core')
     
     if enzymes_df.empty or core_df.empty:
         return "核心数据表未加载。"
@@ -272,7 +492,7 @@ def find_reactions_by_organism(**kwargs) -> str:
     # 构建查询条件
     query_conditions = []
     if organism:
-        query_conditions.append(enzymes_df['organism'].str.contains(organism, case=False, na=False))
+        query_conditions.append(column_contains(enzymes_df, '2_enzymes', 'organism', organism))
     if ec_number:
         query_conditions.append(enzymes_df['ec_number'].astype(str).str.contains(ec_number, case=False, na=False))
     
@@ -280,40 +500,62 @@ def find_reactions_by_organism(**kwargs) -> str:
         return "请提供物种或酶EC号信息。"
     
     # 应用查询条件
-    filtered_enzymes = enzymes_df[pd.concat(query_conditions, axis=1).all(axis=1)]
+    filtered_enzymes = enzymes_df[_and_masks(query_conditions)]
     if filtered_enzymes.empty:
         return f"未找到匹配的反应。"
     
     # 合并反应信息
-    merged_df = pd.merge(filtered_enzymes, core_df, on=['literature_id', 'reaction_id'])
-    merged_df = pd.merge(merged_df, conditions_df, on=['literature_id', 'reaction_id'], how='left')
-    
-    result_df = merged_df.head(max_results)
+    result_df, total = merge_head(filtered_enzymes, [('1_reactions_core', 'inner'), ('3_experimental_conditions', 'left')], max_results, _BY_ORGANISM_FIELDS)
     
     # 格式化输出
-    result = f"# 物种+EC号反应查询结果\n\n"
-    result += f"**查询条件**: 物种={organism if organism else '全部'}, EC号={ec_number if ec_number else '全部'}\n"
-    result += f"**输出反应数**: {len(result_df)} (共找到{len(merged_df)}个反应)\n\n"
-    
-    for _, row in result_df.iterrows():
-        result += f"## {row['literature_id']}:{row['reaction_id']}\n"
-        result += f"- **物种**: {row.get('organism', 'N/A')}\n"
-        result += f"- **酶**: {row.get('enzyme_name', 'N/A')}\n"
-        result += f"- **EC号**: {row.get('ec_number', 'N/A')}\n"
-        result += f"- **反应**: {row.get('reaction_equation', 'N/A')}\n"
-        # 补充实验条件等字段
-        result += f"- **温度**: {row.get('temperature_celsius', 'N/A')}°C\n"
-        result += f"- **pH**: {row.get('ph', 'N/A')}\n"
-        result += f"- **pH补充说明**: {row.get('ph_details', 'N/A')}\n"
-        result += f"- **实验类型**: {row.get('assay_type', 'N/A')}\n"
-        result += f"- **实验细节**: {row.get('assay_details', 'N/A')}\n"
-        result += f"- **缓冲液/溶剂**: {row.get('solvent_buffer', 'N/A')}\n"
-        result += f"- **表达宿主**: {row.get('expression_host', 'N/A')}\n"
-        result += f"- **表达载体**: {row.get('expression_vector', 'N/A')}\n"
-        result += f"- **诱导条件**: {row.get('expression_induction', 'N/A')}\n"
-        result += "\n"
-    return result
+    buf = io.StringIO()
+    w = buf.write
+    w(f"# 物种+EC号反应查询结果\n\n")
+    w(f"**查询条件**: 物种={organism if organism else '全部'}, EC号={ec_number if ec_number else '全部'}\n")
+    w(f"**输出反应数**: {len(result_df)} (共找到{total}个反应)\n\n")
+    
+    w(_render_rows(result_df, _BY_ORGANISM_TEMPLATE))
+    return buf.getvalue()
 
+@functools.lru_cache(maxsize=256)
+def _parse_range(text: str) -> Optional[tuple]:
+    """
+    解析 "20-37"、">50"、"<20" 形式的范围，返回 (kind, low, high)，kind 为 'between'、'gt' 或 'lt'；
+    无法识别的格式返回None，数值部分不合法时抛出ValueError
+    """
+    if '-' in text:
+        low, high = map(float, text.split('-'))
+        return 'between', low, high
+    if text.startswith('>'):
+        return 'gt', float(text[1:]), None
+    if text.startswith('<'):
+        return 'lt', None, float(text[1:])
+    return None
+
+def _range_condition(column: pd.Series, text: str, out: Optional[np.ndarray] = None) -> Optional[np.ndarray]:
+    """
+    按范围字符串筛选数值列（between含端点，>、<不含端点），直接在float64数组上比较。
+    传入out时结果与out按AND合并并写回out，多个范围条件共用同一个布尔数组。
+    """
+    parsed = _parse_range(text)
+    if parsed is None:
+        return None
+    kind, low, high = parsed
+    values = column.to_numpy()
+    mask = np.empty(len(values), dtype=bool)
+    if kind == 'between':
+        np.greater_equal(values, low, out=mask)
+        mask &= values <= high
+    elif kind == 'gt':
+        np.greater(values, low, out=mask)
+    else:
+        np.less(values, high, out=mask)
+    if out is None:
+        return mask
+    out &= mask
+    return out
+
+@cached_tool
 def find_reactions_by_condition(**kwargs) -> str:
     """
     根据实验条件查找反应。参数均可选。
@@ -324,86 +566,44 @@ def find_reactions_by_condition(**kwargs) -> str:
     """
     temperature_range = kwargs.get('temperature_range', None)
     ph_range = kwargs.get('ph_range', None)
-    max_results = kwargs.get('max_results', QUERY_CONFIG["max_results"])
+    max_results = kwargs.get('max_results', _MAX_RESULTS)
     if not DB: return "数据库未加载。"
     
-    conditions_df = DB.get('3_experimental_conditions', pd.DataFrame())
-    core_df = DB.get('1_reactions_core', pd.DataFrame())
-    enzymes_df = DB.get('2_enzymes', pd.DataFrame())
+    conditions_df = get_table('3_experimental_conditions')
+    core_df = get_table('1_reactions_core')
     
     if conditions_df.empty or core_df.empty:
         return "核心数据表未加载。"
     
-    # 解析温度范围
-    temp_condition = None
-    if temperature_range:
-        if '-' in temperature_range:
-            min_temp, max_temp = map(float, temperature_range.split('-'))
-            temp_condition = conditions_df['temperature_celsius'].between(min_temp, max_temp)
-        elif temperature_range.startswith('>'):
-            min_temp = float(temperature_range[1:])
-            temp_condition = conditions_df['temperature_celsius'] > min_temp
-        elif temperature_range.startswith('<'):
-            max_temp = float(temperature_range[1:])
-            temp_condition = conditions_df['temperature_celsius'] < max_temp
-    
-    # 解析pH范围
-    ph_condition = None
+    # 解析温度范围与pH范围，两个条件合并到同一个布尔数组
+    condition_mask = _range_condition(conditions_df['temperature_celsius'], temperature_range) if temperature_range else None
     if ph_range:
-        if '-' in ph_range:
-            min_ph, max_ph = map(float, ph_range.split('-'))
-            ph_condition = conditions_df['ph'].between(min_ph, max_ph)
-        elif ph_range.startswith('>'):
-            min_ph = float(ph_range[1:])
-            ph_condition = conditions_df['ph'] > min_ph
-        elif ph_range.startswith('<'):
-            max_ph = float(ph_range[1:])
-            ph_condition = conditions_df['ph'] < max_ph
-    
-    # 应用条件
-    query_conditions = []
-    if temp_condition is not None:
-        query_conditions.append(temp_condition)
-    if ph_condition is not None:
-        query_conditions.append(ph_condition)
+        ph_condition = _range_condition(conditions_df['ph'], ph_range, out=condition_mask)
+        if ph_condition is not None:
+            condition_mask = ph_condition
     
-    if not query_conditions:
+    if condition_mask is None:
         return "请提供有效的温度或pH范围。"
     
-    filtered_conditions = conditions_df[pd.concat(query_conditions, axis=1).all(axis=1)]
+    filtered_conditions = conditions_df[condition_mask]
     
     if filtered_conditions.empty:
         return f"未找到匹配条件的反应。"
     
     # 合并数据
-    merged_df = pd.merge(filtered_conditions, core_df, on=['literature_id', 'reaction_id'])
-    merged_df = pd.merge(merged_df, enzymes_df, on=['literature_id', 'reaction_id'])
-    
-    result_df = merged_df.head(max_results)
+    result_df, total = merge_head(filtered_conditions, [('1_reactions_core', 'inner'), ('2_enzymes', 'inner')], max_results, _BY_CONDITION_FIELDS)
     
     # 格式化输出
-    result = f"# 条件查询结果\n\n"
-    result += f"**查询条件**: 温度={temperature_range if temperature_range else '全部'}, pH={ph_range if ph_range else '全部'}\n"
-    result += f"**输出记录数**: {len(result_df)} (共找到{len(merged_df)}个记录)\n\n"
-    
-    for _, row in result_df.iterrows():
-        result += f"## {row['literature_id']}:{row['reaction_id']}\n"
-
-        result += f"- **酶**: {row['enzyme_name']}\n"
-        result += f"- **反应**: {row['reaction_equation']}\n"
-        result += f"- **EC号**: {row['ec_number']}\n"
-        result += f"- **温度**: {row.get('temperature_celsius', 'N/A')}°C\n"
-        result += f"- **pH**: {row.get('ph', 'N/A')}\n"
-        result += f"- **pH补充说明**: {row.get('ph_details', 'N/A')}\n"
-        result += f"- **实验类型**: {row.get('assay_type', 'N/A')}\n"
-        result += f"- **实验细节**: {row.get('assay_details', 'N/A')}\n"
-        result += f"- **缓冲液/溶剂**: {row.get('solvent_buffer', 'N/A')}\n"
-        result += f"- **表达宿主**: {row.get('expression_host', 'N/A')}\n"
-        result += f"- **表达载体**: {row.get('expression_vector', 'N/A')}\n"
-        result += f"- **诱导条件**: {row.get('expression_induction', 'N/A')}\n"
-        result += "\n"
-    return result
+    buf = io.StringIO()
+    w = buf.write
+    w(f"# 条件查询结果\n\n")
+    w(f"**查询条件**: 温度={temperature_range if temperature_range else '全部'}, pH={ph_range if ph_range else '全部'}\n")
+    w(f"**输出记录数**: {len(result_df)} (共找到{total}个记录)\n\n")
+    
+    w(_render_rows(result_df, _BY_CONDITION_TEMPLATE))
+    return buf.getvalue()
 
+@cached_tool
 def find_reactions_with_pdb_id(**kwargs) -> str:
     """
     查找具有PDB ID的反应。参数均可选。
@@ -412,52 +612,49 @@ def find_reactions_with_pdb_id(**kwargs) -> str:
     :param max_results: int
     """
     pdb_id = kwargs.get('pdb_id', None)
-    max_results = kwargs.get('max_results', QUERY_CONFIG["max_results"])
+    max_results = kwargs.get('max_results', _MAX_RESULTS)
     if not DB: return "数据库未加载。"
     
-    enzymes_df = DB.get('2_enzymes', pd.DataFrame())
-    core_df = DB.get('1_reactions_core', pd.DataFrame())
+    enzymes_df = get_table('2_enzymes')
+    core_df = get_table('1_reactions_core')
     
     if enzymes_df.empty or core_df.empty:
         return "核心数据表未加载。"
     
     # 查找PDB ID
-    pdb_condition = enzymes_df['pdb_id'].str.contains(pdb_id, case=False, na=False) if pdb_id else True
+    pdb_condition = column_contains(enzymes_df, '2_enzymes', 'pdb_id', pdb_id) if pdb_id else True
     filtered_enzymes = enzymes_df[pdb_condition]
     
     if filtered_enzymes.empty:
         return f"未找到PDB ID为 '{pdb_id}' 的反应。"
     
     # 合并数据
-    merged_df = pd.merge(filtered_enzymes, core_df, on=['literature_id', 'reaction_id'])
-
-    result_df = merged_df.head(max_results)
+    result_df, total = merge_head(filtered_enzymes, [('1_reactions_core', 'inner')], max_results, _PDB_FIELDS)
     
     # 格式化输出
-    result = f"# PDB ID查询结果\n\n"
-    result += f"**查询PDB ID**: {pdb_id if pdb_id else '全部'}\n"
-    result += f"**输出记录数**: {len(result_df)} (共找到{len(merged_df)}个记录)\n\n"
-    
-    for _, row in result_df.iterrows():
-        result += f"## {row['literature_id']}:{row['reaction_id']}\n"
-        result += f"- **PDB ID**: {row['pdb_id']}\n"
-        result += f"- **酶**: {row['enzyme_name']}\n"
-        result += f"- **物种**: {row['organism']}\n"
-        result += f"- **反应**: {row['reaction_equation']}\n"
-        result += f"- **EC号**: {row['ec_number']}\n"
+    buf = io.StringIO()
+    w = buf.write
+    w(f"# PDB ID查询结果\n\n")
+    w(f"**查询PDB ID**: {pdb_id if pdb_id else '全部'}\n")
+    w(f"**输出记录数**: {len(result_df)} (共找到{total}个记录)\n\n")
+    
+    w(_render_rows(result_df, _PDB_TEMPLATE))
+    return buf.getvalue()
 
-        # result += f"- **温度**: {row.get('temperature_celsius', 'N/A')}°C\n"
-        # result += f"- **pH**: {row.get('ph', 'N/A')}\n"
-        # result += f"- **pH补充说明**: {row.get('ph_details', 'N/A')}\n"
-        # result += f"- **实验类型**: {row.get('assay_type', 'N/A')}\n"
-        # result += f"- **实验细节**: {row.get('assay_details', 'N/A')}\n"
-        # result += f"- **缓冲液/溶剂**: {row.get('solvent_buffer', 'N/A')}\n"
-        # result += f"- **表达宿主**: {row.get('expression_host', 'N/A')}\n"
-        # result += f"- **表达载体**: {row.get('expression_vector', 'N/A')}\n"
-        # result += f"- **诱导条件**: {row.get('expression_induction', 'N/A')}\n"
-        result += "\n"    
-    return result
+def _top_positions(values: np.ndarray, n: int) -> np.ndarray:
+    """
+    最大的n个非空值的位置（按值降序），结果与 dropna() 后 nlargest(n, keep='first') 相同：
+    用 argpartition 在O(N)内求出第n大的值，只对不小于它的候选排序，值相同时靠前的行优先
+    """
+    valid = np.flatnonzero(~np.isnan(values))
+    n = min(n, valid.size)
+    if n <= 0:
+        return valid[:0]
+    threshold = values[valid[np.argpartition(-values[valid], n - 1)[n - 1]]]
+    candidates = valid[values[valid] >= threshold]
+    return candidates[np.argsort(-values[candidates], kind='stable')[:n]]
 
+@cached_tool
 def find_top_reactions_by_performance(**kwargs) -> str:
     """
     根据性能指标（如conversion_rate、product_yield等，来源于4_activity_performance.csv）查找表现最好的反应。
@@ -473,9 +670,8 @@ def find_top_reactions_by_performance(**kwargs) -> str:
     min_data_points = kwargs.get('min_data_points', 5)
     if not DB: return "数据库未加载。"
     
-    activity_df = DB.get('4_activity_performance', pd.DataFrame())
-    core_df = DB.get('1_reactions_core', pd.DataFrame())
-    enzymes_df = DB.get('2_enzymes', pd.DataFrame())
+    activity_df = get_table('4_activity_performance')
+    core_df = get_table('1_reactions_core')
     
     if activity_df.empty or core_df.empty:
         return "核心数据表未加载。"
@@ -494,62 +690,67 @@ def find_top_reactions_by_performance(**kwargs) -> str:
     # 只对数值型做排序和过滤
     if metric and metric in numeric_metrics:
         # 确保有足够的数据点
-        min_data_points = max(min_data_points, QUERY_CONFIG["min_data_points"])
+        min_data_points = max(min_data_points, _MIN_DATA_POINTS)
         if len(activity_df) < min_data_points:
             return f"数据点不足（{len(activity_df)} < {min_data_points}）。"
-        # 数值转换
-        activity_df[metric] = pd.to_numeric(activity_df[metric], errors='coerce')
-        activity_df = activity_df.dropna(subset=[metric])
-        if len(activity_df) < min_data_points:
-            return f"有效数据点不足（{len(activity_df)} < {min_data_points}）。"
-        # 排序并获取前N个
-        top_n = min(top_n, QUERY_CONFIG["default_top_n"])
-        top_reactions = activity_df.nlargest(top_n, metric)
+        # 数值形式在首次使用时转换并缓存，不修改共享的数据表
+        values = numeric_column('4_activity_performance', metric)
+        data_points = int(values.notna().sum())
+        if data_points < min_data_points:
+            return f"有效数据点不足（{data_points} < {min_data_points}）。"
+        # 排序并获取前N个（只取出前N行，并以数值形式输出指标）
+        top_n = min(top_n, _DEFAULT_TOP_N)
+        positions = _top_positions(values.to_numpy(), top_n)
+        top_reactions = activity_df.iloc[positions].assign(**{metric: values.to_numpy()[positions]})
     else:
         # 字符串型指标，直接取前N条非空记录
-        top_n = min(top_n, QUERY_CONFIG["default_top_n"])
+        top_n = min(top_n, _DEFAULT_TOP_N)
         top_reactions = activity_df[activity_df[metric].notnull() & (activity_df[metric] != '')].head(top_n)
+        data_points = len(activity_df)
     
     # 合并数据
-    merged_df = pd.merge(top_reactions, core_df, on=['literature_id', 'reaction_id'])
-    merged_df = pd.merge(merged_df, enzymes_df, on=['literature_id', 'reaction_id'])
+    merged_df, _ = merge_head(top_reactions, [('1_reactions_core', 'inner'), ('2_enzymes', 'inner')], len(top_reactions), _TOP_PERFORMANCE_FIELDS)
     
     # 格式化输出
-    result = f"# 性能排名查询结果\n\n"
-    result += f"**性能指标**: {metric if metric else '全部'}\n"
-    result += f"**排名数量**: {top_n}\n"
-    result += f"**总数据点**: {len(activity_df)}\n\n"
+    buf = io.StringIO()
+    w = buf.write
+    w(f"# 性能排名查询结果\n\n")
+    w(f"**性能指标**: {metric if metric else '全部'}\n")
+    w(f"**排名数量**: {top_n}\n")
+    w(f"**总数据点**: {data_points}\n\n")
     
     # 单位、误差字段自动适配
-    for i, (_, row) in enumerate(merged_df.iterrows(), 1):
-        result += f"## 第{i}名: {row['literature_id']}:{row['reaction_id']}\n"
-        value = row[metric] if metric else row['conversion_rate'] # 默认值
+    rows = _row_values(merged_df, (
+        'literature_id', 'reaction_id', metric, f"{metric}_unit", f"{metric}_error",
+        'enzyme_name', 'organism', 'reaction_equation', 'ec_number'
+    ), {f"{metric}_unit": None, f"{metric}_error": None})
+    for i, (lit, rid, value, unit, error, enzyme, organism, equation, ec) in enumerate(rows, 1):
+        w(f"## 第{i}名: {lit}:{rid}\n")
         # 新增：始终输出unit和error（仅对conversion_rate、product_yield、enantiomeric_excess）
         if metric in ['conversion_rate', 'product_yield', 'enantiomeric_excess']:
-            unit_col = f"{metric}_unit"
-            error_col = f"{metric}_error"
-            unit = row[unit_col] if unit_col in row and pd.notnull(row[unit_col]) else ''
-            error = row[error_col] if error_col in row and pd.notnull(row[error_col]) else ''
-            result += f"- **{metric}**: {value} {unit} {(f'(误差: {error})' if error else '')}\n"
+            unit = unit if pd.notnull(unit) else ''
+            error = error if pd.notnull(error) else ''
+            w(f"- **{metric}**: {value} {unit} {(f'(误差: {error})' if error else '')}\n")
         else:
-            result += f"- **{metric}**: {value}\n"
-        result += f"- **酶**: {row['enzyme_name']}\n"
-        result += f"- **物种**: {row['organism']}\n"
-        result += f"- **反应**: {row['reaction_equation']}\n"
-        result += f"- **EC号**: {row['ec_number']}\n"
+            w(f"- **{metric}**: {value}\n")
+        w(f"- **酶**: {enzyme}\n")
+        w(f"- **物种**: {organism}\n")
+        w(f"- **反应**: {equation}\n")
+        w(f"- **EC号**: {ec}\n")
         
-        # result += f"- **温度**: {row.get('temperature_celsius', 'N/A')}°C\n"
-        # result += f"- **pH**: {row.get('ph', 'N/A')}\n"
-        # result += f"- **pH补充说明**: {row.get('ph_details', 'N/A')}\n"
-        # result += f"- **实验类型**: {row.get('assay_type', 'N/A')}\n"
-        # result += f"- **实验细节**: {row.get('assay_details', 'N/A')}\n"
-        # result += f"- **缓冲液/溶剂**: {row.get('solvent_buffer', 'N/A')}\n"
-        # result += f"- **表达宿主**: {row.get('expression_host', 'N/A')}\n"
-        # result += f"- **表达载体**: {row.get('expression_vector', 'N/A')}\n"
-        # result += f"- **诱导条件**: {row.get('expression_induction', 'N/A')}\n"
-        result += "\n"
-    return result
+        # w(f"- **温度**: {row.get('temperature_celsius', 'N/A')}°C\n")
+        # w(f"- **pH**: {row.get('ph', 'N/A')}\n")
+        # w(f"- **pH补充说明**: {row.get('ph_details', 'N/A')}\n")
+        # w(f"- **实验类型**: {row.get('assay_type', 'N/A')}\n")
+        # w(f"- **实验细节**: {row.get('assay_details', 'N/A')}\n")
+        # w(f"- **缓冲液/溶剂**: {row.get('solvent_buffer', 'N/A')}\n")
+        # w(f"- **表达宿主**: {row.get('expression_host', 'N/A')}\n")
+        # w(f"- **表达载体**: {row.get('expression_vector', 'N/A')}\n")
+        # w(f"- **诱导条件**: {row.get('expression_induction', 'N/A')}\n")
+        w("\n")
+    return buf.getvalue()
 
+@cached_tool
 def find_conditions_by_enzyme(**kwargs) -> str:
     """
     查找特定酶的实验条件。参数均可选。
@@ -558,11 +759,11 @@ def find_conditions_by_enzyme(**kwargs) -> str:
     :param max_results: int
     """
     enzyme_name = kwargs.get('enzyme_name', None)
-    max_results = kwargs.get('max_results', QUERY_CONFIG["max_results"])
+    max_results = kwargs.get('max_results', _MAX_RESULTS)
     if not DB: return "数据库未加载。"
     
-    enzymes_df = DB.get('2_enzymes', pd.DataFrame())
-    conditions_df = DB.get('3_experimental_conditions', pd.DataFrame())
+    enzymes_df = get_table('2_enzymes')
+    conditions_df = get_table('3_experimental_conditions')
     
     if enzymes_df.empty or conditions_df.empty:
         return "核心数据表未加载。"
@@ -575,32 +776,19 @@ def find_conditions_by_enzyme(**kwargs) -> str:
         return f"未找到酶 '{enzyme_name}' 的记录。"
     
     # 合并条件数据
-    merged_df = pd.merge(filtered_enzymes, conditions_df, on=['literature_id', 'reaction_id'])
-    
-    result_df = merged_df.head(max_results)
+    result_df, total = merge_head(filtered_enzymes, [('3_experimental_conditions', 'inner')], max_results, _CONDITION_FIELDS)
     
     # 格式化输出
-    result = f"# 酶条件查询结果\n\n"
-    result += f"**目标酶**: {enzyme_name if enzyme_name else '全部'}\n"
-    result += f"**输出记录数**: {len(result_df)} (共找到记录{len(merged_df)}个)\n\n"
-    
-    for _, row in result_df.iterrows():
-        result += f"## 文献编号: {row['literature_id']} 反应编号: {row['reaction_id']}\n"
-        result += f"- **酶名称**: {row.get('enzyme_name', 'N/A')}\n"
-        result += f"- **来源物种**: {row.get('organism', 'N/A')}\n"
-        result += f"- **实验温度**: {row.get('temperature_celsius', 'N/A')}°C\n"
-        result += f"- **pH值**: {row.get('ph', 'N/A')}\n"
-        result += f"- **pH补充说明**: {row.get('ph_details', 'N/A')}\n"
-        result += f"- **实验类型**: {row.get('assay_type', 'N/A')}\n"
-        result += f"- **实验细节**: {row.get('assay_details', 'N/A')}\n"
-        result += f"- **缓冲液/溶剂**: {row.get('solvent_buffer', 'N/A')}\n"
-        result += f"- **表达宿主**: {row.get('expression_host', 'N/A')}\n"
-        result += f"- **表达载体**: {row.get('expression_vector', 'N/A')}\n"
-        result += f"- **诱导条件**: {row.get('expression_induction', 'N/A')}\n"
-        result += "\n"
-      
-    return result
+    buf = io.StringIO()
+    w = buf.write
+    w(f"# 酶条件查询结果\n\n")
+    w(f"**目标酶**: {enzyme_name if enzyme_name else '全部'}\n")
+    w(f"**输出记录数**: {len(result_df)} (共找到记录{total}个)\n\n")
+    
+    w(_render_rows(result_df, _CONDITIONS_BY_ENZYME_TEMPLATE))
+    return buf.getvalue()
 
+@cached_tool
 def find_enzymes_by_participant(**kwargs) -> str:
     """
     根据反应参与分子查找相关酶。参数均可选。
@@ -609,57 +797,37 @@ def find_enzymes_by_participant(**kwargs) -> str:
     :param max_results: int
     """
     participant_name = kwargs.get('participant_name', None)
-    max_results = kwargs.get('max_results', QUERY_CONFIG["max_results"])
+    max_results = kwargs.get('max_results', _MAX_RESULTS)
     if not DB: return "数据库未加载。"
     
-    participants_df = DB.get('5_reaction_participants', pd.DataFrame())
-    enzymes_df = DB.get('2_enzymes', pd.DataFrame())
-    core_df = DB.get('1_reactions_core', pd.DataFrame())
-    conditions_df = DB.get('3_experimental_conditions', pd.DataFrame())
+    participants_df = get_table('5_reaction_participants')
+    enzymes_df = get_table('2_enzymes')
     
     if participants_df.empty or enzymes_df.empty:
         return "核心数据表未加载。"
     
     # 查找参与者
-    participant_condition = participants_df['participant_name'].str.contains(participant_name, case=False, na=False) if participant_name else True
+    participant_condition = column_contains(participants_df, '5_reaction_participants', 'participant_name', participant_name) if participant_name else True
     filtered_participants = participants_df[participant_condition]
     
     if filtered_participants.empty:
         return f"未找到参与者 '{participant_name}' 的记录。"
     
     # 合并数据
-    merged_df = pd.merge(filtered_participants, enzymes_df, on=['literature_id', 'reaction_id'])
-    merged_df = pd.merge(merged_df, core_df, on=['literature_id', 'reaction_id'])
-    merged_df = pd.merge(merged_df, conditions_df, on=['literature_id', 'reaction_id'])
-
-    result_df = merged_df.head(max_results)
+    result_df, total = merge_head(filtered_participants, [('2_enzymes', 'inner'), ('1_reactions_core', 'inner'), ('3_experimental_conditions', 'inner')], max_results, _PARTICIPANT_FIELDS)
     
     # 格式化输出
-    result = f"# 参与者酶查询结果\n\n"
-    result += f"**目标参与者**: {participant_name if participant_name else '全部'}\n"
-    result += f"**输出记录数**: {len(result_df)} (共找到记录{len(merged_df)}个)\n\n"
-    
-    for _, row in result_df.iterrows():
-        result += f"## {row['literature_id']}:{row['reaction_id']}\n"
-        result += f"- **参与者**: {row['participant_name']} ({row['role']})\n"
-        result += f"- **酶**: {row['enzyme_name']}\n"
-        result += f"- **物种**: {row['organism']}\n"
-        result += f"- **反应**: {row['reaction_equation']}\n"
-        result += f"- **EC号**: {row['ec_number']}\n"
-
-        result += f"- **温度**: {row.get('temperature_celsius', 'N/A')}°C\n"
-        result += f"- **pH**: {row.get('ph', 'N/A')}\n"
-        result += f"- **pH补充说明**: {row.get('ph_details', 'N/A')}\n"
-        result += f"- **实验类型**: {row.get('assay_type', 'N/A')}\n"
-        result += f"- **实验细节**: {row.get('assay_details', 'N/A')}\n"
-        result += f"- **缓冲液/溶剂**: {row.get('solvent_buffer', 'N/A')}\n"
-        result += f"- **表达宿主**: {row.get('expression_host', 'N/A')}\n"
-        result += f"- **表达载体**: {row.get('expression_vector', 'N/A')}\n"
-        result += f"- **诱导条件**: {row.get('expression_induction', 'N/A')}\n"
-        result += "\n"    
-    return result
+    buf = io.StringIO()
+    w = buf.write
+    w(f"# 参与者酶查询结果\n\n")
+    w(f"**目标参与者**: {participant_name if participant_name else '全部'}\n")
+    w(f"**输出记录数**: {len(result_df)} (共找到记录{total}个)\n\n")
+    
+    w(_render_rows(result_df, _PARTICIPANT_TEMPLATE))
+    return buf.getvalue()
 
 # 新增智能查询工具
+@cached_tool
 def smart_search_reactions(
     search_query: str,
     search_fields: List[str],
@@ -674,19 +842,15 @@ def smart_search_reactions(
     """
     if not DB: return "数据库未加载。"
     
-    core_df = DB.get('1_reactions_core', pd.DataFrame())
-    enzymes_df = DB.get('2_enzymes', pd.DataFrame())
-    participants_df = DB.get('5_reaction_participants', pd.DataFrame())
-    
-    if core_df.empty or enzymes_df.empty:
+    if 'reactions' not in VIEWS:
         return "核心数据表未加载。"
     
-    # 合并数据
-    merged_df = pd.merge(core_df, enzymes_df, on=['literature_id', 'reaction_id'])
+    # 反应+酶的关联视图在加载时已建好
+    merged_df = VIEWS['reactions']
     
-    # 如果涉及底物/产物/参与者，合并参与者表
+    # 如果涉及底物/产物/参与者，改用关联了参与者表的视图
     if any(f in ['participant_name', 'role'] for f in (search_fields or [])):
-        merged_df = pd.merge(merged_df, participants_df, on=['literature_id', 'reaction_id'], how='left')
+        merged_df = VIEWS.get('reactions_participants', merged_df)
     
     # 字段推断
     valid_fields = [f for f in (search_fields or []) if f in merged_df.columns]
@@ -700,99 +864,116 @@ def smart_search_reactions(
             'enzyme_name', 'enzyme_synonyms', 'gene_name', 'organism', 'ec_number',
             'participant_name', 'role'
         ] if col in merged_df.columns]
-    # 构建搜索条件
+    # 构建搜索条件：每个字段只对不同取值比对一次，与 astype(str).str.contains(case=False, regex=False) 等价
+    # （pandas以upper()做大小写无关的字面匹配；空值转为字符串'nan'后参与匹配）
+    query_upper = search_query.upper()
     search_conditions = []
-    for field in valid_fields:
-        if field in merged_df.columns:
-            if field == "enzyme_name" or field == "enzyme_synonyms":
-                search_conditions.append(_enzyme_name_or_synonym_match(merged_df, search_query))
-            else:
-                # case=False，理论上不区分大小写;去除正则影响，使用regex=False
-                search_conditions.append(merged_df[field].astype(str).str.contains(search_query, case=False, na=False,regex=False))
+    # 酶名与同义词为同一个匹配条件，只需计算一次
+    if "enzyme_name" in valid_fields or "enzyme_synonyms" in valid_fields:
+        search_conditions.append(_enzyme_name_or_synonym_match(merged_df, search_query))
+    # 其余字段各自在去重后的取值上匹配（重复给出的字段只匹配一次）
+    for field in dict.fromkeys(field for field in valid_fields if field not in ("enzyme_name", "enzyme_synonyms")):
+        search_conditions.append(_distinct_contains(merged_df, field, query_upper, _upper_text, query_upper in 'NAN'))
     
     if not search_conditions:
         return "未找到有效的搜索字段。"
     
     # 应用搜索条件（OR逻辑）
-    combined_condition = pd.concat(search_conditions, axis=1).any(axis=1)
-    filtered_df = merged_df[combined_condition]
+    combined_condition = _or_masks(search_conditions)
+    total_count = int(combined_condition.sum())
     
-    if filtered_df.empty:
+    if not total_count:
         return f"未找到匹配查询 '{search_query}' 的反应。"
     
-    result_df = filtered_df.head(max_results)
+    # 总数直接在掩码上统计，只取出需要输出的前max_results行
+    result_df = merged_df.iloc[np.flatnonzero(combined_condition)[:max_results]]
     
     # 格式化输出
-    result = f"# 智能搜索结果\n\n"
-    result += f"**搜索查询**: {search_query if search_query else '全部'}\n"
-    result += f"**搜索字段**: {', '.join(valid_fields) if valid_fields else '全部'}\n"
-    result += f"**输出记录数**: {len(result_df)} (共找到记录{len(filtered_df)}个)\n\n"
-    
-    for _, row in result_df.iterrows():
-        result += f"## 文献id:{row['literature_id']},反应id:{row['reaction_id']}\n"
-        result += f"- **酶**: {row.get('enzyme_name', 'N/A')}\n"
-        result += f"- **物种**: {row.get('organism', 'N/A')}\n"
-        result += f"- **酶EC号**: {row.get('ec_number', 'N/A')}\n"
-        result += f"- **反应**: {row.get('reaction_equation', 'N/A')}\n"
-        result += f"- **反应是否可逆**: {row.get('reaction_type_reversible', 'N/A')}\n"
-        if 'participant_name' in row and pd.notnull(row['participant_name']):
-            result += f"- **参与分子**: {row['participant_name']} ({row.get('role', 'N/A')})\n"
-        if 'notes' in row and pd.notnull(row['notes']):
-            result += f"- **备注**: {row['notes']}\n"
-        result += "\n"
-    return result
+    buf = io.StringIO()
+    w = buf.write
+    w(f"# 智能搜索结果\n\n")
+    w(f"**搜索查询**: {search_query if search_query else '全部'}\n")
+    w(f"**搜索字段**: {', '.join(valid_fields) if valid_fields else '全部'}\n")
+    w(f"**输出记录数**: {len(result_df)} (共找到记录{total_count}个)\n\n")
+    
+    rows = _row_values(result_df, (
+        'literature_id', 'reaction_id', 'enzyme_name', 'organism', 'ec_number', 'reaction_equation',
+        'reaction_type_reversible', 'participant_name', 'role', 'notes'
+    ), {'participant_name': None, 'notes': None})
+    for lit, rid, enzyme, organism, ec, equation, reversible, participant, role, notes in rows:
+        w(f"## 文献id:{lit},反应id:{rid}\n")
+        w(f"- **酶**: {enzyme}\n")
+        w(f"- **物种**: {organism}\n")
+        w(f"- **酶EC号**: {ec}\n")
+        w(f"- **反应**: {equation}\n")
+        w(f"- **反应是否可逆**: {reversible}\n")
+        if pd.notnull(participant):
+            w(f"- **参与分子**: {participant} ({role})\n")
+        if pd.notnull(notes):
+            w(f"- **备注**: {notes}\n")
+        w("\n")
+    return buf.getvalue()
+
+# 字段推断的关键词按优先级排列，编译为一个正则：前瞻使每个位置都参与匹配（关键词可相互重叠），
+# 同一位置按书写顺序取优先级最高的分支；在小写化的查询上匹配，与逐个 in / lower() 判断等价
+_FIELD_GUESSES = (
+    ('equation', r'->|→', ['reaction_equation']),
+    ('enzyme', r'酶|ase|protein', ['enzyme_name', 'enzyme_synonyms']),
+    ('reversible', r'可逆|类型', ['reaction_type_reversible']),
+    ('participant', r'底物|产物|substrate|product', ['participant_name', 'role']),
+    ('gene', r'基因|gene', ['gene_name']),
+    ('organism', r'物种|organism', ['organism']),
+    ('notes', r'备注|note', ['notes']),
+)
+_FIELD_GUESS_PATTERN = re.compile('(?=' + '|'.join(f'(?P<{name}>{pattern})' for name, pattern, _ in _FIELD_GUESSES) + ')')
+_FIELD_GUESS_PRIORITY = {name: priority for priority, (name, _, _) in enumerate(_FIELD_GUESSES)}
+_FIELD_GUESS_FIELDS = {name: fields for name, _, fields in _FIELD_GUESSES}
+_EC_NUMBER_PATTERN = re.compile(r'\d+\.\d+\.\d+\.\d+')
+_ALL_SEARCH_FIELDS = [
+    'reaction_equation', 'reaction_type_reversible', 'notes',
+    'enzyme_name', 'enzyme_synonyms', 'gene_name', 'organism', 'ec_number',
+    'participant_name', 'role'
+]
 
 def guess_search_fields(user_query: str) -> list:
     """
     根据用户输入内容智能推断最合适的数据库字段（严格依据实际字段名）。
+    优先级：反应方程式结构 > EC号（查询以EC号开头） > 酶名 > 反应类型 > 底物/产物 > 基因名 > 物种 > 备注，均未命中时返回所有主要字段。
     """
-    # 反应方程式结构
-    if '->' in user_query or '→' in user_query:
-        return ['reaction_equation']
-    # EC号
-    if re.match(r'\d+\.\d+\.\d+\.\d+', user_query):
+    found = {match.lastgroup for match in _FIELD_GUESS_PATTERN.finditer(user_query.lower())}
+    if 'equation' in found:
+        return list(_FIELD_GUESS_FIELDS['equation'])
+    if _EC_NUMBER_PATTERN.match(user_query):
         return ['ec_number']
-    # 酶名关键词
-    if any(kw in user_query.lower() for kw in ['酶', 'ase', 'protein']):
-        return ['enzyme_name', 'enzyme_synonyms']
-    # 反应类型
-    if '可逆' in user_query or '不可逆' in user_query or '类型' in user_query:
-        return ['reaction_type_reversible']
-    # 底物/产物
-    if '底物' in user_query or '产物' in user_query or 'substrate' in user_query.lower() or 'product' in user_query.lower():
-        return ['participant_name', 'role']
-    # 基因名
-    if '基因' in user_query or 'gene' in user_query.lower():
-        return ['gene_name']
-    # 物种
-    if '物种' in user_query or 'organism' in user_query.lower():
-        return ['organism']
-    # 备注
-    if '备注' in user_query or 'note' in user_query.lower():
-        return ['notes']
+    if found:
+        return list(_FIELD_GUESS_FIELDS[min(found, key=_FIELD_GUESS_PRIORITY.__getitem__)])
     # fallback: 所有主要字段
-    return [
-        'reaction_equation', 'reaction_type_reversible', 'notes',
-        'enzyme_name', 'enzyme_synonyms', 'gene_name', 'organism', 'ec_number',
-        'participant_name', 'role'
-    ]
+    return list(_ALL_SEARCH_FIELDS)
 
+# 只依赖已加载的DB内容，结果在进程内不变，缓存后重复调用直接返回
+@register_cache
+@functools.lru_cache(maxsize=None)
 def get_database_statistics() -> str:
     """
     获取数据库统计信息。
     """
     if not DB: return "数据库未加载。"
     
-    result = "# 数据库统计信息\n\n"
+    buf = io.StringIO()
+    
+    w = buf.write
+    
+    w("# 数据库统计信息\n\n")
     
     for table_name, df in DB.items():
-        result += f"## {table_name}\n"
-        result += f"- **记录数**: {len(df)}\n"
-        result += f"- **列数**: {len(df.columns)}\n"
-        result += f"- **列名**: {', '.join(df.columns.tolist())}\n\n"
+        w(f"## {table_name}\n")
+        w(f"- **记录数**: {len(df)}\n")
+        w(f"- **列数**: {len(df.columns)}\n")
+        w(f"- **列名**: {', '.join(df.columns.tolist())}\n\n")
     
-    return result
+    return buf.getvalue()
 
+@cached_tool
 def find_similar_reactions(**kwargs) -> str:
     """
     根据反应id及相似性标准查找制定反应相似的反应。
@@ -803,15 +984,13 @@ def find_similar_reactions(**kwargs) -> str:
     """
     target_reaction_id = kwargs.get('target_reaction_id', None)
     similarity_criteria = kwargs.get('similarity_criteria', None)
-    max_results = kwargs.get('max_results', QUERY_CONFIG["max_results"])
+    max_results = kwargs.get('max_results', _MAX_RESULTS)
     if not DB: return "数据库未加载。"
 
-    # 合并所有相关表
-    enzymes_df = DB.get('2_enzymes', pd.DataFrame())
-    core_df = DB.get('1_reactions_core', pd.DataFrame())
-    conditions_df = DB.get('3_experimental_conditions', pd.DataFrame())
-    merged_df = pd.merge(enzymes_df, core_df, on=['literature_id', 'reaction_id'])
-    merged_df = pd.merge(merged_df, conditions_df, on=['literature_id', 'reaction_id'])
+    # 酶+反应+实验条件的关联视图在加载时已建好
+    if 'reactions_wide' not in VIEWS:
+        return "核心数据表未加载。"
+    merged_df = VIEWS['reactions_wide']
     
     # 解析目标反应
     if target_reaction_id and ':' not in target_reaction_id:
@@ -819,65 +998,75 @@ def find_similar_reactions(**kwargs) -> str:
     lit_id = target_reaction_id.split(':', 1)[0] if target_reaction_id else None
     react_id = target_reaction_id.split(':', 1)[1] if target_reaction_id else None
 
-    target_row = merged_df[(merged_df['literature_id'] == lit_id) & (merged_df['reaction_id'] == react_id)]
-    if target_row.empty:
+    # 目标反应按关联键哈希查找；排除目标反应只需把这几行的掩码置为False，无需再比较两列
+    target_positions = reaction_positions('reactions_wide', lit_id, react_id)
+    if not len(target_positions):
         return f"未找到目标反应 {target_reaction_id}"
+    # 目标反应的字段按列直接取标量，不构造行Series
+    target_position = target_positions[0]
+    not_target = np.ones(len(merged_df), dtype=bool)
+    not_target[target_positions] = False
 
     # 根据相似性标准筛选
     # 支持多种酶相关的相似性标准，区分酶名与EC号
     if any(x in str(similarity_criteria).lower() for x in ["enzyme", "酶", "enzyme_name", "酶名"]):
-        enzyme_name = target_row.iloc[0]['enzyme_name']
-        similar = merged_df[
-            (merged_df['enzyme_name'].str.contains(enzyme_name.split('_')[0], case=False, na=False)) &
-            ~((merged_df['literature_id'] == lit_id) & (merged_df['reaction_id'] == react_id))
-        ]
+        enzyme_name = merged_df['enzyme_name'].iat[target_position]
+        # 同一酶名词根的匹配结果由检索索引按查询串缓存，同一词根的目标反应只需匹配一次
+        similar_mask = column_contains(merged_df, 'reactions_wide', 'enzyme_name', enzyme_name.split('_')[0]).to_numpy() & not_target
     elif any(x in str(similarity_criteria).lower() for x in ["ec_number", "ec号", "ec", "酶分类"]):
-        ec_number = str(target_row.iloc[0].get('ec_number', ''))
+        ec_number = str(merged_df['ec_number'].iat[target_position])
         if ec_number:
             ec_main = '.'.join(ec_number.split('.')[:2])
-            similar = merged_df[
-                (merged_df['ec_number'].astype(str).str.startswith(ec_main)) &
-                ~((merged_df['literature_id'] == lit_id) & (merged_df['reaction_id'] == react_id))
-            ]
+            similar_mask = _text_startswith(merged_df['ec_number'], ec_main) & not_target
         else:
             return "目标反应无EC号信息"
     else:
         return "不支持的相似性标准"
 
-    if similar.empty:
+    total = int(similar_mask.sum())
+    if not total:
         return f"未找到相似反应"
-
-    result_df = similar.head(max_results)
+    result_count = min(total, max_results)
 
     # 格式化输出
-    result = f"# 相似反应查询结果\n\n"
-    result += f"**目标反应**: {target_reaction_id if target_reaction_id else '全部'}\n"
-    result += f"**相似性标准**: {similarity_criteria if similarity_criteria else '全部'}\n"
-    result += f"**输出相似反应数**: {len(result_df)}，共找到记录{len(similar)}条\n\n"
+    buf = io.StringIO()
+    w = buf.write
+    w(f"# 相似反应查询结果\n\n")
+    w(f"**目标反应**: {target_reaction_id if target_reaction_id else '全部'}\n")
+    w(f"**相似性标准**: {similarity_criteria if similarity_criteria else '全部'}\n")
+    w(f"**输出相似反应数**: {result_count}，共找到记录{total}条\n\n")
 
-    for _, row in result_df.iterrows():
-        result += f"## {row['literature_id']}:{row['reaction_id']}\n"
-        result += f"- **酶**: {row.get('enzyme_name', 'N/A')}\n"
-        result += f"- **EC号**: {row.get('ec_number', 'N/A')}\n"
-        result += f"- **物种**: {row.get('organism', 'N/A')}\n"
-        result += f"- **反应**: {row.get('reaction_equation', 'N/A')}\n"
-        result += f"- **反应是否可逆**: {row.get('reaction_type_reversible', 'N/A')}\n\n"
-        result += f"- **温度**: {row.get('temperature_celsius', 'N/A')}°C\n"
-        result += f"- **pH**: {row.get('ph', 'N/A')}\n"
-        result += f"- **pH补充说明**: {row.get('ph_details', 'N/A')}\n"
-        result += f"- **实验类型**: {row.get('assay_type', 'N/A')}\n"
-        result += f"- **实验细节**: {row.get('assay_details', 'N/A')}\n"
-        result += f"- **缓冲液/溶剂**: {row.get('solvent_buffer', 'N/A')}\n"
-        result += f"- **表达宿主**: {row.get('expression_host', 'N/A')}\n"
-        result += f"- **表达载体**: {row.get('expression_vector', 'N/A')}\n"
-        result += f"- **诱导条件**: {row.get('expression_induction', 'N/A')}\n"
-        result += "\n"
-        
+    # 输出超过 MAX_OUTPUT_LEN 的部分会被截掉：总数由掩码计数得到，只取出会输出的行；
+    # 每行至少包含模板中的全部固定文本，据此确定最多需要渲染的行数，累计长度超出后不再拼接
     MAX_OUTPUT_LEN = 1000  # 你可以根据实际情况调整
+    budget = max(MAX_OUTPUT_LEN - len(buf.getvalue()), 0)
+    row_cap = budget // sum(map(len, _SIMILAR_TEMPLATE[::2])) + 1
+    result_df = merged_df.iloc[np.flatnonzero(similar_mask)[:min(result_count, row_cap)]]
+    w(_render_rows(result_df, _SIMILAR_TEMPLATE, budget))
+    result = buf.getvalue()
     if len(result) > MAX_OUTPUT_LEN:
         result = result[:MAX_OUTPUT_LEN] + "\n\n【内容过长，仅显示前部分】"
     return result
 
+# 模式分析类型 -> (统计的列, 小标题, 计数后缀)
+_PATTERN_COLUMNS = {
+    "enzyme_frequency": ('enzyme_name', "## 常用酶分析\n\n", "次使用"),
+    "organism_frequency": ('organism', "## 常用物种分析\n\n", "次使用"),
+    "reaction_type_frequency": ('reaction_type_reversible', "## 反应类型分析\n\n", "次出现"),
+}
+
+@register_cache
+@functools.lru_cache(maxsize=None)
+def _pattern_counts(pattern_type: str) -> pd.Series:
+    """反应视图中某类模式的出现次数（降序），数据静态，首次使用时统计一次；返回值为共享缓存，调用方不应修改"""
+    column = VIEWS['reactions'][_PATTERN_COLUMNS[pattern_type][0]]
+    if pattern_type == "organism_frequency":
+        # organism为category列，按object计数以保持次数相同的物种按首次出现的顺序排列
+        column = column.astype(object)
+    return column.value_counts()
+
+@register_cache
+@functools.lru_cache(maxsize=64)
 def analyze_reaction_patterns(
     pattern_type: str,
     min_occurrences: int
@@ -890,51 +1079,31 @@ def analyze_reaction_patterns(
     """
     if not DB: return "数据库未加载。"
     
-    core_df = DB.get('1_reactions_core', pd.DataFrame())
-    enzymes_df = DB.get('2_enzymes', pd.DataFrame())
-    
-    if core_df.empty or enzymes_df.empty:
+    if 'reactions' not in VIEWS:
         return "核心数据表未加载。"
     
-    # 合并数据
-    merged_df = pd.merge(core_df, enzymes_df, on=['literature_id', 'reaction_id'])
+    if pattern_type not in _PATTERN_COLUMNS:
+        return "不支持的模式分析类型"
+    _, title, suffix = _PATTERN_COLUMNS[pattern_type]
     
-    result = f"# 反应模式分析\n\n"
-    result += f"**分析类型**: {pattern_type if pattern_type else '全部'}\n"
-    result += f"**最小出现次数**: {min_occurrences}\n\n"
+    # 出现次数在首次使用时统计并缓存，每次调用只需按阈值筛选
+    counts = _pattern_counts(pattern_type)
+    frequent = counts[counts >= min_occurrences]
     
-    if pattern_type == "enzyme_frequency":
-        # 酶使用频率分析
-        enzyme_counts = merged_df['enzyme_name'].value_counts()
-        frequent_enzymes = enzyme_counts[enzyme_counts >= min_occurrences]
-        
-        result += "## 常用酶分析\n\n"
-        for enzyme, count in frequent_enzymes.items():
-            result += f"- **{enzyme}**: {count}次使用\n"
-    
-    elif pattern_type == "organism_frequency":
-        # 物种使用频率分析
-        organism_counts = merged_df['organism'].value_counts()
-        frequent_organisms = organism_counts[organism_counts >= min_occurrences]
-        
-        result += "## 常用物种分析\n\n"
-        for organism, count in frequent_organisms.items():
-            result += f"- **{organism}**: {count}次使用\n"
-    
-    elif pattern_type == "reaction_type_frequency":
-        # 反应类型频率分析
-        type_counts = merged_df['reaction_type_reversible'].value_counts()
-        frequent_types = type_counts[type_counts >= min_occurrences]
-        
-        result += "## 反应类型分析\n\n"
-        for rtype, count in frequent_types.items():
-            result += f"- **{rtype}**: {count}次出现\n"
+    buf = io.StringIO()
     
-    else:
-        return "不支持的模式分析类型"
+    w = buf.write
     
-    return result
+    w(f"# 反应模式分析\n\n")
+    w(f"**分析类型**: {pattern_type if pattern_type else '全部'}\n")
+    w(f"**最小出现次数**: {min_occurrences}\n\n")
+    w(title)
+    for value, count in frequent.to_dict().items():
+        w(f"- **{value}**: {count}{suffix}\n")
+    
+    return buf.getvalue()
 
+@cached_tool
 def find_kinetic_parameters(**kwargs) -> str:
     """
     查询并展示指定反应的动力学参数（如kcat、Km、Vmax、kcat_km、specific_activity等）。
@@ -950,30 +1119,31 @@ def find_kinetic_parameters(**kwargs) -> str:
     reaction_id = kwargs.get('reaction_id', None)
     parameter_type = kwargs.get('parameter_type', None)
     enzyme_name = kwargs.get('enzyme_name', None)
-    max_results = kwargs.get('max_results', QUERY_CONFIG["max_results"])
+    max_results = kwargs.get('max_results', _MAX_RESULTS)
     
     if not DB: return "数据库未加载。"
-    kinetic_df = DB.get('6_kinetic_parameters', pd.DataFrame())
-    enzymes_df = DB.get('2_enzymes', pd.DataFrame())
+    kinetic_df = get_table('6_kinetic_parameters')
+    enzymes_df = get_table('2_enzymes')
     if kinetic_df.empty:
         return "动力学参数数据表未加载。"
-    # 条件筛选
-    df = kinetic_df.copy()
+    # 条件筛选：指定文献（及反应）时按预建索引直接取行，其余条件合并为一个掩码，只取命中行
+    if literature_id and reaction_id:
+        kinetic_df = rows_for_reaction('6_kinetic_parameters', literature_id, reaction_id)
+    elif literature_id:
+        kinetic_df = rows_for_literature('6_kinetic_parameters', literature_id)
+    query_conditions = []
+    if reaction_id and not literature_id:
+        query_conditions.append(kinetic_df['reaction_id'] == reaction_id)
+    if parameter_type:
+        query_conditions.append(_lower_equals(kinetic_df['parameter_type'], parameter_type.lower()))
+    df = kinetic_df[_and_masks(query_conditions)] if query_conditions else kinetic_df
     # 新增：支持酶名检索
     if enzyme_name and not enzymes_df.empty:
-        enzyme_rows = enzymes_df[enzymes_df['enzyme_name'].str.contains(enzyme_name, case=False, na=False)]
+        enzyme_rows = enzymes_df[column_contains(enzymes_df, '2_enzymes', 'enzyme_name', enzyme_name)]
         if enzyme_rows.empty:
             return f"未找到酶名为 '{enzyme_name}' 的相关反应。"
-        # 获取所有相关literature_id和reaction_id
-        id_pairs = enzyme_rows[['literature_id', 'reaction_id']].drop_duplicates()
-        # 合并条件
-        df = pd.merge(df, id_pairs, on=['literature_id', 'reaction_id'])
-    if literature_id:
-        df = df[df['literature_id'] == literature_id]
-    if reaction_id:
-        df = df[df['reaction_id'] == reaction_id]
-    if parameter_type:
-        df = df[df['parameter_type'].str.lower() == parameter_type.lower()]
+        # 按相关酶的关联键半连接筛选（与内连接的结果及行顺序一致）
+        df = df[_key_isin(df, enzyme_rows)]
     if df.empty:
         return "未找到匹配的动力学参数数据。"
     
@@ -981,33 +1151,44 @@ def find_kinetic_parameters(**kwargs) -> str:
     total = len(df)
     df = df.head(max_results)
     # 分组展示
-    result = f"# 动力学参数查询结果\n\n"
-    result += f"**输出记录数**: {len(df)}，共找到记录{total}条\n\n"
+    buf = io.StringIO()
+    w = buf.write
+    w(f"# 动力学参数查询结果\n\n")
+    w(f"**输出记录数**: {len(df)}，共找到记录{total}条\n\n")
     
     group_cols = ['literature_id', 'reaction_id', 'source_type', 'mutation_description']
-    grouped = df.groupby(group_cols)
-    for group_keys, group_df in grouped:
-        lit, rid, src, mut = group_keys
-        result += f"## 文献: {lit} 反应: {rid} 类型: {src}"
-        if src == "wild_type":
-            result += f" 野生型: WT"
-        else:
-            if mut and str(mut).strip():
-                result += f" 突变: {mut}"
-        result += "\n"
-        for _, row in group_df.iterrows():
-            result += f"- **参数类型**: {row['parameter_type']}"
-            if row['substrate_name'] and str(row['substrate_name']).strip():
-                result += f" | **底物**: {row['substrate_name']}"
-            result += f" | **数值**: {row['value']} {row['unit']}"
-            if row['error_margin'] and str(row['error_margin']).strip():
-                result += f" (误差: {row['error_margin']})"
-            if row['details'] and str(row['details']).strip():
-                result += f" | 说明: {row['details']}"
-            result += "\n"
-        result += "\n"
-    return result
+    # 组号按分组键排序编号（键含缺失值的行为-1，与groupby一样不输出）；按组号稳定排序后顺序输出，组号变化时写组标题
+    group_ids = df.groupby(group_cols, observed=True).ngroup().to_numpy()
+    order = np.argsort(group_ids, kind='stable')
+    order = order[group_ids[order] >= 0]
+    rows = _row_values(df.iloc[order], tuple(group_cols) + ('parameter_type', 'substrate_name', 'value', 'unit', 'error_margin', 'details'))
+    previous = None
+    for group_id, (lit, rid, src, mut, param_type, substrate, value, unit, error, details) in zip(group_ids[order].tolist(), rows):
+        if group_id != previous:
+            if previous is not None:
+                w("\n")
+            previous = group_id
+            w(f"## 文献: {lit} 反应: {rid} 类型: {src}")
+            if src == "wild_type":
+                w(f" 野生型: WT")
+            else:
+                if mut and str(mut).strip():
+                    w(f" 突变: {mut}")
+            w("\n")
+        w(f"- **参数类型**: {param_type}")
+        if substrate and str(substrate).strip():
+            w(f" | **底物**: {substrate}")
+        w(f" | **数值**: {value} {unit}")
+        if error and str(error).strip():
+            w(f" (误差: {error})")
+        if details and str(details).strip():
+            w(f" | 说明: {details}")
+        w("\n")
+    if previous is not None:
+        w("\n")
+    return buf.getvalue()
 
+@cached_tool
 def find_mutant_performance(**kwargs) -> str:
     """
     查询突变体的性能表现，支持按酶名、文献ID、反应ID、突变描述等索引。
@@ -1023,56 +1204,44 @@ def find_mutant_performance(**kwargs) -> str:
     literature_id = kwargs.get('literature_id', None)
     reaction_id = kwargs.get('reaction_id', None)
     mutation_description = kwargs.get('mutation_description', None)
-    max_results = kwargs.get('max_results', QUERY_CONFIG["max_results"])
+    max_results = kwargs.get('max_results', _MAX_RESULTS)
     
     if not DB:
         return "数据库未加载。"
-    mutants_df = DB.get('7_mutants_characterized', pd.DataFrame())
-    enzymes_df = DB.get('2_enzymes', pd.DataFrame())
-    # kinetic_df = DB.get('6_kinetic_parameters', pd.DataFrame())
+    mutants_df = get_table('7_mutants_characterized')
+    enzymes_df = get_table('2_enzymes')
+    # kinetic_df = get_table('6_kinetic_parameters')
     if mutants_df.empty or enzymes_df.empty:
         return "突变体或酶信息表未加载。"
-    # 合并酶名
-    merged_df = pd.merge(mutants_df, enzymes_df, on=['literature_id', 'reaction_id'], how='left')
-    # 条件筛选
+    # 突变体与酶信息的关联在加载时已完成，这里只需筛选
+    merged_df = VIEWS['mutants_enzymes']
+    query_conditions = []
     if enzyme_name:
-        merged_df = merged_df[merged_df['enzyme_name'].str.contains(enzyme_name, case=False, na=False)]
+        query_conditions.append(column_contains(merged_df, 'mutants_enzymes', 'enzyme_name', enzyme_name))
     if literature_id:
-        merged_df = merged_df[merged_df['literature_id'] == literature_id]
+        query_conditions.append(merged_df['literature_id'] == literature_id)
     if reaction_id:
-        merged_df = merged_df[merged_df['reaction_id'] == reaction_id]
+        query_conditions.append(merged_df['reaction_id'] == reaction_id)
     if mutation_description:
-        merged_df = merged_df[merged_df['mutation_description'].str.contains(mutation_description, case=False, na=False)]
-    if merged_df.empty:
+        query_conditions.append(column_contains(merged_df, 'mutants_enzymes', 'mutation_description', mutation_description))
+    if query_conditions:
+        # 总数直接在掩码上统计，只取出需要输出的前max_results行
+        mask = _and_masks(query_conditions)
+        total_count = int(mask.sum())
+        result_df = merged_df.iloc[np.flatnonzero(mask)[:max_results]]
+    else:
+        total_count = len(merged_df)
+        result_df = merged_df.head(max_results)
+    if not total_count:
         return "未找到匹配的突变体性能数据。"
-    # 限制结果数量
-    result_df = merged_df.head(max_results)
     # 格式化输出
-    result = f"# 突变体性能表现查询结果\n\n"
-    result += f"**筛选条件**: 酶={enzyme_name if enzyme_name else '全部'}, 文献={literature_id if literature_id else '全部'}, 反应={reaction_id if reaction_id else '全部'}\n"
-    result += f"**输出记录数**: {len(result_df)} (共找到记录数{len(merged_df)}个)\n\n"
-    for _, row in result_df.iterrows():
-        result += f"## {row['literature_id']}:{row['reaction_id']} | 酶: {row.get('enzyme_name', 'N/A')} | 突变: {row['mutation_description']}\n"
-        result += f"- **定性活性**: {row.get('activity_qualitative', 'N/A')}\n"
-        result += f"- **转化率**: {row.get('conversion_rate', 'N/A')} %\n"
-        result += f"- **产率**: {row.get('product_yield', 'N/A')} {row.get('product_yield_unit', '')}\n"
-        result += f"- **区域选择性**: {row.get('selectivity_regio', 'N/A')}\n"
-        result += f"- **立体选择性**: {row.get('selectivity_stereo', 'N/A')}\n"
-        result += f"- **对映体过量**: {row.get('enantiomeric_excess', 'N/A')} %\n"
-        # # 动力学参数联查
-        # if enzyme_name and not kinetic_df.empty:
-        #     kin_rows = kinetic_df[(kinetic_df['literature_id'] == row['literature_id']) & (kinetic_df['reaction_id'] == row['reaction_id'])]
-        #     if not kin_rows.empty:
-        #         result += f"- **动力学参数**:\n"
-        #         for _, kin in kin_rows.iterrows():
-        #             param = kin.get('parameter_type', 'N/A')
-        #             value = kin.get('value', 'N/A')
-        #             unit = kin.get('unit', '')
-        #             error = kin.get('error_margin', '')
-        #             details = kin.get('details', '')
-        #             result += f"    - {param}: {value} {unit} {(f'(误差: {error})' if error else '')} {(f'| 说明: {details}' if details else '')}\n"
-        result += "\n"
-    return result
+    buf = io.StringIO()
+    w = buf.write
+    w(f"# 突变体性能表现查询结果\n\n")
+    w(f"**筛选条件**: 酶={enzyme_name if enzyme_name else '全部'}, 文献={literature_id if literature_id else '全部'}, 反应={reaction_id if reaction_id else '全部'}\n")
+    w(f"**输出记录数**: {len(result_df)} (共找到记录数{total_count}个)\n\n")
+    w(_render_rows(result_df, _MUTANT_TEMPLATE))
+    return buf.getvalue()
 
 # --- FunctionTool实例导出 ---
 get_reaction_summary_tool = FunctionTool(func=get_reaction_summary)
@@ -2,18 +2,17 @@ from google.adk.tools import FunctionTool
 import os
 from google.adk.agents import Agent
 from google.adk.tools.agent_tool import AgentTool
-from google.adk.runners import Runner
-from google.adk.sessions import InMemorySessionService
 from google.genai import types
 import asyncio
 from typing import List, Dict, Optional
 import pandas as pd
-from .database_loader import DB
+from .database_loader import DB, column_contains, get_table, rows_for_literature
 # from utils.config import METADATA_BASE_DIR, get_metadata_path, AGENT_CONFIG
 from ..CONFIG import METADATA_BASE_DIR, get_metadata_path, AGENT_CONFIG
 import concurrent.futures
 
 from ..utils.text_parser import preprocess_text_for_llm
+from ..sessions import SESSION_SERVICE, get_runner
 
 # try:
 #     from utils.text_parser import preprocess_text_for_llm
@@ -132,29 +131,36 @@ async def get_summary_from_literature(
     """
     
     # 使用专门的文献分析Agent
-    session_service = InMemorySessionService()
-    session = await session_service.create_session(
+    # 共享会话服务中使用一次性会话（自动生成id，避免并发调用相互冲突），用后删除
+    session = await SESSION_SERVICE.create_session(
         app_name=AGENT_CONFIG["app_name"], 
-        user_id="user1234", 
-        session_id="session1"
-    )
-    runner = Runner(
-        agent=literature_analysis_agent, 
-        app_name=AGENT_CONFIG["app_name"], 
-        session_service=session_service
+        user_id="user1234"
     )
+    runner = get_runner(literature_analysis_agent, app_name=AGENT_CONFIG["app_name"])
     user_content = types.Content(role='user', parts=[types.Part(text=prompt)])
-    events = runner.run_async(user_id="user1234", session_id="session1", new_message=user_content)
-    
-    async for event in events:
-        if event.is_final_response():
-            final_response = event.content.parts[0].text
-            return {
-                "status": "success", 
-                "summary": f"## 文献 {literature_id} 分析结果\n\n{final_response}",
-                "literature_id": literature_id,
-                "analysis_type": analysis_type
-            }
+    events = runner.run_async(user_id="user1234", session_id=session.id, new_message=user_content)
+    
+    final_response = None
+    try:
+        async for event in events:
+            if event.is_final_response():
+                final_response = event.content.parts[0].text
+                break
+    finally:
+        await events.aclose()
+        await SESSION_SERVICE.delete_session(
+            app_name=AGENT_CONFIG["app_name"], 
+            user_id="user1234", 
+            session_id=session.id
+        )
+    
+    if final_response is not None:
+        return {
+            "status": "success", 
+            "summary": f"## 文献 {literature_id} 分析结果\n\n{final_response}",
+            "literature_id": literature_id,
+            "analysis_type": analysis_type
+        }
     
     return {"status": "error", "error_message": "Agent未返回最终响应。"}
 
@@ -196,9 +202,7 @@ async def analyze_multiple_literature(
         return {"status": "error", "error_message": "可用的文献数量不足，无法进行对比分析。"}
     
     # 构建对比提示词
-    content_text = ""
-    for lit_id, content in literature_contents.items():
-        content_text += f"\n---文献 {lit_id} 内容---\n{content}\n"
+    content_text = "".join(f"\n---文献 {lit_id} 内容---\n{content}\n" for lit_id, content in literature_contents.items())
     
     prompt = f"""
     请对比分析以下多篇文献，回答用户的具体问题。
@@ -217,29 +221,36 @@ async def analyze_multiple_literature(
     """
     
     # 使用文献对比Agent
-    session_service = InMemorySessionService()
-    session = await session_service.create_session(
+    # 共享会话服务中使用一次性会话（自动生成id，避免并发调用相互冲突），用后删除
+    session = await SESSION_SERVICE.create_session(
         app_name=AGENT_CONFIG["app_name"], 
-        user_id="user1234", 
-        session_id="session2"
-    )
-    runner = Runner(
-        agent=literature_comparison_agent, 
-        app_name=AGENT_CONFIG["app_name"], 
-        session_service=session_service
+        user_id="user1234"
     )
+    runner = get_runner(literature_comparison_agent, app_name=AGENT_CONFIG["app_name"])
     user_content = types.Content(role='user', parts=[types.Part(text=prompt)])
-    events = runner.run_async(user_id="user1234", session_id="session2", new_message=user_content)
-    
-    async for event in events:
-        if event.is_final_response():
-            final_response = event.content.parts[0].text
-            return {
-                "status": "success", 
-                "comparison": f"## 多文献对比分析结果\n\n{final_response}",
-                "literature_ids": literature_ids,
-                "comparison_focus": comparison_focus
-            }
+    events = runner.run_async(user_id="user1234", session_id=session.id, new_message=user_content)
+    
+    final_response = None
+    try:
+        async for event in events:
+            if event.is_final_response():
+                final_response = event.content.parts[0].text
+                break
+    finally:
+        await events.aclose()
+        await SESSION_SERVICE.delete_session(
+            app_name=AGENT_CONFIG["app_name"], 
+            user_id="user1234", 
+            session_id=session.id
+        )
+    
+    if final_response is not None:
+        return {
+            "status": "success", 
+            "comparison": f"## 多文献对比分析结果\n\n{final_response}",
+            "literature_ids": literature_ids,
+            "comparison_focus": comparison_focus
+        }
     
     return {"status": "error", "error_message": "Agent未返回最终响应。"}
 
@@ -258,14 +269,15 @@ def find_related_literature(
     if not DB: return {"status": "error", "error_message": "数据库未加载。"}
     
     # 获取目标文献信息
-    enzymes_df = DB.get('2_enzymes', pd.DataFrame())
-    core_df = DB.get('1_reactions_core', pd.DataFrame())
+    enzymes_df = get_table('2_enzymes')
+    core_df = get_table('1_reactions_core')
     
     if enzymes_df.empty or core_df.empty:
         return {"status": "error", "error_message": "核心数据表未加载。"}
     
-    target_enzyme = enzymes_df[enzymes_df['literature_id'] == target_literature_id]
-    target_reaction = core_df[core_df['literature_id'] == target_literature_id]
+    # 按文献直接取行（预建的文献->行号索引，无需逐行比较）
+    target_enzyme = rows_for_literature('2_enzymes', target_literature_id)
+    target_reaction = rows_for_literature('1_reactions_core', target_literature_id)
     
     if target_enzyme.empty and target_reaction.empty:
         return {"status": "error", "error_message": f"未找到文献 {target_literature_id} 的记录。"}
@@ -276,7 +288,7 @@ def find_related_literature(
         # 基于酶名称查找相关文献
         enzyme_name = target_enzyme.iloc[0]['enzyme_name']
         related = enzymes_df[
-            (enzymes_df['enzyme_name'].str.contains(enzyme_name.split('_')[0], case=False, na=False)) &
+            column_contains(enzymes_df, '2_enzymes', 'enzyme_name', enzyme_name.split('_')[0]) &
             (enzymes_df['literature_id'] != target_literature_id)
         ]
         related_literature = related['literature_id'].unique()[:max_results].tolist()
@@ -285,7 +297,7 @@ def find_related_literature(
         # 基于物种查找相关文献
         organism = target_enzyme.iloc[0]['organism']
         related = enzymes_df[
-            (enzymes_df['organism'].str.contains(organism.split()[0], case=False, na=False)) &
+            column_contains(enzymes_df, '2_enzymes', 'organism', organism.split()[0]) &
             (enzymes_df['literature_id'] != target_literature_id)
         ]
         related_literature = related['literature_id'].unique()[:max_results].tolist()
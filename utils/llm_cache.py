@@ -0,0 +1,72 @@
+"""
+响应缓存
+
+对同一用户、同一对话进度下完全相同的查询复用已生成的Agent响应，避免重复的LLM往返。
+只做精确匹配：字符相似度无法区分"ADK酶的反应"与"ADK酶的反应条件"这类字面相近、含义不同的查询，
+近似命中会返回错误的答案。比较前只做不改变含义的归一化（全角/半角统一、小写、去除空白和句末标点），
+查询内部的标点（如EC号中的"."、反应式中的"+"和"->"）保持不变。
+"""
+
+import re
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Optional
+
+_WHITESPACE_PATTERN = re.compile(r"\s+")
+_TRAILING_PUNCTUATION = "?!.,;:~。？！，；：～…"
+
+
+def normalize_query(text: str) -> str:
+    """查询的归一化形式：两条查询归一化后相同才视为同一查询"""
+    text = unicodedata.normalize("NFKC", text).lower()
+    return _WHITESPACE_PATTERN.sub("", text).rstrip(_TRAILING_PUNCTUATION)
+
+
+class ResponseCache:
+    """
+    按 (模型, 会话, 上下文, 归一化查询) 精确匹配的响应缓存，支持TTL过期与LRU容量淘汰。
+    """
+
+    def __init__(self, model: str, ttl: float = 3600, max_size: int = 1000):
+        self.model = model
+        self.ttl = ttl
+        self.max_size = max_size
+        self._entries = OrderedDict()  # key -> (响应, 写入时间)
+        self._lock = threading.Lock()
+
+    def _key(self, query: str, session_id: str, context) -> tuple:
+        return (self.model, session_id, context, normalize_query(query))
+
+    def get(self, query: str, session_id: str = "default", context=None) -> Optional[str]:
+        """
+        查找已缓存的响应。
+
+        :param context: 会话上下文标记（如会话历史轮数），只复用相同上下文下缓存的响应
+        :return: 响应；未命中或已过期时返回 None
+        """
+        key = self._key(query, session_id, context)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            response, stamp = entry
+            if time.monotonic() - stamp > self.ttl:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return response
+
+    def set(self, query: str, response: str, session_id: str = "default", context=None) -> None:
+        """缓存一条查询的响应（context 与查找时传入的含义相同）"""
+        key = self._key(query, session_id, context)
+        with self._lock:
+            self._entries[key] = (response, time.monotonic())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
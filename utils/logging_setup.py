@@ -0,0 +1,61 @@
+"""
+日志初始化
+
+按 LOG_CONFIG 配置包级日志器。日志记录通过 QueueHandler 投递到队列，
+由 QueueListener 在后台线程写文件，调用方（如事件流循环）不会被磁盘I/O阻塞。
+导入本包不会配置日志，由应用入口（main.py、adk web 加载 root_agent 时）显式调用 setup_logging()；
+包级日志器保持向上传播，宿主应用在根日志器上配置的处理器同样能收到本包的日志。
+命令行脚本（main.py、check_config.py）的进度输出使用包级日志器下的 CONSOLE_LOGGER_NAME，
+由 setup_console_logging() 配置。
+"""
+
+import atexit
+import logging
+import logging.handlers
+import queue
+import sys
+
+from ..CONFIG import LOG_CONFIG
+
+PACKAGE_LOGGER_NAME = __name__.split('.')[0]
+CONSOLE_LOGGER_NAME = f"{PACKAGE_LOGGER_NAME}.cli"
+
+_listener = None
+
+
+def setup_logging() -> logging.Logger:
+    """初始化包级日志器（可重复调用，只会初始化一次）"""
+    global _listener
+    logger = logging.getLogger(PACKAGE_LOGGER_NAME)
+    if _listener is not None:
+        return logger
+
+    log_file = LOG_CONFIG["file"]
+    log_file.parent.mkdir(parents=True, exist_ok=True)
+    file_handler = logging.FileHandler(log_file, encoding="utf-8")
+    file_handler.setFormatter(logging.Formatter(LOG_CONFIG["format"]))
+
+    log_queue = queue.SimpleQueue()
+    logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    logger.setLevel(LOG_CONFIG["level"])
+
+    _listener = logging.handlers.QueueListener(log_queue, file_handler, respect_handler_level=True)
+    _listener.start()
+    atexit.register(_listener.stop)
+    return logger
+
+
+def setup_console_logging() -> logging.Logger:
+    """
+    命令行脚本的进度输出日志器。交互终端下脚本直接打印，不配置处理器；
+    输出被重定向（CI、被其他程序调用）时由MemoryHandler缓冲后批量写到标准输出，避免每行一次阻塞写，
+    ERROR及以上的记录立即写出。
+    """
+    logger = logging.getLogger(CONSOLE_LOGGER_NAME)
+    if sys.stdout.isatty() or logger.handlers:
+        return logger
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setFormatter(logging.Formatter(LOG_CONFIG["format"]))
+    logger.addHandler(logging.handlers.MemoryHandler(capacity=256, flushLevel=logging.ERROR, target=stream_handler))
+    logger.setLevel(logging.INFO)
+    return logger